@@ -0,0 +1,267 @@
+"""
+无界面的命令行入口，用于 CI 或没有显示器的构建机。
+这里以及它导入的模块都不能依赖 tkinter / PIL，重量级模块只在对应子命令中按需导入。
+
+    python cli.py renumber <project> [--dry-run] [--workers N] [--json]
+    python cli.py index <project> [--json]
+    python cli.py search <project> <query> [--limit N] [--json]
+    python cli.py taxonomy <project> [--rename-tag OLD NEW] [--move-category OLD NEW] [--json]
+    python cli.py images <project> [--workers N] [--json]
+    python cli.py generate <project> [--command "..."]
+    python cli.py deploy <project> [--target DIR_OR_BARE_REPO] [--branch B] [--full] [--json] [--command "..."]
+"""
+
+import argparse
+import json
+import logging
+import shlex
+import sys
+
+
+def _print_json(data):
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+
+def cmd_renumber(args) -> int:
+    from src.services.formula_batch import renumber_project
+
+    result = renumber_project(args.project, dry_run=args.dry_run, max_workers=args.workers)
+    if args.json:
+        _print_json({"summary": result.summary(), "files": result.reports})
+    else:
+        for report in result.reports:
+            if report["error"]:
+                print(f"ERROR    {report['path']}: {report['error']}")
+            elif report["changed"]:
+                action = "WOULD " if args.dry_run else ""
+                print(
+                    f"{action}UPDATE {report['path']} "
+                    f"(deleted refs: {report['deleted_refs']}, {report['seconds'] * 1000:.1f} ms)"
+                )
+        summary = result.summary()
+        print(
+            f"{summary['files']} file(s), {summary['changed']} changed, {summary['failed']} failed, "
+            f"{summary['deleted_refs']} reference(s) deleted in {summary['elapsed']:.2f} s"
+        )
+    return 1 if result.failed else 0
+
+
+def cmd_index(args) -> int:
+    from src.services.formula_index import FormulaIndexStore
+    from src.services.project_index import ProjectIndex
+
+    entries = FormulaIndexStore().index_project(args.project)
+    stats = ProjectIndex(args.project).refresh()
+    summary = {
+        "posts": len(entries),
+        "formulas": sum(len(entry["formulas"]) for entry in entries),
+        "references": sum(len(entry["references"]) for entry in entries),
+        "metadata": {key: len(value) if isinstance(value, list) else value for key, value in stats.items()},
+    }
+    if args.json:
+        _print_json(summary)
+    else:
+        print(f"{summary['posts']} post(s), {summary['formulas']} formula(s), {summary['references']} reference(s)")
+        metadata = summary["metadata"]
+        print(
+            f"metadata: {metadata['posts']} file(s), {metadata['added']} added, {metadata['updated']} updated, "
+            f"{metadata['removed']} removed in {metadata['elapsed']:.2f} s"
+        )
+    return 0
+
+
+def cmd_search(args) -> int:
+    from src.services.search_index import PostSearchIndex
+
+    index = PostSearchIndex(args.project)
+    index.refresh()
+    results = index.search(args.query, limit=args.limit)
+    if args.json:
+        _print_json(results)
+    else:
+        for result in results:
+            print(f"{result['score']:7.2f}  {result['path']}  {result['title']}")
+            if result["snippet"]:
+                print(f"         {result['snippet']}")
+        print(f"{len(results)} result(s)")
+    return 0
+
+
+def cmd_taxonomy(args) -> int:
+    from src.services.project_index import ProjectIndex
+    from src.services.taxonomy import ProjectTaxonomy
+
+    if args.move_category:
+        # 分类路径用 / 分隔，例如 "编程/Python"
+        old, new = (tuple(name for name in path.split("/") if name) for path in args.move_category)
+        if not old or not new:
+            print("Category paths must not be empty.", file=sys.stderr)
+            return 2
+
+    project_index = ProjectIndex(args.project)
+    taxonomy = ProjectTaxonomy(project_index)
+    taxonomy.apply(project_index.refresh())
+    summary = None
+    if args.rename_tag:
+        summary = taxonomy.rename_tag(*args.rename_tag)
+    elif args.move_category:
+        summary = taxonomy.move_category(old, new)
+
+    if args.json:
+        _print_json({"summary": summary, "tags": taxonomy.tag_counts(), "categories": taxonomy.category_tree()})
+        return 1 if summary and summary["failed"] else 0
+    if summary is not None:
+        print(
+            f"{summary['changed']} of {summary['posts']} post(s) rewritten, {summary['failed']} failed "
+            f"in {summary['elapsed']:.2f} s"
+        )
+    else:
+        for tag, count in taxonomy.tag_counts().items():
+            print(f"{count:6}  {tag}")
+
+        def print_tree(nodes, depth):
+            for node in nodes:
+                print(f"{node['count']:6}  {'  ' * depth}{node['name']}/")
+                print_tree(node["children"], depth + 1)
+
+        print_tree(taxonomy.category_tree(), 0)
+    return 1 if summary and summary["failed"] else 0
+
+
+def cmd_images(args) -> int:
+    from src.services.image_pipeline import ImageOptimizer
+
+    result = ImageOptimizer(max_workers=args.workers).optimize_project(args.project)
+    summary = result.summary()
+    if args.json:
+        _print_json({"summary": summary, "files": result.reports})
+    else:
+        for report in result.reports:
+            if report["error"]:
+                print(f"ERROR    {report['path']}: {report['error']}")
+            elif report["replaced"] or report["variants"]:
+                print(
+                    f"OPTIMIZE {report['path']} ({report['bytes_before']} -> {report['bytes_after']} bytes, "
+                    f"variants: {report['variants']}, {report['seconds'] * 1000:.0f} ms)"
+                )
+        print(
+            f"{summary['files']} image(s), {summary['processed']} processed, {summary['skipped']} unchanged, "
+            f"{summary['failed']} failed, {summary['bytes_saved']} bytes saved in {summary['elapsed']:.2f} s "
+            f"({summary['files_per_second']:.1f} files/s, {summary['mb_per_second']:.1f} MB/s)"
+        )
+    return 1 if result.failed else 0
+
+
+def _run_command(args, default_command) -> int:
+    import shutil
+    import subprocess
+
+    command = shlex.split(args.command) if args.command else list(default_command)
+    # Windows 上 hexo 是 hexo.cmd，需要先解析出完整路径
+    command[0] = shutil.which(command[0]) or command[0]
+    try:
+        return subprocess.call(command, cwd=args.project)
+    except OSError as e:
+        print(f"Cannot run {command[0]}: {e}", file=sys.stderr)
+        return 127
+
+
+def cmd_generate(args) -> int:
+    from settings import HEXO_GENERATE_COMMAND
+
+    return _run_command(args, HEXO_GENERATE_COMMAND)
+
+
+def cmd_deploy(args) -> int:
+    from settings import HEXO_DEPLOY_COMMAND
+    from src.services.deploy import Deployer, resolve_target, target_from_path
+
+    if args.command:
+        return _run_command(args, HEXO_DEPLOY_COMMAND)
+    target = target_from_path(args.target, args.branch) if args.target else resolve_target(args.project)
+    if target is None:
+        return _run_command(args, HEXO_DEPLOY_COMMAND)
+
+    try:
+        result = Deployer().deploy(args.project, target, full=args.full)
+    except (OSError, RuntimeError) as e:
+        print(f"Deploy failed: {e}", file=sys.stderr)
+        return 1
+    summary = result.summary()
+    if args.json:
+        _print_json({"summary": summary, "added": result.added, "changed": result.changed, "removed": result.removed})
+    else:
+        print(
+            f"{summary['target']}: {summary['added']} added, {summary['changed']} changed, "
+            f"{summary['removed']} removed, {summary['unchanged']} unchanged in {summary['elapsed']:.2f} s"
+        )
+        hashed = summary["hash"]
+        print(
+            f"hashed {hashed['hashed']} file(s), {hashed['cached']} cached "
+            f"({hashed['files_per_second']:.0f} files/s, {hashed['mb_per_second']:.1f} MB/s)"
+        )
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="hexo-helper", description="Hexo Helper headless commands.")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show log messages")
+    subparsers = parser.add_subparsers(dest="command_name", required=True)
+
+    renumber = subparsers.add_parser("renumber", help="renumber formulas of every post in a project")
+    renumber.add_argument("project", help="Hexo project root")
+    renumber.add_argument("--dry-run", action="store_true", help="report changes without writing files")
+    renumber.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    renumber.add_argument("--json", action="store_true", help="print a machine-readable report")
+    renumber.set_defaults(handler=cmd_renumber)
+
+    index = subparsers.add_parser("index", help="refresh the persisted project indexes")
+    index.add_argument("project", help="Hexo project root")
+    index.add_argument("--json", action="store_true", help="print a machine-readable report")
+    index.set_defaults(handler=cmd_index)
+
+    search = subparsers.add_parser("search", help="full-text search over the posts of a project")
+    search.add_argument("project", help="Hexo project root")
+    search.add_argument("query", help="words to search for")
+    search.add_argument("--limit", type=int, default=20, help="maximum number of results")
+    search.add_argument("--json", action="store_true", help="print a machine-readable report")
+    search.set_defaults(handler=cmd_search)
+
+    taxonomy = subparsers.add_parser("taxonomy", help="list, rename or merge tags and categories")
+    taxonomy.add_argument("project", help="Hexo project root")
+    operation = taxonomy.add_mutually_exclusive_group()
+    operation.add_argument("--rename-tag", nargs=2, metavar=("OLD", "NEW"), help="rename (or merge) a tag")
+    operation.add_argument(
+        "--move-category", nargs=2, metavar=("OLD", "NEW"), help="move (or merge) a category, e.g. a/b c/b"
+    )
+    taxonomy.add_argument("--json", action="store_true", help="print a machine-readable report")
+    taxonomy.set_defaults(handler=cmd_taxonomy)
+
+    images = subparsers.add_parser("images", help="recompress oversized images and generate responsive variants")
+    images.add_argument("project", help="Hexo project root")
+    images.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    images.add_argument("--json", action="store_true", help="print a machine-readable report")
+    images.set_defaults(handler=cmd_images)
+
+    for name, handler in (("generate", cmd_generate), ("deploy", cmd_deploy)):
+        sub = subparsers.add_parser(name, help=f"run 'hexo {name}' in a project")
+        sub.add_argument("project", help="Hexo project root")
+        sub.add_argument("--command", default=None, help="command line to run instead of the default")
+        sub.set_defaults(handler=handler)
+        if name == "deploy":
+            sub.add_argument("--target", default=None, help="local directory or bare git repository to deploy to")
+            sub.add_argument("--branch", default="master", help="branch of the bare git repository")
+            sub.add_argument("--full", action="store_true", help="upload every file instead of only the changes")
+            sub.add_argument("--json", action="store_true", help="print a machine-readable report")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import gettext
 
 from settings import DOMAINS, LOCALE_DIR
+from src.core.startup_profiler import profiler
 
 _translators = {}
 
@@ -13,19 +14,20 @@ def setup_translations(language: str):
     global _translators
     _translators = {}
 
-    for domain in DOMAINS:
-        try:
-            # 为每个域创建一个独立的翻译器对象
-            translator = gettext.translation(
-                domain=domain,
-                localedir=LOCALE_DIR,
-                languages=[language],
-            )
-            # 存储该翻译器的 gettext 方法
-            _translators[domain] = translator.gettext
-        except FileNotFoundError:
-            # 如果某个域的翻译文件不存在，我们存储一个“空”翻译函数
-            _translators[domain] = lambda msg: msg
+    with profiler.phase(f"translations {language}"):
+        for domain in DOMAINS:
+            try:
+                # 为每个域创建一个独立的翻译器对象
+                translator = gettext.translation(
+                    domain=domain,
+                    localedir=LOCALE_DIR,
+                    languages=[language],
+                )
+                # 存储该翻译器的 gettext 方法
+                _translators[domain] = translator.gettext
+            except FileNotFoundError:
+                # 如果某个域的翻译文件不存在，我们存储一个“空”翻译函数
+                _translators[domain] = lambda msg: msg
 
 
 class _Translator:
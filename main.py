@@ -1,5 +1,28 @@
-from src.app.app import Application
+import argparse
+
+from src.core.startup_profiler import PROFILE_STARTUP_ENV, profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hexo Helper")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help=f"write a startup timing report to the app data directory (same as {PROFILE_STARTUP_ENV}=1)",
+    )
+    args = parser.parse_args(argv)
+    # 在导入应用之前开始，才能记录导入耗时
+    if args.profile_startup:
+        profiler.start()
+    else:
+        profiler.start_from_env()
+
+    with profiler.phase("import application"):
+        from src.app.app import Application
 
-if __name__ == "__main__":
     app = Application()
     app.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+front-matter 读取的微基准测试。
+在临时目录中生成一批合成文章，比较只读取头部的分块读取和读取整个文件后再解析的耗时。
+
+    python -m scripts.bench_front_matter [--posts 2000] [--body-kb 64] [--repeat 3]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.core.front_matter import parse_front_matter, read_front_matter
+
+HEADER = """---
+title: "Synthetic post {index}"
+date: 2023-{month:02d}-{day:02d} 10:00:00
+updated: 2023-{month:02d}-{day:02d}T12:30:00+08:00
+tags: [python, hexo, "tag {tag}"]
+categories:
+  - [Notes, Tech]
+comments: true
+description: |
+  A synthetic post used to benchmark front-matter parsing.
+---
+"""
+WORDS = ["formula", "hexo", "python", "公式", "编号", "部署", "$$x^2$$", "deploy", "index", "cache"]
+
+
+def make_corpus(root: Path, posts: int, body_kb: int) -> list:
+    rng = random.Random(0)
+    paths = []
+    for index in range(posts):
+        header = HEADER.format(index=index, month=index % 12 + 1, day=index % 28 + 1, tag=index % 50)
+        line = " ".join(rng.choice(WORDS) for _ in range(12)) + "\n"
+        body = line * (body_kb * 1024 // len(line.encode("utf-8")) + 1)
+        path = root / f"post-{index:05d}.md"
+        path.write_text(header + body, encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def read_full_file(path: Path) -> dict:
+    """对照组：读取整个文件后再截取头部解析。"""
+    text = path.read_text(encoding="utf-8")
+    if not text.startswith("---"):
+        return {}
+    end = text.find("\n---", 3)
+    return parse_front_matter(text[text.index("\n") + 1 : end]) if end != -1 else {}
+
+
+def _yaml_reader():
+    try:
+        import yaml
+    except ImportError:
+        return None
+
+    def read_with_yaml(path: Path) -> dict:
+        text = path.read_text(encoding="utf-8")
+        end = text.find("\n---", 3)
+        return yaml.safe_load(text[text.index("\n") + 1 : end])
+
+    return read_with_yaml
+
+
+def bench(name: str, reader, paths: list, repeat: int):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for path in paths:
+            reader(path)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<24} {best * 1000:9.1f} ms  {best / len(paths) * 1e6:8.1f} us/post")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000)
+    parser.add_argument("--body-kb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = make_corpus(Path(temp_dir), args.posts, args.body_kb)
+        assert read_front_matter(paths[0]) == read_full_file(paths[0])
+        print(f"{args.posts} posts, {args.body_kb} KB body each, best of {args.repeat}")
+        chunked = bench("chunked header read", read_front_matter, paths, args.repeat)
+        full = bench("full file read", read_full_file, paths, args.repeat)
+        print(f"speedup: {full / chunked:.1f}x")
+        read_with_yaml = _yaml_reader()
+        if read_with_yaml is not None:
+            bench("full file + PyYAML", read_with_yaml, paths, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
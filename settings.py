@@ -17,13 +17,44 @@ LOCALE_DIR = ROOT_PATH / "locale"
 BASE_DATA_DIR = Path(platformdirs.user_data_dir())
 APP_DATA_DIR = BASE_DATA_DIR / APP_NAME
 SETTINGS_FILE_PATH = APP_DATA_DIR / "settings.json"
+# 设置修改后延迟多少秒写入文件，期间的多次修改合并成一次写入
+SETTINGS_SAVE_DELAY = 0.5
 LOG_FILE_PATH = APP_DATA_DIR / "app.log"
+# 启用启动分析（main.py --profile-startup）时写入的报告
+STARTUP_PROFILE_PATH = APP_DATA_DIR / "startup_profile.json"
+FORMULA_INDEX_DIR = APP_DATA_DIR / "formula_index"
+COMMAND_LOG_FILE_PATH = APP_DATA_DIR / "command_output.log"
+PROJECT_INDEX_DB_PATH = APP_DATA_DIR / "project_index.sqlite3"
+# 每个项目的全文检索索引
+SEARCH_INDEX_DIR = APP_DATA_DIR / "search_index"
+# 文件内容摘要缓存，以 (路径, size, mtime_ns, inode) 为键
+HASH_CACHE_DB_PATH = APP_DATA_DIR / "hash_cache.sqlite3"
+# 每个部署目标上一次成功部署的 public/ 内容清单
+DEPLOY_MANIFEST_DIR = APP_DATA_DIR / "deploy_manifests"
+# 已经优化过的图片（内容摘要 + 参数）
+IMAGE_CACHE_DB_PATH = APP_DATA_DIR / "image_cache.sqlite3"
+# 预先缩放好的图标（PNG），按 (名称, 像素尺寸) 缓存
+ICON_CACHE_DIR = APP_DATA_DIR / "icon_cache"
+# 图片预览的缩略图，以 (内容摘要, 尺寸) 为键
+THUMBNAIL_CACHE_DIR = APP_DATA_DIR / "thumbnails"
+# 内存中缩略图（PhotoImage）的总像素字节数上限
+THUMBNAIL_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# --- 模块 ---
+# 关闭后隐藏以便复用（ModuleLifecycle.POOL）的模块最多保留几个
+MODULE_POOL_SIZE = 3
 
 # --- 默认配置 ---
 DEFAULT_SETTINGS = {
     "language": "en",
 }
 
+# --- Hexo 命令 ---
+HEXO_GENERATE_COMMAND = ["hexo", "generate"]
+HEXO_DEPLOY_COMMAND = ["hexo", "deploy"]
+# 命令输出面板最多显示的行数，完整输出写入 COMMAND_LOG_FILE_PATH
+COMMAND_OUTPUT_MAX_LINES = 5000
+
 # --- i18n ---
 DOMAINS = ["_", "settings", "content", "file", "deploy"]
 # 设置中可选的语言
@@ -35,6 +66,11 @@ LANGUAGES = OrderedDict(
     }
 )
 
+# --- 公式编号 ---
+# 撤销历史的内存上限和最大步数
+UNDO_HISTORY_LIMIT_BYTES = 16 * 1024 * 1024
+UNDO_HISTORY_MAX_STEPS = 1000
+
 LOGGER_LEVEL = logging.INFO
 
 try:
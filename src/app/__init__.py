@@ -1,3 +1,5 @@
 from i18n import get_translator
 
-_ = get_translator("_")
\ No newline at end of file
+_ = get_translator("_")
+
+from .model import FormulaModel  # noqa: E402, F401
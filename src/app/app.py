@@ -1,39 +1,49 @@
 import logging
 import tkinter as tk
 
-from settings import APP_NAME, LOG_FILE_PATH, SETTINGS_FILE_PATH
-from src.app.constants import MODULE_ROOT_MAIN
+from settings import APP_NAME, LOG_FILE_PATH, SETTINGS_FILE_PATH, STARTUP_PROFILE_PATH
+from src.app.constants import MODULE_ROOT_MAIN, MODULE_ROOT_MAIN_SETTINGS
 from src.app.enum import MainKey
 from src.app.module_manager import ModuleManager
 from src.core.logging_manager import LoggingManager
 from src.core.settings_manager import SettingsManager
+from src.core.startup_profiler import profiler
 from src.services.persistence import PersistenceService
 
 
 class Application:
     def __init__(self):
-        self.logging_manager = LoggingManager(LOG_FILE_PATH)
+        with profiler.phase("logging"):
+            self.logging_manager = LoggingManager(LOG_FILE_PATH)
         logging.info("Application starting up...")
 
-        self.root = tk.Tk()
-        self.root.minsize(800, 600)
-        self.root.title(APP_NAME)
+        with profiler.phase("tk root"):
+            self.root = tk.Tk()
+            self.root.minsize(800, 600)
+            self.root.title(APP_NAME)
 
         # 配置加载
-        settings = {
-            MainKey.APP_NAME.value: APP_NAME,
-        }
-        settings_manager = SettingsManager(SETTINGS_FILE_PATH)
-        user_settings = settings_manager.load_settings()
-        settings.update(user_settings)
-        # 启动持久化服务
-        self.persistence_service = PersistenceService(settings_manager)
+        with profiler.phase("load settings"):
+            settings = {
+                MainKey.APP_NAME.value: APP_NAME,
+            }
+            self.settings_manager = SettingsManager(SETTINGS_FILE_PATH)
+            user_settings = self.settings_manager.load_settings()
+            settings.update(user_settings)
+            # 启动持久化服务
+            self.persistence_service = PersistenceService(self.settings_manager)
 
         # 注册
-        self.module_manager = ModuleManager(self.root)
+        with profiler.phase("register modules"):
+            self.module_manager = ModuleManager(self.root)
 
         # 激活主模块 "main"
-        self.module_manager.activate(MODULE_ROOT_MAIN, settings)
+        with profiler.phase("activate main"):
+            self.module_manager.activate(MODULE_ROOT_MAIN, settings)
+
+        # 主窗口空闲后分片预加载设置窗口，第一次打开时直接显示
+        main_model = self.module_manager.get(MODULE_ROOT_MAIN)["model"]
+        self.module_manager.preload(MODULE_ROOT_MAIN_SETTINGS, main_model.to_dict)
 
         # 从主模块的模型中加载并应用配置
 
@@ -42,18 +52,25 @@ class Application:
         # setup_translations(main_model.get_current_language())
 
         logging.info("Application UI is ready.")
+        report = profiler.finish(STARTUP_PROFILE_PATH)
+        if report is not None:
+            logging.info(f"Startup took {report['total_ms']:.1f} ms, report written to {STARTUP_PROFILE_PATH}.")
 
     def run(self):
         if not self.root.winfo_exists():
             return
 
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
 
-        # 清理工作保持不变
-        if self.persistence_service:
-            self.persistence_service.unsubscribe_all()
+            # 清理工作保持不变
+            if self.persistence_service:
+                self.persistence_service.unsubscribe_all()
 
-        if self.module_manager:
-            self.module_manager.cleanup_all()
+            if self.module_manager:
+                self.module_manager.cleanup_all()
+        finally:
+            # 清理失败也要写入还没有保存的设置
+            self.settings_manager.flush()
 
         logging.info("Application shutting down.")
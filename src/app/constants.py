@@ -4,6 +4,17 @@ EVENT_ERROR_OCCURRED = "event.error.occurred"  # kwargs: {'title': '...', 'messa
 EVENT_MAIN_MODEL_CHANGED = "event.main.model.changed"  # kwargs: {"key": "value"}
 EVENT_MAIN_MODEL_PROJECT_OPENED = "event.main.model.project_opened"  # kwargs: {'path': '/path/to/project'}
 EVENT_MAIN_MODEL_PROJECT_CLOSED = "event.main.model.project_closed"  # kwargs: {'path': '/path/to/project'}
+# 文章元数据索引刷新完成 kwargs: {'path': '/path/to/project', 'stats': {...}}
+EVENT_MAIN_MODEL_PROJECT_INDEXED = "event.main.model.project_indexed"
+# 项目 source/ 下的文件在应用外被修改（已去抖、去重）
+# kwargs: {'root': '/path/to/project/source', 'changes': {'/path/to/file': 'modified'}, 'overflow': False}
+EVENT_PROJECT_FILES_CHANGED = "event.project.files_changed"
+# 后台命令 kwargs: {'command': ['hexo', 'generate']}
+EVENT_MAIN_MODEL_COMMAND_STARTED = "event.main.model.command_started"
+# 一批命令输出 kwargs: {'lines': [('stdout', '...'), ('stderr', '...')]}
+EVENT_MAIN_MODEL_COMMAND_OUTPUT = "event.main.model.command_output"
+# kwargs: {'returncode': 0, 'duration': 1.2, 'cancelled': False}
+EVENT_MAIN_MODEL_COMMAND_FINISHED = "event.main.model.command_finished"
 
 # --- 定义 settings 模块的 UI 事件 ---
 # 应用按钮
@@ -17,12 +28,16 @@ EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY = "event.main.settings.model.field_dirty"
 EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY_CANCELLED = "event.main.settings.model.field_dirty_cancelled"
 # 应用按钮按下 kwargs: {"settings": {...}} 只有更改的设置
 EVENT_MAIN_SETTINGS_MODEL_APPLIED = "event.main.settings.model.applied"
+# 复用隐藏的设置窗口时模型被重置为新的设置，没有脏字段
+EVENT_MAIN_SETTINGS_MODEL_RESET = "event.main.settings.model.reset"
 
 # --- 定义 Main 模块的 UI 事件 ---
 EVENT_MAIN_UI_SETTINGS_CLICKED = "event.main.ui.settings_clicked"
 EVENT_MAIN_UI_INFO_CLICKED = "event.main.ui.info_clicked"
 EVENT_MAIN_UI_GENERATE_CLICKED = "event.main.ui.generate_clicked"
 EVENT_MAIN_UI_DEPLOY_CLICKED = "event.main.ui.deploy_clicked"
+EVENT_MAIN_UI_OPTIMIZE_IMAGES_CLICKED = "event.main.ui.optimize_images_clicked"
+EVENT_MAIN_UI_CANCEL_CLICKED = "event.main.ui.cancel_clicked"
 EVENT_MAIN_UI_OPEN_PROJECT_CLICKED = "event.main.ui.open_project_clicked"
 
 # 定义模块路径
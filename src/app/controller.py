@@ -1,21 +1,40 @@
+import os
+import time
 from tkinter import filedialog, messagebox
 from typing import TYPE_CHECKING
 
 from i18n import setup_translations
+from settings import HEXO_DEPLOY_COMMAND, HEXO_GENERATE_COMMAND
 from src.app.constants import (
     EVENT_ERROR_OCCURRED,
+    EVENT_MAIN_MODEL_PROJECT_CLOSED,
+    EVENT_MAIN_MODEL_PROJECT_OPENED,
     EVENT_MAIN_SETTINGS_MODEL_APPLIED,
+    EVENT_MAIN_UI_CANCEL_CLICKED,
     EVENT_MAIN_UI_DEPLOY_CLICKED,
     EVENT_MAIN_UI_GENERATE_CLICKED,
     EVENT_MAIN_UI_INFO_CLICKED,
     EVENT_MAIN_UI_OPEN_PROJECT_CLICKED,
+    EVENT_MAIN_UI_OPTIMIZE_IMAGES_CLICKED,
     EVENT_MAIN_UI_SETTINGS_CLICKED,
+    EVENT_PROJECT_FILES_CHANGED,
     MODULE_ROOT_MAIN,
     MODULE_ROOT_MAIN_SETTINGS,
 )
 from src.app.enum import MainKey
 from src.app.model import MainModel
 from src.core.mvc_template.controller import Controller as BaseController
+from src.services.background import BackgroundTasks
+from src.services.deploy import Deployer, DeployResult, DeployTarget, resolve_target
+from src.services.file_watcher import FileWatcher
+from src.services.image_pipeline import ImageBatchResult, ImageOptimizer
+from src.services.job_runner import STREAM_STDERR, STREAM_STDOUT, Job, JobRunner
+from src.services.project_index import SOURCE_DIR, ProjectIndex
+from src.services.quick_open import QuickOpenIndex
+from src.services.search_index import PostSearchIndex
+from src.services.taxonomy import ProjectTaxonomy
+
+from . import _
 
 if TYPE_CHECKING:
     from src.app.module_manager import ModuleManager
@@ -30,6 +49,17 @@ class MainController(BaseController):
         # 调用父类构造函数，它会自动调用 _setup_handlers
         super().__init__(model)
         self.module_manager = module_manager
+        self.job_runner = JobRunner(module_manager.root_window)
+        self.current_job: Job | None = None
+        self.background = BackgroundTasks(module_manager.root_window)
+        # 项目路径 -> 监视其 source/ 的 FileWatcher
+        self.watchers: dict[str, FileWatcher] = {}
+        # 项目路径 -> 全文检索索引，与元数据索引一起在后台更新
+        self.search_indexes: dict[str, PostSearchIndex] = {}
+        # 项目路径 -> 快速打开使用的标题和路径索引
+        self.quick_open_indexes: dict[str, QuickOpenIndex] = {}
+        # 项目路径 -> 标签和分类的聚合索引
+        self.taxonomies: dict[str, ProjectTaxonomy] = {}
 
     def _setup_handlers(self):
         """注册所有需要处理的事件。"""
@@ -39,10 +69,15 @@ class MainController(BaseController):
         self.subscribe(EVENT_MAIN_UI_OPEN_PROJECT_CLICKED, self.on_open_project)
         self.subscribe(EVENT_MAIN_UI_GENERATE_CLICKED, self.on_generate_click)
         self.subscribe(EVENT_MAIN_UI_DEPLOY_CLICKED, self.on_deploy_click)
+        self.subscribe(EVENT_MAIN_UI_OPTIMIZE_IMAGES_CLICKED, self.on_optimize_images_click)
+        self.subscribe(EVENT_MAIN_UI_CANCEL_CLICKED, self.on_cancel_click)
 
         # 全局/模型事件
         self.subscribe(EVENT_ERROR_OCCURRED, self.on_error_occurred)
         self.subscribe(EVENT_MAIN_SETTINGS_MODEL_APPLIED, self.on_settings_applied)
+        self.subscribe(EVENT_MAIN_MODEL_PROJECT_OPENED, self.on_project_opened)
+        self.subscribe(EVENT_MAIN_MODEL_PROJECT_CLOSED, self.on_project_closed)
+        self.subscribe(EVENT_PROJECT_FILES_CHANGED, self.on_project_files_changed)
 
     def on_settings_applied(self, settings: dict):
         """
@@ -68,6 +103,88 @@ class MainController(BaseController):
         if path:
             self.model.add_project(path)
 
+    def on_project_opened(self, path: str):
+        """在后台线程中刷新项目的文章元数据索引和全文检索索引，之后监视 source/ 中的变化。"""
+        self._index_project(path)
+        source = os.path.join(path, SOURCE_DIR)
+        if path not in self.watchers and os.path.isdir(source):
+            watcher = FileWatcher(source, self.module_manager.root_window, EVENT_PROJECT_FILES_CHANGED)
+            self.watchers[path] = watcher.start()
+
+    def on_project_closed(self, path: str):
+        watcher = self.watchers.pop(path, None)
+        if watcher is not None:
+            watcher.stop()
+        self.search_indexes.pop(path, None)
+        self.quick_open_indexes.pop(path, None)
+        self.taxonomies.pop(path, None)
+
+    def on_project_files_changed(self, root: str, changes: dict, overflow: bool):
+        """只重新索引发生变化的文件；监视丢失过事件时才整体刷新。"""
+        for path, watcher in self.watchers.items():
+            if watcher.root == root:
+                self._index_project(path, None if overflow else list(changes))
+                return
+
+    def _index_project(self, path: str, changes: list | None = None):
+        """:param changes: 变化的路径，None 表示整体刷新"""
+        index = ProjectIndex(path)
+        search_index = self.search_indexes.setdefault(path, PostSearchIndex(path))
+        quick_open = self.quick_open_indexes.setdefault(path, QuickOpenIndex(index))
+        taxonomy = self.taxonomies.setdefault(path, ProjectTaxonomy(index))
+
+        def task():
+            if changes is None:
+                search_index.refresh()
+                stats = index.refresh()
+            else:
+                search_index.update(changes)
+                stats = index.update(changes)
+            quick_open.apply(stats)
+            taxonomy.apply(stats)
+            return stats
+
+        self.background.submit(
+            task,
+            on_done=lambda stats: self.model.project_indexed(path, stats),
+            on_error=lambda error: self.model.send_event(
+                EVENT_ERROR_OCCURRED, title=_("Error"), message=f"{_('Cannot index project:')} {error}"
+            ),
+        )
+
+    def search_posts(self, query: str, limit: int = 20) -> list:
+        """在当前项目中全文检索，索引尚未建立时返回空列表。"""
+        project = self.model.get_value(MainKey.SELECTED_PROJECT.value)
+        search_index = self.search_indexes.get(project) if project else None
+        return search_index.search(query, limit) if search_index is not None else []
+
+    def quick_open(self, query: str, limit: int = 20) -> list:
+        """按标题和路径模糊匹配当前项目的文章，每次按键都可以调用。"""
+        project = self.model.get_value(MainKey.SELECTED_PROJECT.value)
+        quick_open = self.quick_open_indexes.get(project) if project else None
+        return quick_open.search(query, limit) if quick_open is not None else []
+
+    def rename_tag(self, old: str, new: str):
+        """在后台把当前项目中的标签 old 改名为 new（new 已经存在时合并），只改写涉及的文章。"""
+        self._rewrite_taxonomy(lambda taxonomy: taxonomy.rename_tag(old, new))
+
+    def move_category(self, old: tuple, new: tuple):
+        """在后台把当前项目中的分类 old 及其子分类移动到 new 下。"""
+        self._rewrite_taxonomy(lambda taxonomy: taxonomy.move_category(old, new))
+
+    def _rewrite_taxonomy(self, operation):
+        project = self._selected_project()
+        taxonomy = self.taxonomies.get(project) if project else None
+        if taxonomy is None:
+            return
+        self.background.submit(
+            operation,
+            taxonomy,
+            on_error=lambda error: self.model.send_event(
+                EVENT_ERROR_OCCURRED, title=_("Error"), message=f"{_('Cannot rewrite posts:')} {error}"
+            ),
+        )
+
     def on_error_occurred(self, title: str, message: str):
         messagebox.showerror(title, message)
 
@@ -79,7 +196,112 @@ class MainController(BaseController):
         print("Info button clicked")
 
     def on_generate_click(self):
-        print("Generate button clicked")
+        self.run_command(HEXO_GENERATE_COMMAND)
 
     def on_deploy_click(self):
-        print("Deploy button clicked")
+        """_config.yml 配置了本地部署目标时增量部署，否则运行 hexo deploy。"""
+        project = self._selected_project()
+        if project is None:
+            return
+        target = resolve_target(project)
+        if target is None:
+            self.run_command(HEXO_DEPLOY_COMMAND)
+        else:
+            self.deploy_incremental(project, target)
+
+    def on_cancel_click(self):
+        if self.current_job is not None:
+            self.current_job.cancel()
+
+    def _selected_project(self) -> str | None:
+        project = self.model.get_value(MainKey.SELECTED_PROJECT.value)
+        if not project:
+            self.model.send_event(EVENT_ERROR_OCCURRED, title=_("Error"), message=_("Please open a project first."))
+            return None
+        return project
+
+    def run_command(self, command: list):
+        """在当前项目目录中后台运行命令，输出成批转发给模型。"""
+        if self.model.command_running:
+            return
+        project = self._selected_project()
+        if project is None:
+            return
+
+        self.model.command_started(command)
+        self.current_job = self.job_runner.run(
+            command, cwd=project, on_output=self._on_command_output, on_finished=self._on_command_finished
+        )
+
+    def _on_command_output(self, job: Job, lines: list):
+        self.model.append_command_output(lines)
+
+    def _on_command_finished(self, job: Job):
+        self.current_job = None
+        if job.error:
+            self.model.append_command_output([(STREAM_STDERR, job.error)])
+        self.model.command_finished(job.returncode, job.duration, job.cancelled)
+
+    def deploy_incremental(self, project: str, target: DeployTarget):
+        """在后台线程中只部署 public/ 中有变化的文件，结果显示在命令面板中。"""
+        if self.model.command_running:
+            return
+        self.model.command_started(["deploy", str(target)], cancellable=False)
+        started = time.monotonic()
+
+        def on_done(result: DeployResult):
+            summary = result.summary()
+            self.model.append_command_output(
+                [
+                    (
+                        STREAM_STDOUT,
+                        f"{summary['added']} added, {summary['changed']} changed, {summary['removed']} removed, "
+                        f"{summary['unchanged']} unchanged ({summary['bytes_written']} bytes written)",
+                    )
+                ]
+            )
+            self.model.command_finished(0, result.elapsed, False)
+
+        def on_error(error: Exception):
+            self.model.append_command_output([(STREAM_STDERR, str(error))])
+            self.model.command_finished(1, time.monotonic() - started, False)
+
+        self.background.submit(Deployer().deploy, project, target, on_done=on_done, on_error=on_error)
+
+    def on_optimize_images_click(self):
+        """在后台优化当前项目 source/ 中的图片（图片在进程池中处理），结果显示在命令面板中。"""
+        if self.model.command_running:
+            return
+        project = self._selected_project()
+        if project is None:
+            return
+        self.model.command_started(["optimize-images", project], cancellable=False)
+        started = time.monotonic()
+
+        def on_done(result: ImageBatchResult):
+            summary = result.summary()
+            lines = [(STREAM_STDERR, f"{report['path']}: {report['error']}") for report in result.failed]
+            lines.append(
+                (
+                    STREAM_STDOUT,
+                    f"{summary['processed']} processed, {summary['skipped']} unchanged, {summary['failed']} failed, "
+                    f"{summary['variants']} variant(s), {summary['bytes_saved']} bytes saved "
+                    f"({summary['files_per_second']:.1f} files/s, {summary['mb_per_second']:.1f} MB/s)",
+                )
+            )
+            self.model.append_command_output(lines)
+            self.model.command_finished(1 if result.failed else 0, result.elapsed, False)
+
+        def on_error(error: Exception):
+            self.model.append_command_output([(STREAM_STDERR, str(error))])
+            self.model.command_finished(1, time.monotonic() - started, False)
+
+        self.background.submit(ImageOptimizer().optimize_project, project, on_done=on_done, on_error=on_error)
+
+    def cleanup(self):
+        self.job_runner.shutdown()
+        self.background.shutdown()
+        for watcher in self.watchers.values():
+            watcher.stop()
+        self.watchers.clear()
+        super().cleanup()
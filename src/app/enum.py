@@ -7,3 +7,14 @@ class MainKey(Enum):
     COMMAND_OUTPUT = "command_output"
     OPEN_PROJECTS = "open_projects"
     SELECTED_PROJECT = "selected_project"
+
+
+class ModuleLifecycle(Enum):
+    """模块关闭时的处理方式。"""
+
+    # 销毁，下次激活时重新创建
+    DESTROY = "destroy"
+    # 隐藏，下次激活时重置模型后重新显示
+    KEEP = "keep"
+    # 同 KEEP，但隐藏的模块数量有上限（MODULE_POOL_SIZE），超过时销毁最久未使用的
+    POOL = "pool"
@@ -1,9 +1,23 @@
 import logging
 from typing import Any, Dict
 
-from src.app.constants import EVENT_MAIN_MODEL_CHANGED
+from settings import UNDO_HISTORY_LIMIT_BYTES, UNDO_HISTORY_MAX_STEPS
+from src.app.constants import (
+    EVENT_ERROR_OCCURRED,
+    EVENT_MAIN_MODEL_CHANGED,
+    EVENT_MAIN_MODEL_COMMAND_FINISHED,
+    EVENT_MAIN_MODEL_COMMAND_OUTPUT,
+    EVENT_MAIN_MODEL_COMMAND_STARTED,
+    EVENT_MAIN_MODEL_PROJECT_CLOSED,
+    EVENT_MAIN_MODEL_PROJECT_INDEXED,
+    EVENT_MAIN_MODEL_PROJECT_OPENED,
+)
 from src.app.enum import MainKey
+from src.core.formula import FormulaIndex, renumber
 from src.core.mvc_template.model import Model
+from src.core.undo import EditDelta, UndoHistory, diff_text
+
+from . import _
 
 logger = logging.getLogger(__name__)
 
@@ -15,34 +29,206 @@ class MainModel(Model):
     """
 
     def __init__(self, data):
+        self.command_running = False
         super().__init__(data)
 
     def to_dict(self) -> Dict[str, Any]:
         return {key.value: getattr(self, key.value, None) for key in MainKey}
 
     def get_value(self, key: str) -> Any:
-        return getattr(self, key)
+        return getattr(self, key, None)
 
     def set_value(self, key: str, value):
-        if getattr(self, key) == value:
+        if getattr(self, key, None) == value:
             # 没变
             return
         setattr(self, key, value)
         self.send_event(EVENT_MAIN_MODEL_CHANGED, param={key: value})
 
-    # def add_project(self, path: str):
-    #     if path in self.open_projects:
-    #         logger.info(f"Project: {path} already opened.")
-    #         return
-    #     self.open_projects.append(path)
-    #     self.send_event(EVENT_MAIN_MODEL_PROJECT_OPENED, path=path)
-    #
-    # def remove_project(self, path: str):
-    #     if path not in self.open_projects:
-    #         err_msg_title = _("Error")
-    #         err_msg = f"{_('Project:')} {path} {_('not opened but closed.')}"
-    #         logger.exception(err_msg)
-    #         self.send_event(EVENT_ERROR_OCCURRED, title=err_msg_title, message=err_msg)
-    #         return
-    #     self.open_projects.remove(path)
-    #     self.send_event(EVENT_MAIN_MODEL_PROJECT_CLOSED, path=path)
+    def command_started(self, command: list, cancellable: bool = True):
+        """:param cancellable: 是否可以通过“取消”按钮停止（后台线程中的操作不能取消）"""
+        self.command_running = True
+        self.send_event(EVENT_MAIN_MODEL_COMMAND_STARTED, command=command, cancellable=cancellable)
+
+    def append_command_output(self, lines: list):
+        """一批命令输出，输出本身不保存在模型中。"""
+        self.send_event(EVENT_MAIN_MODEL_COMMAND_OUTPUT, lines=lines)
+
+    def command_finished(self, returncode: int, duration: float, cancelled: bool):
+        self.command_running = False
+        self.send_event(
+            EVENT_MAIN_MODEL_COMMAND_FINISHED, returncode=returncode, duration=duration, cancelled=cancelled
+        )
+
+    def add_project(self, path: str):
+        open_projects = self.get_value(MainKey.OPEN_PROJECTS.value) or []
+        if path in open_projects:
+            logger.info(f"Project: {path} already opened.")
+        else:
+            self.open_projects = open_projects + [path]
+            self.send_event(EVENT_MAIN_MODEL_PROJECT_OPENED, path=path)
+        self.set_value(MainKey.SELECTED_PROJECT.value, path)
+
+    def remove_project(self, path: str):
+        open_projects = self.get_value(MainKey.OPEN_PROJECTS.value) or []
+        if path not in open_projects:
+            err_msg_title = _("Error")
+            err_msg = f"{_('Project:')} {path} {_('not opened but closed.')}"
+            logger.error(err_msg)
+            self.send_event(EVENT_ERROR_OCCURRED, title=err_msg_title, message=err_msg)
+            return
+        self.open_projects = [project for project in open_projects if project != path]
+        self.send_event(EVENT_MAIN_MODEL_PROJECT_CLOSED, path=path)
+        if self.get_value(MainKey.SELECTED_PROJECT.value) == path:
+            self.set_value(MainKey.SELECTED_PROJECT.value, self.open_projects[-1] if self.open_projects else None)
+
+    def project_indexed(self, path: str, stats: dict):
+        """项目的文章元数据索引已刷新，stats 见 ProjectIndex.refresh。"""
+        self.send_event(EVENT_MAIN_MODEL_PROJECT_INDEXED, path=path, stats=stats)
+
+
+class FormulaModel(Model):
+    """
+    公式编号模型。
+    负责读取文章、解析公式块与公式引用，并生成重新编号后的内容。
+    解析与重新编号都由 src.core.formula 的单次线性扫描完成。
+    撤销历史只保存编辑差量，可以多级撤销，内存占用受 undo_limit_bytes 限制。
+    """
+
+    def __init__(self, undo_limit_bytes: int = UNDO_HISTORY_LIMIT_BYTES, undo_max_steps: int = UNDO_HISTORY_MAX_STEPS):
+        self._index = FormulaIndex()
+        self._history = UndoHistory(undo_limit_bytes, undo_max_steps)
+        # store_state_for_undo() 记下的内容，下一次整体替换 file_content 时转换成差量
+        self._undo_base = None
+        self._content = ""
+        super().__init__(
+            {
+                "filepath": None,
+                "file_content": "",
+                "formulas": [],
+                "references": [],
+                "is_dirty": False,
+            }
+        )
+
+    @property
+    def file_content(self) -> str:
+        return self._content
+
+    @file_content.setter
+    def file_content(self, content: str):
+        if self._undo_base is not None:
+            self._history.push(diff_text(self._undo_base, content))
+            self._undo_base = None
+        elif content != self._content:
+            # 没有先调用 store_state_for_undo() 的整体替换不能撤销，旧的差量也对不上新内容
+            self._history.clear()
+        self._content = content
+
+    @property
+    def previous_file_content(self) -> str | None:
+        """上一步撤销会恢复到的内容，没有可撤销的修改时为 None。"""
+        if self._undo_base is not None:
+            return self._undo_base
+        delta = self._history.peek()
+        return delta.revert(self._content) if delta is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "filepath": self.filepath,
+            "is_dirty": self.is_dirty,
+            "formulas": self.formulas,
+            "references": self.references,
+        }
+
+    def load_file(self, filepath: str) -> bool:
+        """读取文章并解析，同时重置脏状态和撤销状态。"""
+        try:
+            with open(filepath, encoding="utf-8", newline="") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            logger.exception(f"Error loading file: {filepath}.")
+            return False
+
+        self.filepath = filepath
+        self._undo_base = None
+        self._history.clear()
+        self.file_content = content
+        self.is_dirty = False
+        self.parse_content()
+        return True
+
+    def parse_content(self):
+        """完整解析当前内容中的公式和引用。"""
+        self._index.rebuild(self.file_content)
+        self._refresh_parsed()
+
+    def apply_edit(self, start: int, end: int, text: str):
+        """
+        把 [start, end) 替换为 text，并只重新解析受影响的公式块和引用。
+        适用于编辑器逐次按键的修改，避免每次都完整调用 parse_content()。
+        """
+        self._commit_undo_base()
+        delta = EditDelta(start, self._content[start:end], text)
+        self._history.push(delta)
+        self._content = delta.apply(self._content)
+        self.is_dirty = True
+        self._index.update(self._content, start, end, start + len(text))
+        self._refresh_parsed()
+
+    def _refresh_parsed(self):
+        self.formulas = self._index.formulas
+        self.references = self._index.references
+
+    def get_processed_content(self):
+        """
+        生成重新编号后的内容，不修改模型本身。
+        :return: (新内容, 被删除的引用数量)；没有内容或没有公式时返回 (None, 0)。
+        """
+        if not self.file_content or not self.formulas:
+            return None, 0
+        return renumber(self.file_content, self._index.tokens, self._index.latex_index)
+
+    def find_formula(self, latex: str) -> dict | None:
+        """按 LaTeX（忽略空白和 HTML 转义）查找公式，返回 {"id", "latex"}。"""
+        token = self._index.latex_index.lookup(latex)
+        return token.info if token is not None else None
+
+    def save_file_content(self) -> bool:
+        """只负责把当前内容写入文件，不改变模型状态。"""
+        if not self.filepath:
+            logger.error("Cannot save formula content, file path is not set.")
+            return False
+        try:
+            with open(self.filepath, "w", encoding="utf-8", newline="") as f:
+                f.write(self.file_content)
+        except OSError:
+            logger.exception(f"Error saving file: {self.filepath}.")
+            return False
+        return True
+
+    def store_state_for_undo(self):
+        """
+        记录一个撤销点。这里只保留对当前字符串的引用，
+        下一次整体替换 file_content 时才计算差量并放入撤销历史。
+        """
+        self._commit_undo_base()
+        self._undo_base = self._content
+
+    def _commit_undo_base(self):
+        if self._undo_base is not None:
+            self._history.push(diff_text(self._undo_base, self._content))
+            self._undo_base = None
+
+    def undo_last_change(self) -> bool:
+        """撤销最近一次修改，可连续调用多次。"""
+        self._commit_undo_base()
+        delta = self._history.pop()
+        if delta is None:
+            return False
+        self._content = delta.revert(self._content)
+        self.is_dirty = True
+        start = delta.start
+        self._index.update(self._content, start, start + len(delta.new_text), start + len(delta.old_text))
+        self._refresh_parsed()
+        return True
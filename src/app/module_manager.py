@@ -1,17 +1,42 @@
+import importlib
 import logging
 import tkinter as tk
-from typing import Any, Dict, Optional, Type
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Type, Union
 
+from settings import MODULE_POOL_SIZE
+
+from ..core.startup_profiler import profiler
 from ..core.tree import TreeNode
-from ..services.factory import Factory
+from ..services.factory import Factory, ReusableFactory
+from ..services.idle_tasks import IdleTasks
 from .constants import MODULE_ROOT, MODULE_ROOT_MAIN, MODULE_ROOT_MAIN_SETTINGS
-from .factory import MainFactory
-from .settings.factory import SettingsFactory
+from .enum import ModuleLifecycle
 
 logger = logging.getLogger(__name__)
 
 ModuleInstanceInfo = Dict[str, Any]
 ModuleNode = Dict[str, Any]  # e.g., {"instance": info, "children": {}}
+# 工厂类，或者它的点分导入路径，例如 "src.app.settings.factory.SettingsFactory"
+FactorySpec = Union[Type[Factory], str]
+
+
+def import_string(dotted_path: str):
+    """
+    根据点分路径导入一个对象，例如 "package.module.Class"（也可以写成 "package.module:Class"）。
+    :raise ImportError: 路径格式错误、模块不存在或者模块中没有这个对象
+    """
+    if ":" in dotted_path:
+        module_path, _, attribute = dotted_path.partition(":")
+    else:
+        module_path, _, attribute = dotted_path.rpartition(".")
+    if not module_path or not attribute:
+        raise ImportError(f"'{dotted_path}' is not a valid import path.")
+    module = importlib.import_module(module_path)
+    try:
+        return getattr(module, attribute)
+    except AttributeError as e:
+        raise ImportError(f"Module '{module_path}' has no attribute '{attribute}'.") from e
 
 
 class ModuleManager:
@@ -20,8 +45,18 @@ class ModuleManager:
     这是应用的核心协调器。
     """
 
-    def __init__(self, root_window: tk.Tk):
-        self._module_factories: Dict[str, Factory] = {}
+    def __init__(self, root_window: tk.Tk, pool_size: int = MODULE_POOL_SIZE):
+        """
+        :param pool_size: 使用 ModuleLifecycle.POOL 策略、已经隐藏的模块最多保留多少个
+        """
+        # 模块名 -> 工厂实例；还没有激活过的模块保存的是 FactorySpec
+        self._module_factories: Dict[str, Union[Factory, FactorySpec]] = {}
+        self._lifecycles: Dict[str, ModuleLifecycle] = {}
+        # 已经隐藏、等待复用的模块，最久未使用的在前面
+        self._hidden: "OrderedDict[str, ModuleLifecycle]" = OrderedDict()
+        self.pool_size = pool_size
+        # 预加载在第一次调用 preload 时才创建
+        self._idle_tasks: Optional[IdleTasks] = None
         self._activate_tree = None
         self._register_modules()
         # 根节点
@@ -38,10 +73,18 @@ class ModuleManager:
             "controller": controller,
         }
 
+    @property
+    def root_window(self) -> tk.Tk:
+        """根窗口，同时也是需要 after() 调度的服务所使用的调度器。"""
+        return self._activate_tree.data["view"]
+
     def get(self, name: str):
         """
         获取已经加载的模块 比如： MODULE_ROOT_MAIN_SETTINGS
+        已经隐藏、等待复用的模块返回 None。
         """
+        if name in self._hidden:
+            return None
         name = name.split(".", 1)[1]
         node = self._activate_tree.get_child(name)
         if node is None:
@@ -49,17 +92,58 @@ class ModuleManager:
         return node.data
 
     def _register_modules(self):
-        """集中注册所有已知的模块及其工厂和呈现方式。"""
-        self.register(MODULE_ROOT_MAIN, MainFactory)
-        self.register(MODULE_ROOT_MAIN_SETTINGS, SettingsFactory)
+        """
+        集中注册所有已知的模块及其工厂和呈现方式。
+        使用导入路径注册，工厂和它的 MVC 模块在第一次激活时才导入，模块再多也不影响启动时间。
+        """
+        self.register(MODULE_ROOT_MAIN, "src.app.factory.MainFactory")
+        # 设置窗口经常打开，关闭时只隐藏，下次重置模型后直接显示
+        self.register(MODULE_ROOT_MAIN_SETTINGS, "src.app.settings.factory.SettingsFactory", ModuleLifecycle.KEEP)
 
-    def register(self, name: str, factory: Type[Factory]) -> None:
+    def register(self, name: str, factory: FactorySpec, lifecycle: ModuleLifecycle = ModuleLifecycle.DESTROY) -> None:
         """
         注册一个模块。
         :param name: 模块的唯一名称。
-        :param factory: 创建模块MVC三元组的工厂类
+        :param factory: 创建模块MVC三元组的工厂类，或者它的点分导入路径（第一次激活时才导入）
+        :param lifecycle: 模块关闭（close）时的处理方式，KEEP / POOL 要求工厂继承 ReusableFactory，
+            否则改为 DESTROY；使用导入路径注册时在导入工厂之后才检查
         """
-        self._module_factories[name] = factory(name, self)
+        self._module_factories[name] = factory
+        self._lifecycles[name] = lifecycle
+        if not isinstance(factory, str):
+            self._check_lifecycle(name, factory)
+
+    def _check_lifecycle(self, name: str, factory_class: Type[Factory]):
+        """不能隐藏复用的工厂使用 KEEP / POOL 时退回 DESTROY。"""
+        lifecycle = self._lifecycles[name]
+        if lifecycle is ModuleLifecycle.DESTROY or issubclass(factory_class, ReusableFactory):
+            return
+        logger.warning(
+            f"Factory of module '{name}' ({factory_class.__name__}) cannot hide and reuse modules, "
+            f"using {ModuleLifecycle.DESTROY.name} instead of {lifecycle.name}."
+        )
+        self._lifecycles[name] = ModuleLifecycle.DESTROY
+
+    def is_loaded(self, name: str) -> bool:
+        """模块的工厂是否已经导入并创建。"""
+        return isinstance(self._module_factories.get(name), Factory)
+
+    def _load_factory(self, name: str) -> Optional[Factory]:
+        """取得模块的工厂，第一次调用时导入并创建；未注册或导入失败时返回 None。"""
+        factory = self._module_factories.get(name, None)
+        if factory is None or isinstance(factory, Factory):
+            return factory
+        try:
+            factory_class = import_string(factory) if isinstance(factory, str) else factory
+        except ImportError:
+            logger.exception(f"Cannot import factory of module '{name}': {factory}.")
+            return None
+        if isinstance(factory, str):
+            self._check_lifecycle(name, factory_class)
+        factory = factory_class(name, self)
+        self._module_factories[name] = factory
+        logger.debug(f"Loaded factory of ({name}): {type(factory).__name__}.")
+        return factory
 
     def activate(self, name: str, model_data: dict) -> Optional[ModuleInstanceInfo]:
         """
@@ -74,14 +158,20 @@ class ModuleManager:
         # 从root开始排除自身
         name = name.split(".", 1)[1]
 
-        factory = self._module_factories.get(full_name, None)
         # 工厂未注册
-        if factory is None:
+        if full_name not in self._module_factories:
             logger.exception(f"Module: '{full_name}' not registered.")
             return
 
         module_node: TreeNode = self._activate_tree.get_child(name)
 
+        # 已隐藏：重置模型后重新显示
+        if full_name in self._hidden:
+            del self._hidden[full_name]
+            self._module_factories[full_name].reuse(module_node.data, model_data)
+            logger.debug(f"[DONE] Reused: ({full_name}).")
+            return
+
         # 已激活
         if module_node is not None:
             data = module_node.data
@@ -96,33 +186,119 @@ class ModuleManager:
                 view.lift()
             return
 
-        # 激活模块
+        # 第一次激活时才导入工厂
+        with profiler.phase(f"load factory {full_name}"):
+            factory = self._load_factory(full_name)
+        if factory is None:
+            return
+
+        with profiler.phase(f"assemble {full_name}"):
+            self._assemble(full_name, factory, model_data)
+
+    def _assemble(self, full_name: str, factory: Factory, model_data: dict, prepare: bool = False) -> bool:
+        """
+        创建模块并加入激活树。
+        :param prepare: 调用 factory.prepare 创建隐藏的模块（预加载）
+        :return: 是否成功
+        """
+        name = full_name.split(".", 1)[1]
         module_node = self._activate_tree.add_child(name)
         parent_module = module_node.parent
         if not parent_module:
             # 1.如果是根模块不需要手动激活 2.非根模块没有父节点
             logger.exception(f"Module ('{full_name}') has no parent.")
-            return
+            return False
 
         parent_module_data = parent_module.data
         if parent_module_data is None:
             # 父节点数据缺失
             logger.exception(f"Module ('{full_name}') has no parent data.")
-            return
+            return False
 
         parent_view = parent_module_data.get("view", None)
         if parent_view is None:
             # 父模块不能没视图
             logger.exception(f"Module ('{full_name}') has no parent view.")
-            return
+            return False
 
-        model, view, controller = factory.assemble(parent_view, model_data)
+        if prepare:
+            model, view, controller = factory.prepare(parent_view, model_data)
+        else:
+            model, view, controller = factory.assemble(parent_view, model_data)
 
         # 添加到激活树
         instance_info = ModuleManager._create_node_data(model, view, controller)
         module_node.data = instance_info
 
-        logger.debug(f"[DONE] Activated: ({full_name}).")
+        logger.debug(f"[DONE] {'Prepared' if prepare else 'Activated'}: ({full_name}).")
+        return True
+
+    def preload(self, name: str, model_data=None):
+        """
+        在主窗口空闲时分片预加载一个模块，让第一次打开也很快：
+        先逐级导入工厂所在的模块，再创建工厂；提供 model_data 并且模块的生命周期是 KEEP / POOL 时，
+        再通过 factory.prepare 创建隐藏的模块，第一次激活时直接复用。
+        父模块必须在创建时已经激活；模块在此之前已经被激活时不再创建。
+        :param name: 模块全名
+        :param model_data: 模型初始参数，或者返回它的函数（创建时才调用，得到最新的数据）
+        """
+        if name not in self._module_factories:
+            logger.warning(f"Module: '{name}' not registered. Cannot preload.")
+            return
+        if self._idle_tasks is None:
+            self._idle_tasks = IdleTasks(self.root_window)
+
+        factory = self._module_factories[name]
+        if isinstance(factory, str):
+            module_path = factory.partition(":")[0] if ":" in factory else factory.rpartition(".")[0]
+            parts = module_path.split(".")
+            for i in range(1, len(parts) + 1):
+                self._idle_tasks.submit(importlib.import_module, ".".join(parts[:i]))
+        self._idle_tasks.submit(self._load_factory, name)
+        if model_data is not None and self._lifecycles[name] is not ModuleLifecycle.DESTROY:
+            self._idle_tasks.submit(self._prepare, name, model_data)
+
+    def _prepare(self, full_name: str, model_data):
+        name, parent_name = full_name.split(".", 1)[1], full_name.rsplit(".", 1)[0]
+        if self._activate_tree.get_child(name) is not None:
+            # 已经激活或者已经隐藏
+            return
+        if parent_name != MODULE_ROOT and self.get(parent_name) is None:
+            logger.debug(f"Parent of ({full_name}) is not active, skip preloading.")
+            return
+        factory = self._load_factory(full_name)
+        # 导入工厂之后生命周期可能退回了 DESTROY
+        if factory is None or self._lifecycles[full_name] is ModuleLifecycle.DESTROY:
+            return
+        if callable(model_data):
+            model_data = model_data()
+        if self._assemble(full_name, factory, model_data, prepare=True):
+            self._hidden[full_name] = self._lifecycles[full_name]
+            self._evict_pool()
+
+    def close(self, name: str):
+        """
+        关闭一个模块（例如用户关闭了它的窗口），按照注册时的 ModuleLifecycle 销毁或隐藏。
+        :param name: 要关闭的模块全名。
+        """
+        if name in self._hidden:
+            return
+        lifecycle = self._lifecycles.get(name, ModuleLifecycle.DESTROY)
+        data = self.get(name)
+        if lifecycle is ModuleLifecycle.DESTROY or data is None:
+            self.deactivate(name)
+            return
+
+        self._module_factories[name].hide(data)
+        self._hidden[name] = lifecycle
+        logger.debug(f"[DONE] Hidden: ({name}).")
+        self._evict_pool()
+
+    def _evict_pool(self):
+        """池中超过上限时销毁最久未使用的模块。"""
+        pooled = [hidden for hidden, policy in self._hidden.items() if policy is ModuleLifecycle.POOL]
+        for evicted in pooled[: max(0, len(pooled) - self.pool_size)]:
+            self.deactivate(evicted)
 
     def deactivate(self, name: str):
         """
@@ -143,9 +319,9 @@ class ModuleManager:
             logger.warning(f"Module {name} not found in activate tree. Cannot deactivate.")
             return
 
-        def _post_order_cleanup(node: TreeNode):
+        def _post_order_cleanup(node: TreeNode, full_name: str):
             for child in node.get_children().values():
-                _post_order_cleanup(child)
+                _post_order_cleanup(child, f"{full_name}.{child.name}")
 
             instance_info = node.data
             if not instance_info:
@@ -160,14 +336,22 @@ class ModuleManager:
             if view and hasattr(view, "cleanup"):
                 view.cleanup()
 
+            # 由工厂销毁它创建的窗口等
+            factory = self._module_factories.get(full_name)
+            if isinstance(factory, Factory):
+                factory.dispose(instance_info)
+            self._hidden.pop(full_name, None)
+
             logger.debug(f"Deactivating now -> ({node.name}).")
 
         # 开始后序遍历清理
-        _post_order_cleanup(node_to_remove)
+        _post_order_cleanup(node_to_remove, name)
 
         # 移除节点
         self._activate_tree.remove_child(relative_name)
         logger.debug(f"[DONE] Deactivated: ({name}).")
 
     def cleanup_all(self):
+        if self._idle_tasks is not None:
+            self._idle_tasks.shutdown()
         self.deactivate(MODULE_ROOT)
@@ -1,8 +1,27 @@
+import tkinter as tk
+
+from src.core.startup_profiler import profiler
 from src.services.resource import icon_loader
 
-# 图标资源
-icon_settings = icon_loader.load("settings.png")
-icon_info = icon_loader.load("info.png")
-icon_open = icon_loader.load("open.png")
-icon_close = icon_loader.load("close.png")
-icon_new = icon_loader.load("new.png")
+# 图标资源：只记录文件名，第一次使用时才读取
+ICON_SETTINGS = "settings.png"
+ICON_INFO = "info.png"
+ICON_OPEN = "open.png"
+ICON_CLOSE = "close.png"
+ICON_NEW = "new.png"
+
+# (名称, 尺寸, 缩放) -> PhotoImage；应用只有一个 Tk 根窗口，重新创建的视图可以直接复用
+_photos = {}
+
+
+def icon_photo(name: str, size: int, scale: float = 1.0) -> tk.PhotoImage:
+    """
+    缩放到 size * scale 像素的图标。
+    Tk 直接读取预先缩放好的 PNG，不需要经过 PIL。
+    """
+    key = (name, size, scale)
+    photo = _photos.get(key)
+    if photo is None:
+        with profiler.phase(f"icon {name}@{size}"):
+            photo = _photos[key] = tk.PhotoImage(file=str(icon_loader.resized_path(name, size, scale)))
+    return photo
@@ -2,33 +2,56 @@ import tkinter as tk
 
 from src.app.settings.controller import SettingsController
 from src.app.settings.view import SettingsView
-from src.services.factory import Factory
+from src.services.factory import ReusableFactory
 from src.utils.ui import UI
 
 from . import _
 from .model import SettingsModel
 
 
-class SettingsFactory(Factory):
+class SettingsFactory(ReusableFactory):
     def assemble(self, parent_view, model_data):
-        # 创建一个新的Toplevel窗口来容纳设置视图
+        model, view, controller = self.prepare(parent_view, model_data)
+        SettingsFactory._show(view.winfo_toplevel())
+        # 返回MVC三元组，其中view现在已经被正确地展示在它自己的窗口里
+        return model, view, controller
+
+    def prepare(self, parent_view, model_data):
+        # 创建一个新的Toplevel窗口来容纳设置视图，创建完之前保持隐藏
         toplevel_window = tk.Toplevel(parent_view.winfo_toplevel())
+        toplevel_window.withdraw()
         toplevel_window.title(_("settings"))
         toplevel_window.transient(parent_view.winfo_toplevel())
-        toplevel_window.grab_set()
-        toplevel_window.protocol("WM_DELETE_WINDOW", lambda: SettingsFactory.destroy_module(self, toplevel_window))
+        # 按注册时的生命周期策略隐藏或销毁
+        toplevel_window.protocol("WM_DELETE_WINDOW", lambda: self.module_manager.close(self.module_name))
 
         model = SettingsModel(model_data)
         view = SettingsView(toplevel_window, model)
         controller = SettingsController(model)
 
-        # 组合，居中显示
+        # 组合，居中
         view.pack(in_=toplevel_window, fill="both", expand=True)
-        UI.center_window(toplevel_window, 400, 300)
-
-        # 返回MVC三元组，其中view现在已经被正确地展示在它自己的窗口里
+        UI.center_window(toplevel_window, 400, 300, show=False)
         return model, view, controller
 
-    def destroy_module(self, window: tk.Misc):
-        self.module_manager.deactivate(self.module_name)
-        window.destroy()
+    @staticmethod
+    def _show(window: tk.Toplevel):
+        window.deiconify()
+        window.grab_set()
+        window.lift()
+
+    def hide(self, instance_info):
+        window = instance_info["view"].winfo_toplevel()
+        window.grab_release()
+        window.withdraw()
+
+    def reuse(self, instance_info, model_data):
+        instance_info["model"].reset(model_data)
+        SettingsFactory._show(instance_info["view"].winfo_toplevel())
+
+    def dispose(self, instance_info):
+        try:
+            instance_info["view"].winfo_toplevel().destroy()
+        except tk.TclError:
+            # 主窗口已经关闭，窗口随之销毁
+            pass
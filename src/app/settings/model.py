@@ -1,4 +1,3 @@
-import copy
 import logging
 from typing import Any
 
@@ -6,8 +5,10 @@ from src.app.constants import (
     EVENT_MAIN_SETTINGS_MODEL_APPLIED,
     EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY,
     EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY_CANCELLED,
+    EVENT_MAIN_SETTINGS_MODEL_RESET,
 )
 from src.core.mvc_template.model import Model
+from src.core.overlay import OverlayDict
 
 logger = logging.getLogger(__name__)
 
@@ -15,57 +16,54 @@ logger = logging.getLogger(__name__)
 class SettingsModel(Model):
     """
     设置模块的数据模型。
-    使用一个Set来高效地跟踪“脏”字段，并提供一个通用的setter方法。
+    设置保存在写时复制的 OverlayDict 中：打开、修改、应用和重置都只和修改过的字段数量有关，
+    修改层中的键就是“脏”字段。model_data 由模型接管，调用方不应再修改它（MainModel.to_dict 每次返回新的字典）。
     """
 
     def __init__(self, model_data: dict):
         super().__init__(model_data)
-        self.dirty_fields = set()
-        self.original_settings = copy.deepcopy(model_data)
-        self.working_settings = copy.deepcopy(model_data)
+        self.settings = OverlayDict(model_data)
+
+    def reset(self, model_data: dict):
+        """复用模块时用新的设置重置模型，丢弃未应用的修改。"""
+        self.settings.reset(model_data)
+        self.send_event(EVENT_MAIN_SETTINGS_MODEL_RESET)
 
     def get_value(self, key: str) -> Any:
-        return self.working_settings.get(key, None)
+        return self.settings.get(key, None)
 
     def set_value(self, key: str, value):
-        if key not in self.working_settings:
+        if key not in self.settings:
             logger.exception(f"Settings key error: {key}")
             return
 
         # 仅当工作值发生变化时才继续
-        if self.working_settings[key] == value:
+        if self.settings[key] == value:
             return
-        self.working_settings[key] = value
-        # 将新工作值与原始值比较，更新脏状态
-        if self.working_settings[key] != self.original_settings[key]:
-            self.dirty_fields.add(key)
+        # 与原始值相同时 OverlayDict 会移除修改，脏状态随之更新
+        self.settings.set(key, value)
+        if self.settings.is_changed(key):
             # 更新UI脏*显示
             self.send_event(EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY, key=key)
         else:
-            self.dirty_fields.discard(key)  # 如果改回原样，则移除脏标记
             # 取消UI脏*显示
             self.send_event(EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY_CANCELLED, key=key)
 
     def to_dict(self):
-        return self.working_settings
+        return dict(self.settings)
 
     def is_dirty(self) -> bool:
-        """通过检查Set是否为空来高效判断脏状态"""
-        return len(self.dirty_fields) > 0
+        return len(self.settings.changes) > 0
 
     def get_dirty_fields(self) -> set:
-        """直接返回脏字段集合"""
-        return self.dirty_fields
+        return set(self.settings.changes)
 
     def apply_changes(self):
-        """应用变更"""
+        """应用变更，只合并修改过的字段"""
         if not self.is_dirty():
             return
 
-        changed_settings = {key: self.working_settings[key] for key in self.dirty_fields}
-
-        self.original_settings = copy.deepcopy(self.working_settings)
-        self.dirty_fields.clear()
+        changed_settings = self.settings.commit()
 
         self.send_event(EVENT_MAIN_SETTINGS_MODEL_APPLIED, settings=changed_settings)
         # self.send_event(EVENT_MAIN_SETTINGS_MODEL_WORKING_STATE_CHANGED)
@@ -5,6 +5,7 @@ from settings import LANGUAGES
 from src.app.constants import (  # EVENT_MAIN_SETTINGS_MODEL_WORKING_STATE_CHANGED,
     EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY,
     EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY_CANCELLED,
+    EVENT_MAIN_SETTINGS_MODEL_RESET,
     EVENT_MAIN_SETTINGS_UI_APPLY_CLICKED,
     EVENT_MAIN_SETTINGS_UI_LANGUAGE_SELECTED,
 )
@@ -76,6 +77,7 @@ class SettingsView(View):
         # 订阅字段变脏和取消变脏的事件
         self.subscribe(EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY, self._on_field_dirty)
         self.subscribe(EVENT_MAIN_SETTINGS_MODEL_FIELD_DIRTY_CANCELLED, self._on_field_dirty_cancelled)
+        self.subscribe(EVENT_MAIN_SETTINGS_MODEL_RESET, self._on_model_reset)
         # self.subscribe(EVENT_MAIN_SETTINGS_MODEL_APPLIED, self.on_settings_applied)
 
     def _on_apply_clicked(self):
@@ -109,6 +111,13 @@ class SettingsView(View):
     def _on_field_dirty_cancelled(self, key: str):
         self._on_field_state_changed(key, False)
 
+    def _on_model_reset(self):
+        """窗口被复用：显示模型中的新值并刷新界面文字（隐藏期间语言可能已经切换），清除所有脏标记。"""
+        self.winfo_toplevel().title(self.update_ui_texts())
+        for key in self.field_labels:
+            self._update_label_visuals(key, False)
+        self.apply_button.config(state="disabled")
+
     def _on_field_state_changed(self, key: str, dirty: bool):
         """当任何字段的脏状态改变时调用"""
         # 1. 更新对应标签的星号
@@ -1,18 +1,25 @@
 import tkinter as tk
-from tkinter import scrolledtext, ttk
+from tkinter import ttk
 
-from PIL import Image, ImageTk
-
-from settings import APP_NAME
-from src.app.resources import icon_info, icon_settings
+from settings import APP_NAME, COMMAND_LOG_FILE_PATH, COMMAND_OUTPUT_MAX_LINES
+from src.app.resources import ICON_INFO, ICON_OPEN, ICON_SETTINGS, icon_photo
 from src.core.mvc_template.view import View as BaseView
+from src.services.job_runner import STREAM_STDERR, STREAM_STDOUT
 
 from ..utils.ui import UI
+from ..utils.widgets import BoundedOutputText
 from . import _
 from .constants import (
+    EVENT_MAIN_MODEL_COMMAND_FINISHED,
+    EVENT_MAIN_MODEL_COMMAND_OUTPUT,
+    EVENT_MAIN_MODEL_COMMAND_STARTED,
+    EVENT_MAIN_MODEL_PROJECT_INDEXED,
+    EVENT_MAIN_UI_CANCEL_CLICKED,
     EVENT_MAIN_UI_DEPLOY_CLICKED,
     EVENT_MAIN_UI_GENERATE_CLICKED,
     EVENT_MAIN_UI_INFO_CLICKED,
+    EVENT_MAIN_UI_OPEN_PROJECT_CLICKED,
+    EVENT_MAIN_UI_OPTIMIZE_IMAGES_CLICKED,
     EVENT_MAIN_UI_SETTINGS_CLICKED,
 )
 from .enum import MainKey
@@ -45,6 +52,8 @@ class MainView(BaseView):
         self.info_button.pack(side="right", padx=(0, 10))
         self.settings_button = ttk.Button(title_bar, image=self.settings_icon, style="Header.TButton")
         self.settings_button.pack(side="right", padx=(0, 5))
+        self.open_project_button = ttk.Button(title_bar, image=self.open_icon, style="Header.TButton")
+        self.open_project_button.pack(side="left", padx=(10, 0))
         self.title_label = ttk.Label(title_bar, text="...", font=("Segoe UI", 16, "bold"), background="#f0f0f0")
         self.title_label.pack(expand=True)
 
@@ -60,12 +69,52 @@ class MainView(BaseView):
         self.info_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_INFO_CLICKED))
         self.generate_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_GENERATE_CLICKED))
         self.deploy_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_DEPLOY_CLICKED))
-        # 假设标题栏有一个“打开项目”的按钮，或者未来菜单项会发送这个事件
-        # 这里我们暂时不创建这个按钮，但保留这个逻辑
+        self.optimize_images_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_OPTIMIZE_IMAGES_CLICKED))
+        self.cancel_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_CANCEL_CLICKED))
+        self.open_project_button.config(command=lambda: self.send_event(EVENT_MAIN_UI_OPEN_PROJECT_CLICKED))
 
     def _setup_subscriptions(self):
         # self.subscribe(EVENT_MAIN_MODEL_LANGUAGE_CHANGED, self.on_language_changed)
-        pass
+        self.subscribe(EVENT_MAIN_MODEL_COMMAND_STARTED, self._on_command_started)
+        self.subscribe(EVENT_MAIN_MODEL_COMMAND_OUTPUT, self._on_command_output)
+        self.subscribe(EVENT_MAIN_MODEL_COMMAND_FINISHED, self._on_command_finished)
+        self.subscribe(EVENT_MAIN_MODEL_PROJECT_INDEXED, self._on_project_indexed)
+
+    def _on_command_started(self, command: list, cancellable: bool):
+        self.generate_button.config(state="disabled")
+        self.deploy_button.config(state="disabled")
+        self.optimize_images_button.config(state="disabled")
+        self.cancel_button.config(state="normal" if cancellable else "disabled")
+        self._append_output([(STREAM_STDOUT, f"$ {' '.join(command)}")])
+
+    def _on_command_output(self, lines: list):
+        self._append_output(lines)
+
+    def _on_command_finished(self, returncode: int, duration: float, cancelled: bool):
+        self.generate_button.config(state="normal")
+        self.deploy_button.config(state="normal")
+        self.optimize_images_button.config(state="normal")
+        self.cancel_button.config(state="disabled")
+        status = _("Cancelled") if cancelled else f"{_('Exit code')}: {returncode}"
+        stream = STREAM_STDOUT if returncode == 0 and not cancelled else STREAM_STDERR
+        self._append_output([(stream, f"[{status}, {duration:.2f} s]")])
+        self.output_text.flush()
+
+    def _on_project_indexed(self, path: str, stats: dict):
+        changed = len(stats["added"]) + len(stats["updated"])
+        self._append_output(
+            [
+                (
+                    STREAM_STDOUT,
+                    f"[{path}: {stats['posts']} {_('posts')}, {changed} {_('indexed')}, "
+                    f"{len(stats['removed'])} {_('removed')}, {stats['elapsed']:.2f} s]",
+                )
+            ]
+        )
+        self.output_text.flush()
+
+    def _append_output(self, lines: list):
+        self.output_text.append(lines)
 
     def on_language_changed(self, **kwargs):
         self.update_ui_texts()
@@ -74,6 +123,8 @@ class MainView(BaseView):
         self.cmd_panel.config(text=_("Command Panel"))
         self.generate_button.config(text=_("Generate"))
         self.deploy_button.config(text=_("Deploy"))
+        self.optimize_images_button.config(text=_("Optimize images"))
+        self.cancel_button.config(text=_("Cancel"))
         # --- 同样使用 winfo_toplevel() 来设置标题 ---
         toplevel = self.winfo_toplevel()
         toplevel.title(self.model.get_value(MainKey.APP_NAME.value))
@@ -81,10 +132,9 @@ class MainView(BaseView):
     def _load_icons(self):
         self.TITLE_BAR_HEIGHT = 50
         icon_size = self.TITLE_BAR_HEIGHT - 18
-        self.settings_icon = ImageTk.PhotoImage(
-            icon_settings.resize((icon_size, icon_size), resample=Image.Resampling.LANCZOS)
-        )
-        self.info_icon = ImageTk.PhotoImage(icon_info.resize((icon_size, icon_size), resample=Image.Resampling.LANCZOS))
+        self.settings_icon = icon_photo(ICON_SETTINGS, icon_size)
+        self.info_icon = icon_photo(ICON_INFO, icon_size)
+        self.open_icon = icon_photo(ICON_OPEN, icon_size)
 
     def _create_command_panel(self, parent):
         self.cmd_panel = ttk.Labelframe(parent, text=_("Command Panel"), padding=10)
@@ -94,6 +144,13 @@ class MainView(BaseView):
         self.generate_button = ttk.Button(button_frame, text=_("Generate"))
         self.generate_button.pack(side="left", padx=(0, 5))
         self.deploy_button = ttk.Button(button_frame, text=_("Deploy"))
-        self.deploy_button.pack(side="left")
-        self.output_text = scrolledtext.ScrolledText(self.cmd_panel, height=15, wrap=tk.WORD, state="disabled")
+        self.deploy_button.pack(side="left", padx=(0, 5))
+        self.optimize_images_button = ttk.Button(button_frame, text=_("Optimize images"))
+        self.optimize_images_button.pack(side="left", padx=(0, 5))
+        self.cancel_button = ttk.Button(button_frame, text=_("Cancel"), state="disabled")
+        self.cancel_button.pack(side="left")
+        self.output_text = BoundedOutputText(
+            self.cmd_panel, COMMAND_OUTPUT_MAX_LINES, COMMAND_LOG_FILE_PATH, height=15, wrap=tk.WORD
+        )
+        self.output_text.tag_configure(STREAM_STDERR, foreground="#c0392b")
         self.output_text.pack(fill="both", expand=True)
@@ -0,0 +1,287 @@
+import html
+import re
+from bisect import bisect_right
+
+# 没有 \tag{} 的公式使用的编号
+NO_TAG_ID = "无"
+
+KIND_FORMULA = "formula"
+KIND_REFERENCE = "reference"
+
+_BLOCK_MARK = "$$"
+_SPAN_MARK = "<span"
+_SPAN_CLOSE = "</span>"
+_REF_CLASS = "formula-ref"
+
+# 以下正则只作用于单个公式块或单个标签，不会扫描整篇文档
+_TAG_PATTERN = re.compile(r"\\tag\*?\{([^{}]*)\}")
+_REF_PATTERN = re.compile(r"<span\b([^<>]*)>([^<]*)</span>")
+_CLASS_PATTERN = re.compile(r'\bclass\s*=\s*"([^"]*)"')
+_ATTR_PATTERN = re.compile(r'\b(data-formula-old|data-formula)\s*=\s*"([^"]*)"')
+
+
+def normalize_latex(latex: str) -> str:
+    """LaTeX 的比较键：反转义 HTML 实体并去掉所有空白。"""
+    if "&" in latex:
+        latex = html.unescape(latex)
+    return "".join(latex.split())
+
+
+class FormulaToken:
+    """
+    扫描得到的一个片段：公式块 ($$ ... $$) 或公式引用 (<span class="formula-ref">)。
+    - start/end: 片段在文档中的偏移 [start, end)
+    - info: 公式为 {"id", "latex"}，引用为 {"ref_id", "latex"}
+    - reach: 扫描到此片段为止读到过的最远位置（单调不减），用于判断编辑会影响哪些片段
+    - key: 规范化后的 LaTeX（见 normalize_latex），引用没有 LaTeX 时为 None
+    """
+
+    __slots__ = ("kind", "start", "end", "info", "reach", "key")
+
+    def __init__(self, kind: str, start: int, end: int, info: dict, key: str | None):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.info = info
+        self.reach = end
+        self.key = key
+
+    def __repr__(self):
+        return f"<FormulaToken: {self.kind}, [{self.start}, {self.end}), {self.info}>"
+
+
+def _parse_formula(text: str, start: int, end: int) -> FormulaToken:
+    inner = text[start + len(_BLOCK_MARK) : end - len(_BLOCK_MARK)]
+    formula_id = NO_TAG_ID
+    if "\\tag" in inner:
+        tags = _TAG_PATTERN.findall(inner)
+        if tags:
+            formula_id = tags[0].strip()
+            inner = _TAG_PATTERN.sub("", inner)
+    latex = "\n".join(line for line in map(str.strip, inner.splitlines()) if line)
+    return FormulaToken(KIND_FORMULA, start, end, {"id": formula_id, "latex": latex}, normalize_latex(latex))
+
+
+def _parse_reference(text: str, start: int):
+    """尝试在 start 处解析一个公式引用，不是引用时返回 None。"""
+    match = _REF_PATTERN.match(text, start)
+    if match is None:
+        return None
+    attrs, body = match.groups()
+    if _REF_CLASS not in attrs:
+        return None
+    class_match = _CLASS_PATTERN.search(attrs)
+    if class_match is None or _REF_CLASS not in class_match.group(1).split():
+        return None
+
+    latex = key = None
+    if "data-formula" in attrs:
+        payload = dict(_ATTR_PATTERN.findall(attrs))
+        latex = payload.get("data-formula-old", payload.get("data-formula"))
+        if latex is not None:
+            key = normalize_latex(latex)
+            latex = html.unescape(latex) if "&" in latex else latex
+    info = {"ref_id": body.strip().strip("()").strip(), "latex": latex}
+    return FormulaToken(KIND_REFERENCE, start, match.end(), info, key)
+
+
+def iter_tokens(text: str, pos: int = 0, reach: int = 0):
+    """
+    从 pos 开始按顺序产出公式块和引用。
+    两个标记的查找位置各自单调递增，整篇文档只被 str.find 线性扫描一次。
+    :param reach: 扫描起点之前已经读到的最远位置
+    """
+    length = len(text)
+    next_block = text.find(_BLOCK_MARK, pos)
+    next_span = text.find(_SPAN_MARK, pos)
+    while next_block != -1 or next_span != -1:
+        if next_span == -1 or (next_block != -1 and next_block < next_span):
+            close = text.find(_BLOCK_MARK, next_block + len(_BLOCK_MARK))
+            if close == -1:
+                # 未闭合的 $$ 当作普通文本，之后也不会再有公式块
+                next_block = -1
+                reach = length
+                continue
+            token = _parse_formula(text, next_block, close + len(_BLOCK_MARK))
+        else:
+            token = _parse_reference(text, next_span)
+            if token is None:
+                # 匹配失败时正则最远只会读到下一个 "<" 之后的 "</span>"
+                bracket = text.find("<", next_span + len(_SPAN_MARK))
+                reach = max(reach, bracket + len(_SPAN_CLOSE) if bracket != -1 else length)
+                next_span = text.find(_SPAN_MARK, next_span + len(_SPAN_MARK))
+                continue
+
+        reach = max(reach, token.end)
+        token.reach = reach
+        yield token
+        if next_block != -1 and next_block < token.end:
+            next_block = text.find(_BLOCK_MARK, token.end)
+        if next_span != -1 and next_span < token.end:
+            next_span = text.find(_SPAN_MARK, token.end)
+
+
+def tokenize(text: str, pos: int = 0) -> list:
+    """一次线性扫描，返回 pos 之后所有公式块和引用（按位置排序）。"""
+    return list(iter_tokens(text, pos))
+
+
+class LatexIndex:
+    """
+    规范化 LaTeX -> 公式片段 的哈希索引，引用按 LaTeX 查找公式时是 O(1)。
+    同一个公式出现多次时，以文档中最靠前的为准。
+    """
+
+    def __init__(self, tokens: list = ()):
+        self._formulas = {}
+        for token in tokens:
+            self.add(token)
+
+    def __len__(self):
+        return len(self._formulas)
+
+    def add(self, token: FormulaToken):
+        if token.kind == KIND_FORMULA:
+            self._formulas.setdefault(token.key, []).append(token)
+
+    def remove(self, token: FormulaToken):
+        if token.kind != KIND_FORMULA:
+            return
+        bucket = self._formulas.get(token.key)
+        if not bucket:
+            return
+        for i, candidate in enumerate(bucket):
+            if candidate is token:
+                del bucket[i]
+                break
+        if not bucket:
+            del self._formulas[token.key]
+
+    def lookup(self, latex: str, normalized: bool = False) -> FormulaToken | None:
+        bucket = self._formulas.get(latex if normalized else normalize_latex(latex))
+        if not bucket:
+            return None
+        return bucket[0] if len(bucket) == 1 else min(bucket, key=lambda token: token.start)
+
+
+class FormulaIndex:
+    """
+    公式块与引用的偏移索引。
+    编辑时只重新扫描受影响的片段，之后的片段只平移偏移，直到扫描结果与旧索引重新对齐。
+    """
+
+    def __init__(self, text: str = ""):
+        self.tokens = tokenize(text)
+        self.latex_index = LatexIndex(self.tokens)
+
+    def rebuild(self, text: str):
+        self.tokens = tokenize(text)
+        self.latex_index = LatexIndex(self.tokens)
+
+    @property
+    def formulas(self) -> list:
+        return [token.info for token in self.tokens if token.kind == KIND_FORMULA]
+
+    @property
+    def references(self) -> list:
+        return [token.info for token in self.tokens if token.kind == KIND_REFERENCE]
+
+    def update(self, text: str, start: int, old_end: int, new_end: int):
+        """
+        文档的 [start, old_end) 已被替换为 text 中的 [start, new_end)，增量更新索引。
+        :param text: 编辑后的完整文档
+        :return: (first, removed, added) 被替换片段的位置、旧片段数量和新片段数量
+        """
+        tokens = self.tokens
+        delta = new_end - old_end
+
+        # 只有扫描时读到过编辑点附近的片段才需要重新扫描；
+        # 编辑点前面的几个字符可能和新内容拼成一个新标记，所以再留出一个标记长度的余量
+        first = bisect_right(tokens, start - len(_SPAN_MARK), key=lambda token: token.reach)
+        scan_from = tokens[first - 1].end if first else 0
+        reach = tokens[first - 1].reach if first else 0
+
+        last = first
+        count = len(tokens)
+        new_tokens = []
+        for token in iter_tokens(text, scan_from, reach):
+            new_tokens.append(token)
+            if token.start < new_end:
+                continue
+            while last < count and (tokens[last].start < old_end or tokens[last].start + delta < token.start):
+                last += 1
+            if last < count and tokens[last].start + delta == token.start:
+                # 从同一位置开始扫描，后面的文本完全相同，结果也必然相同
+                last += 1
+                break
+        else:
+            last = count
+
+        reach = new_tokens[-1].reach if new_tokens else reach
+        for token in tokens[last:]:
+            token.start += delta
+            token.end += delta
+            token.reach = max(token.reach + delta, reach)
+        for token in tokens[first:last]:
+            self.latex_index.remove(token)
+        for token in new_tokens:
+            self.latex_index.add(token)
+        tokens[first:last] = new_tokens
+        return first, last - first, len(new_tokens)
+
+
+def _line_indent(text: str, start: int) -> str:
+    """$$ 所在行的前导空白；如果 $$ 前面有其他文字则不缩进。"""
+    line_start = text.rfind("\n", 0, start) + 1
+    prefix = text[line_start:start]
+    return prefix if not prefix or prefix.isspace() else ""
+
+
+def render_formula(latex: str, number, indent: str = "") -> str:
+    inner_indent = indent + "  "
+    body = "".join(f"{inner_indent}{line}\n" for line in latex.splitlines())
+    return f"$$\n{body}{inner_indent}\\tag{{{number}}}\n{indent}$$"
+
+
+def render_reference(latex: str, number) -> str:
+    return f'<span class="formula-ref" data-formula="{html.escape(latex, quote=True)}">({number})</span>'
+
+
+def renumber(text: str, tokens: list, latex_index: LatexIndex | None = None):
+    """
+    按出现顺序为所有公式重新编号，并更新/删除引用。
+    引用先按规范化 LaTeX 在哈希索引中查找公式，找不到时再按旧编号查找。
+    编号只在片段列表上计算，文档本身只在输出时遍历一次。
+    :return: (新内容, 被删除的引用数量)
+    """
+    if latex_index is None:
+        latex_index = LatexIndex(tokens)
+    numbers = {}
+    by_old_id = {}
+    for token in tokens:
+        if token.kind != KIND_FORMULA:
+            continue
+        numbers[token] = len(numbers) + 1
+        if token.info["id"] != NO_TAG_ID:
+            by_old_id.setdefault(token.info["id"], token)
+
+    pieces = []
+    pos = 0
+    deleted = 0
+    for token in tokens:
+        pieces.append(text[pos : token.start])
+        pos = token.end
+        if token.kind == KIND_FORMULA:
+            pieces.append(render_formula(token.info["latex"], numbers[token], _line_indent(text, token.start)))
+            continue
+
+        target = latex_index.lookup(token.key, normalized=True) if token.key is not None else None
+        if target is None:
+            target = by_old_id.get(token.info["ref_id"])
+        if target is None:
+            # 引用的公式已不存在，删除整个引用
+            deleted += 1
+            continue
+        pieces.append(render_reference(target.info["latex"], numbers[target]))
+    pieces.append(text[pos:])
+    return "".join(pieces), deleted
@@ -0,0 +1,314 @@
+# Hexo 文章头部（front-matter）的读取与解析
+# 只支持 Hexo 文章中常见的 YAML 子集：标量、块列表、行内列表、日期和 | / > 多行文本。
+# 不依赖 YAML 库，读取时按小块读入，读到结束的 --- 就停止，不会读取正文。
+import io
+import json
+import re
+from datetime import date, datetime
+
+FENCE = b"---"
+# 每次读取的字节数，绝大多数文章的头部一次就能读完
+CHUNK_SIZE = 4096
+# 超过这个大小还没有找到结束分隔线，就认为不是 front-matter
+MAX_HEADER_BYTES = 256 * 1024
+_FIRST_LINE_LIMIT = 64
+
+_DATE_PATTERN = re.compile(
+    r"\d{4}-\d{1,2}-\d{1,2}(?:[Tt ]+\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?\s*(?:Z|[+-]\d{2}(?::?\d{2})?)?)?"
+)
+_INT_PATTERN = re.compile(r"[-+]?\d+")
+_FLOAT_PATTERN = re.compile(r"[-+]?(?:\d+\.\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_NULLS = ("", "~", "null", "Null", "NULL")
+# 以这些字符开头或者包含这些字符的字符串写回时需要加引号
+_SPECIAL_FIRST = frozenset("-?:,[]{}#&*!|>'\"%@`")
+_SPECIAL_CHARS = (": ", " #", ",", "[", "]", "{", "}")
+_BOOLS = {"true": True, "True": True, "TRUE": True, "false": False, "False": False, "FALSE": False}
+
+
+def _locate_header(f, chunk_size: int, max_bytes: int):
+    """
+    按块读取并定位 front-matter。
+    :return: (已读入的数据, 头部起始偏移, 头部结束偏移, 正文偏移)；没有 front-matter 时返回 None
+    """
+    buffer = f.read(chunk_size)
+    eof = len(buffer) < chunk_size
+    # 第一行必须是 ---（允许 UTF-8 BOM 和行尾空白）
+    while b"\n" not in buffer and not eof and len(buffer) < _FIRST_LINE_LIMIT:
+        chunk = f.read(chunk_size)
+        eof = len(chunk) < chunk_size
+        buffer += chunk
+    bom = 3 if buffer.startswith(b"\xef\xbb\xbf") else 0
+    first_end = buffer.find(b"\n", bom)
+    if first_end == -1 or buffer[bom:first_end].rstrip() != FENCE:
+        return None
+    header_start = first_end + 1
+
+    # 结束分隔线一定在某个 "\n---" 处；search_from 之前的内容已经检查过
+    search_from = header_start - 1
+    while True:
+        pos = buffer.find(b"\n" + FENCE, search_from)
+        while pos != -1:
+            line_end = buffer.find(b"\n", pos + 1)
+            if line_end == -1 and not eof:
+                # 这一行还没读完，读入下一块后再判断
+                break
+            body = len(buffer) if line_end == -1 else line_end + 1
+            if buffer[pos + 1 : body].rstrip() == FENCE:
+                header_end = pos - 1 if pos > header_start and buffer[pos - 1] == 0x0D else pos
+                return buffer, header_start, max(header_start, header_end), body
+            pos = buffer.find(b"\n" + FENCE, pos + 1)
+        if eof or len(buffer) >= max_bytes:
+            return None
+        search_from = pos if pos != -1 else max(len(buffer) - len(FENCE), header_start - 1)
+        chunk = f.read(chunk_size)
+        eof = len(chunk) < chunk_size
+        buffer += chunk
+
+
+def read_header(f, chunk_size: int = CHUNK_SIZE, max_bytes: int = MAX_HEADER_BYTES):
+    """
+    从二进制文件的开头按块读取 front-matter，找到结束的 --- 后立即停止。
+    :return: (头部文本, 正文在文件中的字节偏移)；没有 front-matter 时返回 (None, 0)
+    """
+    located = _locate_header(f, chunk_size, max_bytes)
+    if located is None:
+        return None, 0
+    buffer, header_start, header_end, body = located
+    return buffer[header_start:header_end].decode("utf-8", errors="replace"), body
+
+
+def _unquote(value: str) -> str:
+    if value[0] == "'":
+        return value[1:-1].replace("''", "'")
+    inner = value[1:-1]
+    if "\\" not in inner:
+        return inner
+    try:
+        return inner.encode("latin-1", "backslashreplace").decode("unicode_escape")
+    except UnicodeDecodeError:
+        # 不完整的转义（例如 "\x"、"\u12"）保留原文
+        return inner
+
+
+def _split_inline(value: str) -> list:
+    """拆分行内列表 [a, "b, c", [d, e]] 的各项，引号和嵌套括号内的逗号不拆分。"""
+    items = []
+    depth = 0
+    quote = None
+    current = []
+    for char in value:
+        if quote:
+            current.append(char)
+            if char == quote:
+                quote = None
+        elif char in "\"'":
+            quote = char
+            current.append(char)
+        elif char == "[":
+            depth += 1
+            current.append(char)
+        elif char == "]":
+            depth -= 1
+            current.append(char)
+        elif char == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    last = "".join(current).strip()
+    if last or items:
+        items.append(last)
+    return items
+
+
+def _strip_comment(value: str) -> str:
+    """去掉行尾的 # 注释（引号中的 # 保留）。"""
+    if "#" not in value or value[0] in "\"'":
+        return value
+    pos = value.find(" #")
+    return value[:pos].rstrip() if pos != -1 else value
+
+
+def parse_scalar(value: str):
+    """把一个 YAML 标量转换成 Python 值。"""
+    value = _strip_comment(value.strip())
+    if value in _NULLS:
+        return None
+    first = value[0]
+    if first in "\"'" and len(value) >= 2 and value[-1] == first:
+        return _unquote(value)
+    if first == "[" and value[-1] == "]":
+        return [parse_scalar(item) for item in _split_inline(value[1:-1])]
+    if value in _BOOLS:
+        return _BOOLS[value]
+    if first.isdigit() or first in "-+.":
+        if _INT_PATTERN.fullmatch(value):
+            return int(value)
+        if _FLOAT_PATTERN.fullmatch(value):
+            return float(value)
+        if _DATE_PATTERN.fullmatch(value):
+            return _parse_date(value)
+    return value
+
+
+def _parse_date(value: str):
+    if len(value) <= 10:
+        year, month, day = map(int, value.split("-"))
+        try:
+            return date(year, month, day)
+        except ValueError:
+            # 不存在的日期（例如 2023-13-45）保留原文
+            return value
+    normalized = re.sub(r"\s+", " ", value.replace("t", "T")).replace(" Z", "Z").replace(" +", "+")
+    normalized = re.sub(r" (-\d{2})", r"\1", normalized)
+    try:
+        return datetime.fromisoformat(normalized.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+
+
+def _indent(line: str) -> int:
+    return len(line) - len(line.lstrip(" "))
+
+
+def parse_front_matter(text: str) -> dict:
+    """
+    解析 front-matter 文本：
+        key: value
+        key: [a, b]
+        key:
+          - item
+          - [a, b]
+        key: |
+          多行文本
+    """
+    lines = text.splitlines()
+    result = {}
+    current = None
+    i = 0
+    count = len(lines)
+    while i < count:
+        line = lines[i]
+        i += 1
+        stripped = line.strip()
+        if not stripped or stripped[0] == "#":
+            continue
+        if stripped == "-" or stripped.startswith("- "):
+            if current is not None:
+                if not isinstance(result[current], list):
+                    result[current] = []
+                result[current].append(parse_scalar(stripped[1:]))
+            continue
+        key, sep, value = stripped.partition(":")
+        if not sep or _indent(line):
+            # 不支持的嵌套映射，忽略
+            continue
+        key = key.strip()
+        if len(key) >= 2 and key[0] in "\"'":
+            key = _unquote(key)
+        value = value.strip()
+        if value and value[0] in "|>":
+            # 多行文本：收集后面所有缩进的行
+            block = []
+            while i < count and (not lines[i].strip() or _indent(lines[i]) > 0):
+                block.append(lines[i].strip())
+                i += 1
+            while block and not block[-1]:
+                block.pop()
+            result[key] = ("\n" if value[0] == "|" else " ").join(block)
+            current = None
+        elif value:
+            result[key] = parse_scalar(value)
+            current = None
+        else:
+            # 值在后面的列表项中；没有列表项时为 None
+            result[key] = None
+            current = key
+    return result
+
+
+def read_front_matter(path) -> dict:
+    """只读取并解析文件的 front-matter，没有时返回空字典。"""
+    with open(path, "rb") as f:
+        text, _ = read_header(f)
+    return parse_front_matter(text) if text is not None else {}
+
+
+def split_front_matter(data: bytes):
+    """
+    把整个文件的内容拆成三部分，用于只改写头部。
+    :return: (头部之前的字节, 头部文本, 头部之后的字节)；没有 front-matter 时返回 None
+    """
+    located = _locate_header(io.BytesIO(data), len(data) + 1, len(data) + 1)
+    if located is None:
+        return None
+    _, header_start, header_end, _ = located
+    return data[:header_start], data[header_start:header_end].decode("utf-8"), data[header_end:]
+
+
+def format_scalar(value) -> str:
+    """把 Python 值写成 YAML 标量，必要时加双引号，保证 parse_scalar 能读回原值。"""
+    if isinstance(value, list):
+        return "[" + ", ".join(format_scalar(item) for item in value) + "]"
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        return str(value).lower() if isinstance(value, bool) else str(value)
+    if (
+        not value
+        or value[0] in _SPECIAL_FIRST
+        or value != value.strip()
+        or any(special in value for special in _SPECIAL_CHARS)
+        or parse_scalar(value) != value
+    ):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def set_value(text: str, key: str, value) -> str:
+    """
+    修改 front-matter 文本中一个顶层键的值，其他行保持原样。
+    原来是行内写法（key: a 或 key: [a, b]）时仍然写在同一行，否则写成块列表；
+    键不存在时追加到末尾。
+    """
+    newline = "\r\n" if "\r\n" in text else "\n"
+    lines = text.splitlines()
+    start = None
+    for i, line in enumerate(lines):
+        name, sep, _ = line.partition(":")
+        if sep and not _indent(line) and name.strip().strip("\"'") == key:
+            start = i
+            break
+
+    item_indent = "  "
+    original = ""
+    if start is None:
+        start = end = len(lines)
+        inline = not isinstance(value, list)
+    else:
+        original = lines[start].partition(":")[2].strip()
+        inline = bool(original)
+        # 键的值包括后面缩进的行和 - 开头的列表项（列表项可以不缩进）
+        end = start + 1
+        while end < len(lines):
+            stripped = lines[end].strip()
+            if stripped and not _indent(lines[end]) and not stripped.startswith("-"):
+                break
+            end += 1
+        while end > start + 1 and not lines[end - 1].strip():
+            end -= 1
+        for line in lines[start + 1 : end]:
+            if line.strip().startswith("-"):
+                item_indent = line[: _indent(line)]
+                break
+
+    if inline or not isinstance(value, list) or not value:
+        if isinstance(value, list) and len(value) == 1 and not isinstance(value[0], list) and original[:1] != "[":
+            # 原来是 key: a 的写法，只剩一项时保持不变
+            value = value[0]
+        formatted = format_scalar(value)
+        replacement = [f"{key}: {formatted}" if formatted else f"{key}:"]
+    else:
+        replacement = [f"{key}:"] + [f"{item_indent}- {format_scalar(item)}" for item in value]
+    lines[start:end] = replacement
+    return newline.join(lines)
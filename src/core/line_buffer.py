@@ -0,0 +1,93 @@
+import os
+from collections import deque
+from pathlib import Path
+
+
+class LineRingBuffer:
+    """
+    固定容量的行环形缓冲，只保留最近的 capacity 行。
+    同时记录显示控件中的行数：超出 capacity + slack 时一次性裁掉多余的旧行，
+    这样控件不会每来一行就删除一行。
+    """
+
+    def __init__(self, capacity: int, slack: int | None = None):
+        self.capacity = capacity
+        self.slack = capacity // 10 if slack is None else slack
+        self.total_lines = 0
+        self._lines = deque(maxlen=capacity)
+        self._displayed = 0
+
+    def __len__(self):
+        return len(self._lines)
+
+    def lines(self) -> list:
+        return list(self._lines)
+
+    def append(self, lines: list):
+        """
+        追加一批行。
+        :return: (需要插入到控件的行, 插入前需要从控件顶部删除的行数, 是否需要先清空控件)
+        """
+        self.total_lines += len(lines)
+        self._lines.extend(lines)
+        if len(lines) >= self.capacity:
+            # 一批就超过容量：清空控件，只显示最后 capacity 行
+            self._displayed = self.capacity
+            return lines[-self.capacity :], 0, True
+
+        self._displayed += len(lines)
+        trim = 0
+        if self._displayed > self.capacity + self.slack:
+            trim = self._displayed - self.capacity
+            self._displayed = self.capacity
+        return lines, trim, False
+
+    def clear(self):
+        self._lines.clear()
+        self._displayed = 0
+
+
+class RotatingLineLog:
+    """按批追加写入的日志文件，超过 max_bytes 时轮转，最多保留 backup_count 个旧文件。"""
+
+    def __init__(self, path: Path, max_bytes: int = 5 * 1024 * 1024, backup_count: int = 3):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def write_lines(self, lines: list):
+        if not lines:
+            return
+        data = "\n".join(lines) + "\n"
+        f = self._open()
+        if f.tell() and f.tell() + len(data) > self.max_bytes:
+            self._rotate()
+            f = self._open()
+        f.write(data)
+
+    def _rotate(self):
+        self.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{i}")
+            if source.exists():
+                os.replace(source, self.path.with_name(f"{self.path.name}.{i + 1}"))
+        if self.backup_count > 0:
+            os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
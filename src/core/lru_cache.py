@@ -0,0 +1,51 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    按总权重限制大小的 LRU 缓存（最近使用的在末尾）。
+    :param max_weight: 总权重上限，超过时从最久未使用的一端淘汰
+    :param weigh: 计算一个值的权重，默认每项为 1（即按数量限制）
+    """
+
+    def __init__(self, max_weight: int, weigh=None):
+        self.max_weight = max_weight
+        self.weigh = weigh or (lambda value: 1)
+        self.weight = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        item = self._items.get(key)
+        if item is None:
+            return default
+        self._items.move_to_end(key)
+        return item[0]
+
+    def put(self, key, value):
+        """加入或替换一项；单项权重超过上限时不缓存。"""
+        self.pop(key)
+        weight = self.weigh(value)
+        if weight > self.max_weight:
+            return
+        self._items[key] = (value, weight)
+        self.weight += weight
+        while self.weight > self.max_weight:
+            _, (_, evicted) = self._items.popitem(last=False)
+            self.weight -= evicted
+
+    def pop(self, key, default=None):
+        item = self._items.pop(key, None)
+        if item is None:
+            return default
+        self.weight -= item[1]
+        return item[0]
+
+    def clear(self):
+        self._items.clear()
+        self.weight = 0
@@ -0,0 +1,65 @@
+from collections.abc import Mapping
+from types import MappingProxyType
+
+
+class OverlayDict(Mapping):
+    """
+    写时复制的两层字典：读取时先查修改层，没有再查基础层；写入只记录在修改层。
+    改回基础层中的值时从修改层删除，所以修改层中的键就是脏键，创建、提交和重置都只和脏键数量有关。
+    基础层由 OverlayDict 接管（不复制），对外只读。值本身也不复制，修改时应当整体替换（例如 list + [x]），
+    而不是原地修改。
+    """
+
+    def __init__(self, base: dict):
+        self._base = base
+        self._changes = {}
+
+    def __getitem__(self, key):
+        if key in self._changes:
+            return self._changes[key]
+        return self._base[key]
+
+    def __contains__(self, key):
+        return key in self._base or key in self._changes
+
+    def __iter__(self):
+        yield from self._base
+        for key in self._changes:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return len(self._base) + sum(1 for key in self._changes if key not in self._base)
+
+    @property
+    def base(self) -> Mapping:
+        return MappingProxyType(self._base)
+
+    @property
+    def changes(self) -> Mapping:
+        """脏键 -> 新值"""
+        return MappingProxyType(self._changes)
+
+    def is_changed(self, key) -> bool:
+        return key in self._changes
+
+    def set(self, key, value):
+        if key in self._base and self._base[key] == value:
+            self._changes.pop(key, None)
+        else:
+            self._changes[key] = value
+
+    def discard(self, key):
+        """丢弃 key 的修改。"""
+        self._changes.pop(key, None)
+
+    def commit(self) -> dict:
+        """把修改合并到基础层。:return: 合并的修改"""
+        changes, self._changes = self._changes, {}
+        self._base.update(changes)
+        return changes
+
+    def reset(self, base: dict):
+        """换成新的基础层，丢弃所有修改。"""
+        self._base = base
+        self._changes = {}
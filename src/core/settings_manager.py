@@ -1,16 +1,37 @@
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Any, Dict
 
+from settings import SETTINGS_SAVE_DELAY
+from src.utils.fs import FS
+
 logger = logging.getLogger(__name__)
 
 
 class SettingsManager:
-    def __init__(self, path: Path):
+    """
+    设置文件的读写，第一次读取之后设置保存在内存中，修改延迟写入（write-behind）：
+    修改只更新内存并安排一次写入，delay 秒内的多次修改合并成一次；
+    写入在后台线程中进行，先写同目录的临时文件并 fsync，再原子替换，写到一半崩溃也不会损坏设置文件。
+    退出前调用 flush 写入还没有保存的修改。可以在多个线程中同时使用。
+    :param delay: 第一次修改到写入之间等待的秒数
+    """
+
+    def __init__(self, path: Path, delay: float = SETTINGS_SAVE_DELAY):
         self.settings_path = path
+        self.delay = delay
+        self._settings = None
+        self._lock = threading.Lock()
+        # 保证同一时间只有一个线程在写文件
+        self._write_lock = threading.Lock()
+        self._timer = None
+        # 每次修改加一，写入后记录已经保存的版本
+        self._version = 0
+        self._saved_version = 0
 
-    def load_settings(self) -> Dict[str, Any]:
+    def _read(self) -> Dict[str, Any]:
         if self.settings_path is None or not self.settings_path.exists():
             return {}
         try:
@@ -24,18 +45,69 @@ class SettingsManager:
             logger.error(f"Error loading settings: {e}. Returning default config.", exc_info=True)
             return {}
 
+    def _cached(self) -> Dict[str, Any]:
+        """调用时必须持有 _lock。"""
+        if self._settings is None:
+            self._settings = self._read()
+        return self._settings
+
+    def load_settings(self) -> Dict[str, Any]:
+        """:return: 设置的副本，只在第一次调用时读取文件"""
+        with self._lock:
+            return dict(self._cached())
+
     def save_settings(self, settings: Dict[str, Any]):
-        if self.settings_path is None:
-            logger.error("Cannot save settings, path is not set.")
-            return
-        try:
-            self.settings_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.settings_path, "w", encoding="utf-8") as f:
-                json.dump(settings, f, indent=4, ensure_ascii=False)
-        except OSError:
-            logger.exception("Error saving settings to file.")
+        """用 settings 替换全部设置，延迟写入。"""
+        with self._lock:
+            self._settings = dict(settings)
+            self._schedule()
 
     def update_setting(self, key: str, value: Any) -> None:
-        current_settings = self.load_settings()
-        current_settings[key] = value
-        self.save_settings(current_settings)
+        """修改一项设置，延迟写入；值没有变化时不写入。"""
+        with self._lock:
+            settings = self._cached()
+            if key in settings and settings[key] == value:
+                return
+            settings[key] = value
+            self._schedule()
+
+    def _schedule(self):
+        """调用时必须持有 _lock。已经安排了写入时不再推迟，保证修改最多 delay 秒后落盘。"""
+        self._version += 1
+        if self._timer is None:
+            self._timer = threading.Timer(self.delay, self._write)
+            self._timer.name = "settings-writer"
+            self._timer.start()
+
+    def _write(self):
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                if self._version == self._saved_version:
+                    return
+                if self.settings_path is None:
+                    logger.error("Cannot save settings, path is not set.")
+                    return
+                version = self._version
+                content = json.dumps(self._settings, indent=4, ensure_ascii=False)
+            try:
+                FS.atomic_write_text(self.settings_path, content, fsync=True)
+            except OSError:
+                # 保持未保存的状态，下一次修改或者 flush 时重试
+                logger.exception("Error saving settings to file.")
+                return
+            with self._lock:
+                self._saved_version = version
+
+    def is_dirty(self) -> bool:
+        """是否有还没有写入文件的修改。"""
+        with self._lock:
+            return self._version != self._saved_version
+
+    def flush(self):
+        """取消等待中的延迟写入，在当前线程中立即写入还没有保存的修改。"""
+        with self._lock:
+            timer, self._timer = self._timer, None
+        if timer is not None:
+            timer.cancel()
+        self._write()
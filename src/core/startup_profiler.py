@@ -0,0 +1,176 @@
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from src.utils.fs import FS
+
+# 设置为非空（且不是 "0"）时启用启动分析，等同于 main.py --profile-startup
+PROFILE_STARTUP_ENV = "HEXO_HELPER_PROFILE_STARTUP"
+# 报告中列出的最慢模块数
+SLOWEST_MODULES = 30
+
+
+class _TimedLoader:
+    """包装一个模块的 loader，记录 create_module / exec_module 的耗时，执行前换回原来的 loader。"""
+
+    def __init__(self, loader, timer: "_ImportTimer"):
+        self.loader = loader
+        self.timer = timer
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+    def create_module(self, spec):
+        with self.timer.measure(spec.name):
+            return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        module.__loader__ = module.__spec__.loader = self.loader
+        with self.timer.measure(module.__name__):
+            self.loader.exec_module(module)
+
+
+class _ImportTimer:
+    """
+    放在 sys.meta_path 最前面的查找器：自己不查找模块，而是把其他查找器找到的 spec 的 loader 包装起来计时。
+    导入会嵌套（模块 A 执行时导入 B），所以分别记录包含子导入的累计耗时和扣除子导入的自身耗时。
+    """
+
+    def __init__(self):
+        # 模块名 -> [自身耗时 ns, 累计耗时 ns]
+        self.modules = {}
+        self._stack = []
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    @contextmanager
+    def measure(self, name: str):
+        # 栈中每一项记录子导入的总耗时
+        self._stack.append(0)
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter_ns() - started
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            record = self.modules.setdefault(name, [0, 0])
+            record[0] += elapsed - children
+            record[1] += elapsed
+
+
+class StartupProfiler:
+    """
+    启动分析：记录启动各阶段（可以嵌套）的高精度耗时和每个包的导入耗时，结束时写成 JSON 报告。
+    未启用时 phase 只是一个空的上下文管理器，几乎没有开销；finish 之后同样不再记录。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.phases = []
+        self._started = 0
+        self._depth = 0
+        self._import_timer = None
+
+    def start(self):
+        """开始记录，并在 sys.meta_path 中安装导入计时器。应该在导入应用模块之前调用。"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.phases = []
+        self._started = time.perf_counter_ns()
+        self._import_timer = _ImportTimer()
+        sys.meta_path.insert(0, self._import_timer)
+
+    def start_from_env(self) -> bool:
+        """环境变量 PROFILE_STARTUP_ENV 启用时开始记录。:return: 是否启用"""
+        if os.environ.get(PROFILE_STARTUP_ENV, "") not in ("", "0"):
+            self.start()
+        return self.enabled
+
+    @contextmanager
+    def phase(self, name: str):
+        """记录一个阶段的耗时，阶段中可以再嵌套阶段。"""
+        if not self.enabled:
+            yield
+            return
+        entry = {"name": name, "depth": self._depth, "start_ms": self._ms(time.perf_counter_ns() - self._started)}
+        self.phases.append(entry)
+        self._depth += 1
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            entry["duration_ms"] = self._ms(time.perf_counter_ns() - started)
+            self._depth -= 1
+
+    @staticmethod
+    def _ms(ns: int) -> float:
+        return round(ns / 1_000_000, 3)
+
+    def report(self) -> dict:
+        """
+        :return: {"total_ms", "phases": [{"name", "depth", "start_ms", "duration_ms"}],
+                  "imports": {"total_ms", "packages": [...], "slowest_modules": [...]}, ...}
+        """
+        modules = self._import_timer.modules if self._import_timer else {}
+        packages = {}
+        for name, (self_ns, _) in modules.items():
+            package = packages.setdefault(name.split(".", 1)[0], [0, 0])
+            package[0] += self_ns
+            package[1] += 1
+        slowest = sorted(modules.items(), key=lambda item: item[1][0], reverse=True)[:SLOWEST_MODULES]
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "total_ms": self._ms(time.perf_counter_ns() - self._started),
+            "phases": self.phases,
+            "imports": {
+                "modules": len(modules),
+                "total_ms": self._ms(sum(self_ns for self_ns, _ in modules.values())),
+                "packages": [
+                    {"name": name, "self_ms": self._ms(self_ns), "modules": count}
+                    for name, (self_ns, count) in sorted(packages.items(), key=lambda item: item[1][0], reverse=True)
+                ],
+                "slowest_modules": [
+                    {"name": name, "self_ms": self._ms(self_ns), "cumulative_ms": self._ms(cumulative_ns)}
+                    for name, (self_ns, cumulative_ns) in slowest
+                ],
+            },
+        }
+
+    def finish(self, report_path: str | Path | None = None) -> dict | None:
+        """
+        停止记录，移除导入计时器，并把报告写到 report_path（原子写入）。
+        :return: 报告；未启用时返回 None
+        """
+        if not self.enabled:
+            return None
+        report = self.report()
+        self.enabled = False
+        if self._import_timer in sys.meta_path:
+            sys.meta_path.remove(self._import_timer)
+        if report_path is not None:
+            FS.atomic_write_text(report_path, json.dumps(report, ensure_ascii=False, indent=2))
+        return report
+
+
+profiler = StartupProfiler()
@@ -0,0 +1,166 @@
+# 标签和分类的聚合索引，以及重命名/合并时对 front-matter 值的变换
+# Hexo 的分类是层级的：categories: [a, b] 表示 a > b；
+# 列表中有子列表时每一项是一条独立的分类路径，例如 [[a, b], c] 表示 a > b 和 c 两个分类。
+
+
+def category_paths(categories) -> list:
+    """把 front-matter 中的 categories 转换成分类路径列表 [(a, b), (c,)]。"""
+    if categories is None or categories == "":
+        return []
+    if not isinstance(categories, list):
+        return [(str(categories),)]
+    if any(isinstance(item, list) for item in categories):
+        paths = []
+        for item in categories:
+            path = tuple(str(name) for name in item) if isinstance(item, list) else (str(item),)
+            if path:
+                paths.append(path)
+        return paths
+    return [tuple(str(name) for name in categories)] if categories else []
+
+
+def categories_value(paths: list) -> list:
+    """category_paths 的逆变换：只有一条路径时写成 [a, b]，多条时写成 [[a, b], c]。"""
+    if len(paths) == 1:
+        return list(paths[0])
+    return [list(path) if len(path) > 1 else path[0] for path in paths]
+
+
+def _unique(items) -> list:
+    return list(dict.fromkeys(items))
+
+
+def rename_tag(tags: list, old: str, new: str) -> list:
+    """把标签 old 改名为 new；new 已经存在时相当于合并（去重，保留第一次出现的位置）。"""
+    return _unique(new if str(tag) == old else tag for tag in tags)
+
+
+def move_category(paths: list, old: tuple, new: tuple) -> list:
+    """
+    把以 old 开头的分类路径移动到 new 下（old 的子分类一起移动），new 已经存在时相当于合并。
+    new 为空时移动后得到的空路径会被丢弃（categories_value 不能处理空路径）。
+    """
+    size = len(old)
+    moved = (new + path[size:] if path[:size] == old else path for path in paths)
+    return _unique(path for path in moved if path)
+
+
+class CategoryNode:
+    """分类树的一个节点；posts 包含该分类及其所有子分类中的文章，计数为 O(1)。"""
+
+    def __init__(self, name: str, parent: "CategoryNode | None" = None):
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.posts = set()
+
+    @property
+    def count(self) -> int:
+        return len(self.posts)
+
+    @property
+    def path(self) -> tuple:
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return tuple(reversed(names))
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "count": self.count,
+            "children": [child.to_dict() for child in self.children.values()],
+        }
+
+
+class TaxonomyIndex:
+    """
+    标签 -> 文章、分类树 -> 文章的聚合索引。
+    每篇文章记录自己的标签和分类路径，增删一篇文章只需要修改它涉及的标签和分类节点。
+    """
+
+    def __init__(self):
+        self.tags = {}
+        self.categories = CategoryNode("")
+        # 文章 -> (标签, 分类路径)
+        self.posts = {}
+
+    def __len__(self):
+        return len(self.posts)
+
+    def add(self, post: str, tags=(), categories=None):
+        """加入或替换一篇文章；categories 为 front-matter 中的原始值。"""
+        if post in self.posts:
+            self.remove(post)
+        tags = tuple(_unique(str(tag) for tag in tags))
+        paths = tuple(_unique(category_paths(categories)))
+        self.posts[post] = (tags, paths)
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(post)
+        for path in paths:
+            node = self.categories
+            node.posts.add(post)
+            for name in path:
+                child = node.children.get(name)
+                if child is None:
+                    child = node.children[name] = CategoryNode(name, node)
+                child.posts.add(post)
+                node = child
+
+    def remove(self, post: str):
+        entry = self.posts.pop(post, None)
+        if entry is None:
+            return
+        tags, paths = entry
+        for tag in tags:
+            bucket = self.tags[tag]
+            bucket.discard(post)
+            if not bucket:
+                del self.tags[tag]
+        for path in paths:
+            self._remove_path(post, path)
+
+    def _remove_path(self, post: str, path: tuple):
+        node = self.categories
+        node.posts.discard(post)
+        nodes = []
+        for name in path:
+            node = node.children.get(name)
+            if node is None:
+                break
+            node.posts.discard(post)
+            nodes.append(node)
+        # 删除没有文章的分类节点
+        for node in reversed(nodes):
+            if not node.posts and not node.children:
+                del node.parent.children[node.name]
+
+    def tag_count(self, tag: str) -> int:
+        bucket = self.tags.get(tag)
+        return len(bucket) if bucket is not None else 0
+
+    def tag_counts(self) -> dict:
+        """{标签: 文章数}，按文章数从多到少排序。"""
+        return dict(sorted(((tag, len(posts)) for tag, posts in self.tags.items()), key=lambda item: -item[1]))
+
+    def posts_with_tag(self, tag: str) -> set:
+        return set(self.tags.get(tag, ()))
+
+    def category(self, path) -> CategoryNode | None:
+        node = self.categories
+        for name in path:
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def category_count(self, path) -> int:
+        node = self.category(path)
+        return node.count if node is not None else 0
+
+    def posts_in_category(self, path) -> set:
+        """该分类及其子分类中的所有文章。"""
+        node = self.category(path)
+        return set(node.posts) if node is not None else set()
@@ -0,0 +1,199 @@
+# 全文检索：中英文混合分词、倒排索引和 BM25 排序
+import heapq
+import math
+import re
+from collections import Counter
+from operator import add, itemgetter
+
+# 拉丁字母和数字按词切分；连续的汉字切成二元组（bigram），单个汉字保留为一元
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+|[㐀-䶿一-鿿豈-﫿]+")
+_CJK_START = "㐀"
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 各字段的词频权重
+TITLE_WEIGHT = 3
+TAG_WEIGHT = 2
+BODY_WEIGHT = 1
+
+
+def tokenize_text(text: str) -> list:
+    """把文本切分成检索词（已转为小写）。"""
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text.lower()):
+        if word[0] < _CJK_START or len(word) == 1:
+            tokens.append(word)
+        else:
+            # 相邻两个字拼接成二元组
+            tokens += map(add, word[:-1], word[1:])
+    return tokens
+
+
+def term_frequencies(title: str = "", body: str = "", tags=()) -> Counter:
+    """:return: 文档的 {词: 加权词频}，标题和标签按权重计入。"""
+    # 正文通常远长于标题和标签，用 Counter 在 C 层面计数
+    frequencies = Counter(tokenize_text(body))
+    for weight, text in ((TITLE_WEIGHT, title), (TAG_WEIGHT, " ".join(map(str, tags)))):
+        for token in tokenize_text(text):
+            frequencies[token] += weight
+    return frequencies
+
+
+class InvertedIndex:
+    """
+    内存中的倒排索引：词 -> {文档键: 加权词频}。
+    每个文档记录自己的词列表，删除或更新一个文档只需要修改它出现过的词。
+    """
+
+    def __init__(self):
+        self.postings = {}
+        # 文档键 -> (加权长度, 出现过的词)
+        self.docs = {}
+        self.total_length = 0
+        self._norms = None
+        # 汉字 -> 包含它的二元组（dict 当作有序集合），查询单个汉字时使用，随词表增删同步更新
+        self._vocabulary = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, key):
+        return key in self.docs
+
+    def add(self, key: str, title: str = "", body: str = "", tags=()):
+        """加入或替换一个文档。"""
+        self.add_terms(key, term_frequencies(title, body, tags))
+
+    def add_terms(self, key: str, frequencies: dict):
+        """用已经统计好的 {词: 加权词频}（term_frequencies 的结果）加入或替换一个文档。"""
+        if key in self.docs:
+            self.remove(key)
+        postings = self.postings
+        for term, frequency in frequencies.items():
+            bucket = postings.get(term)
+            if bucket is None:
+                postings[term] = {key: frequency}
+                self._add_vocabulary(term)
+            else:
+                bucket[key] = frequency
+        length = sum(frequencies.values())
+        self.docs[key] = (length, tuple(frequencies))
+        self.total_length += length
+        self._norms = None
+
+    def remove(self, key: str):
+        doc = self.docs.pop(key, None)
+        if doc is None:
+            return
+        length, terms = doc
+        for term in terms:
+            bucket = self.postings[term]
+            del bucket[key]
+            if not bucket:
+                del self.postings[term]
+                self._remove_vocabulary(term)
+        self.total_length -= length
+        self._norms = None
+
+    def _add_vocabulary(self, term: str):
+        """新出现的词是汉字二元组时，登记到它的两个字下。"""
+        if len(term) == 2 and term[0] >= _CJK_START:
+            for char in term:
+                self._vocabulary.setdefault(char, {})[term] = None
+
+    def _remove_vocabulary(self, term: str):
+        if len(term) == 2 and term[0] >= _CJK_START:
+            for char in set(term):
+                bigrams = self._vocabulary[char]
+                del bigrams[term]
+                if not bigrams:
+                    del self._vocabulary[char]
+
+    def _document_norms(self) -> dict:
+        """BM25 中只与文档长度有关的部分 k1 * (1 - b + b * dl / avgdl)，文档变化后才重新计算。"""
+        if self._norms is None:
+            average = self.total_length / len(self.docs) if self.docs else 1.0
+            k1, b = BM25_K1, BM25_B
+            self._norms = {key: k1 * (1 - b + b * length / average) for key, (length, _) in self.docs.items()}
+        return self._norms
+
+    def _expand(self, term: str) -> list:
+        """单个汉字同时匹配所有包含它的二元组。"""
+        if len(term) != 1 or term < _CJK_START:
+            return [term]
+        return [term, *self._vocabulary.get(term, ())]
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """:return: 按 BM25 得分从高到低排序的 [(文档键, 得分), ...]"""
+        terms = dict.fromkeys(expanded for term in tokenize_text(query) for expanded in self._expand(term))
+        if not terms or not self.docs:
+            return []
+        norms = self._document_norms()
+        count = len(self.docs)
+        factor = BM25_K1 + 1
+        scores = {}
+        for term in terms:
+            bucket = self.postings.get(term)
+            if not bucket:
+                continue
+            frequency = len(bucket)
+            idf = math.log(1 + (count - frequency + 0.5) / (frequency + 0.5))
+            for key, tf in bucket.items():
+                scores[key] = scores.get(key, 0.0) + idf * tf * factor / (tf + norms[key])
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+    def to_state(self) -> dict:
+        return {"postings": self.postings, "docs": self.docs, "total_length": self.total_length}
+
+    @classmethod
+    def from_state(cls, state: dict) -> "InvertedIndex":
+        index = cls()
+        index.postings = state["postings"]
+        index.docs = state["docs"]
+        index.total_length = state["total_length"]
+        for term in index.postings:
+            index._add_vocabulary(term)
+        return index
+
+
+def make_snippet(text: str, query: str, width: int = 120):
+    """
+    截取 text 中第一个命中检索词附近的一段文字。
+    :return: (片段, [(start, end), ...] 片段中命中的位置)
+    """
+    lowered = text.lower()
+    terms = sorted(set(tokenize_text(query)), key=len, reverse=True)
+    first = min((pos for pos in (lowered.find(term) for term in terms) if pos != -1), default=-1)
+    # 命中位置前保留三分之一的上下文
+    start = max(0, first - width // 3) if first != -1 else 0
+    end = min(len(text), start + width)
+    raw = text[start:end]
+
+    # 合并空白后重新计算命中位置
+    snippet = " ".join(raw.split())
+    lowered_snippet = snippet.lower()
+    highlights = []
+    for term in terms:
+        pos = lowered_snippet.find(term)
+        while pos != -1:
+            highlights.append((pos, pos + len(term)))
+            pos = lowered_snippet.find(term, pos + len(term))
+    highlights = _merge_ranges(highlights)
+    if start > 0:
+        snippet = "…" + snippet
+        highlights = [(s + 1, e + 1) for s, e in highlights]
+    if end < len(text):
+        snippet += "…"
+    return snippet, highlights
+
+
+def _merge_ranges(ranges: list) -> list:
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
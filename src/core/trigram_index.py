@@ -0,0 +1,175 @@
+# 快速打开：基于三元组（trigram）的子串和模糊匹配
+import heapq
+from itertools import islice
+from operator import itemgetter
+
+# 标题命中比路径命中更重要
+TITLE_WEIGHT = 2.0
+PATH_WEIGHT = 1.0
+# 模糊匹配时至少要有这个比例的三元组出现在文本中
+FUZZY_THRESHOLD = 0.5
+# 最多对这么多个候选验证和打分；候选更多时（例如一两个字母的查询）只取其中一部分，继续输入会缩小范围
+MAX_CANDIDATES = 200
+
+_WORD_SEPARATORS = frozenset(" /\\-_.:")
+# 汉字等没有分词符号的文字，每个字都算单词开头
+_CJK_START = "\u2e80"
+
+
+def trigrams(text: str) -> set:
+    """text（已转为小写）中所有连续的三个字符；不足三个字符时返回空集合。"""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def word_prefixes(text: str) -> set:
+    """text（已转为小写）中每个单词开头的一个和两个字符，用于不足三个字符的查询。"""
+    prefixes = set()
+    previous = " "
+    for i, char in enumerate(text):
+        if char not in _WORD_SEPARATORS and (previous in _WORD_SEPARATORS or char >= _CJK_START):
+            prefixes.add(char)
+            if i + 1 < len(text):
+                prefixes.add(text[i : i + 2])
+        previous = char
+    return prefixes
+
+
+def _substring_score(field: str, token: str) -> float:
+    """token 在 field 中出现时的得分：出现在开头或单词开头的更高，-1 表示没有出现。"""
+    pos = field.find(token)
+    if pos <= 0:
+        return 3.0 if pos == 0 else -1.0
+    # 优先找单词开头的位置，比如 "deploy" 在 "hexo-deploy.md" 中
+    while pos != -1:
+        if field[pos - 1] in _WORD_SEPARATORS:
+            return 2.0
+        pos = field.find(token, pos + 1)
+    return 1.0
+
+
+class TrigramIndex:
+    """
+    内存中的三元组索引，用于按标题和路径快速打开文章。
+    每个三元组对应包含它的文档集合；查询时先对查询词的三元组集合求交得到候选，
+    再在候选上验证子串并打分。没有任何文档包含全部三元组时退回模糊匹配（允许拼写错误）。
+    不足三个字符的查询词没有三元组，改用单词开头的一两个字符的索引，只匹配单词开头。
+    """
+
+    def __init__(self):
+        # 三元组 -> 文档键集合
+        self.postings = {}
+        # 单词开头的一两个字符 -> 文档键集合
+        self.prefixes = {}
+        # 文档键 -> (小写标题, 小写路径, 原始标题)
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, key: str, title: str, path: str = ""):
+        """加入或替换一个文档；path 默认为 key。"""
+        if key in self.entries:
+            self.remove(key)
+        lowered_title = title.lower()
+        lowered_path = (path or key).lower().replace("\\", "/")
+        self.entries[key] = (lowered_title, lowered_path, title)
+        for postings, grams in (
+            (self.postings, trigrams(lowered_title) | trigrams(lowered_path)),
+            (self.prefixes, word_prefixes(lowered_title) | word_prefixes(lowered_path)),
+        ):
+            for gram in grams:
+                bucket = postings.get(gram)
+                if bucket is None:
+                    postings[gram] = {key}
+                else:
+                    bucket.add(key)
+
+    def remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for postings, grams in (
+            (self.postings, trigrams(entry[0]) | trigrams(entry[1])),
+            (self.prefixes, word_prefixes(entry[0]) | word_prefixes(entry[1])),
+        ):
+            for gram in grams:
+                bucket = postings[gram]
+                bucket.discard(key)
+                if not bucket:
+                    del postings[gram]
+
+    def _candidates(self, tokens: list):
+        """:return: (候选文档键, 是否为模糊匹配)"""
+        grams = set()
+        for token in tokens:
+            grams |= trigrams(token)
+        short = [self.prefixes.get(token, ()) for token in tokens if len(token) < 3]
+        candidates, fuzzy = self._trigram_candidates(grams) if grams else (None, False)
+        if short:
+            short.sort(key=len)
+            if candidates is None:
+                candidates = set(short[0])
+            for bucket in short:
+                candidates.intersection_update(bucket)
+                if not candidates:
+                    break
+        return candidates, fuzzy
+
+    def _trigram_candidates(self, grams: set):
+        buckets = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+        if buckets[0]:
+            candidates = set(buckets[0])
+            for bucket in buckets[1:]:
+                candidates.intersection_update(bucket)
+                if not candidates:
+                    break
+            if candidates:
+                return candidates, False
+
+        # 模糊匹配：统计每个文档包含多少个查询的三元组
+        counts = {}
+        for bucket in buckets:
+            for key in bucket:
+                counts[key] = counts.get(key, 0) + 1
+        required = max(1, int(len(grams) * FUZZY_THRESHOLD + 0.999))
+        return {key for key, count in counts.items() if count >= required}, True
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """
+        :param query: 空格分隔的多个词都要匹配，不区分大小写
+        :return: 按得分从高到低排序的 [(文档键, 得分), ...]
+        """
+        tokens = query.lower().replace("\\", "/").split()
+        if not tokens:
+            return []
+        candidates, fuzzy = self._candidates(tokens)
+        if len(candidates) > MAX_CANDIDATES:
+            candidates = islice(candidates, MAX_CANDIDATES)
+
+        entries = self.entries
+        scores = []
+        for key in candidates:
+            title, path, _ = entries[key]
+            score = 0.0
+            for token in tokens:
+                # 先用 in 在 C 层面过滤，只有命中时才计算位置得分
+                if token in title:
+                    best = _substring_score(title, token) * TITLE_WEIGHT
+                elif token in path:
+                    best = _substring_score(path, token) * PATH_WEIGHT
+                elif fuzzy and len(token) >= 3:
+                    # 模糊匹配按三元组的重合比例计分，每个词都要达到阈值
+                    token_grams = trigrams(token)
+                    best = len(token_grams & (trigrams(title) | trigrams(path))) / len(token_grams)
+                    if best < FUZZY_THRESHOLD:
+                        break
+                else:
+                    break
+                score += best
+            else:
+                # 同样命中时，短的标题更可能是要找的文章
+                scores.append((key, score - len(title) * 0.001))
+        return heapq.nlargest(limit, scores, key=itemgetter(1))
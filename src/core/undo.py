@@ -0,0 +1,118 @@
+import sys
+from collections import deque
+
+# 比较公共前后缀时每次比较的块大小
+_DIFF_BLOCK = 4096
+
+
+class EditDelta:
+    """
+    一次编辑的紧凑记录：在 start 处把 old_text 替换成了 new_text。
+    撤销时只需把 [start, start + len(new_text)) 换回 old_text。
+    """
+
+    __slots__ = ("start", "old_text", "new_text")
+
+    def __init__(self, start: int, old_text: str, new_text: str):
+        self.start = start
+        self.old_text = old_text
+        self.new_text = new_text
+
+    @property
+    def size(self) -> int:
+        """记录本身占用的内存（字节）。"""
+        return sys.getsizeof(self.old_text) + sys.getsizeof(self.new_text)
+
+    def apply(self, content: str) -> str:
+        return content[: self.start] + self.new_text + content[self.start + len(self.old_text) :]
+
+    def revert(self, content: str) -> str:
+        return content[: self.start] + self.old_text + content[self.start + len(self.new_text) :]
+
+    def __repr__(self):
+        return f"<EditDelta: {self.start}, -{len(self.old_text)}, +{len(self.new_text)}>"
+
+
+def _common_prefix_length(a: str, b: str, limit: int) -> int:
+    """按块比较，找到第一个不同的块后再二分，整体是线性的。"""
+    pos = 0
+    while pos < limit:
+        end = min(pos + _DIFF_BLOCK, limit)
+        if a[pos:end] != b[pos:end]:
+            low, high = pos, end
+            while low < high:
+                mid = (low + high) // 2
+                if a[low : mid + 1] == b[low : mid + 1]:
+                    low = mid + 1
+                else:
+                    high = mid
+            return low
+        pos = end
+    return limit
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    length = 0
+    len_a, len_b = len(a), len(b)
+    while length < limit:
+        step = min(_DIFF_BLOCK, limit - length)
+        if a[len_a - length - step : len_a - length] != b[len_b - length - step : len_b - length]:
+            low, high = length, length + step
+            while low < high:
+                mid = (low + high) // 2
+                if a[len_a - mid - 1 : len_a - low] == b[len_b - mid - 1 : len_b - low]:
+                    low = mid + 1
+                else:
+                    high = mid
+            return low
+        length += step
+    return limit
+
+
+def diff_text(old: str, new: str) -> EditDelta:
+    """用公共前缀和公共后缀求出把 old 变成 new 的最小单段替换。"""
+    prefix = _common_prefix_length(old, new, min(len(old), len(new)))
+    suffix = _common_suffix_length(old, new, min(len(old), len(new)) - prefix)
+    return EditDelta(prefix, old[prefix : len(old) - suffix], new[prefix : len(new) - suffix])
+
+
+class UndoHistory:
+    """
+    多级撤销历史，使用环形缓冲保存编辑差量。
+    内存占用只和编辑的大小有关；超过上限时从最旧的记录开始淘汰。
+    """
+
+    def __init__(self, max_bytes: int, max_steps: int | None = None):
+        self.max_bytes = max_bytes
+        self._deltas = deque(maxlen=max_steps)
+        self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._deltas)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def push(self, delta: EditDelta):
+        if self._deltas.maxlen is not None and len(self._deltas) == self._deltas.maxlen:
+            self._total_bytes -= self._deltas[0].size
+        self._deltas.append(delta)
+        self._total_bytes += delta.size
+        # 至少保留最新的一条，保证刚做的修改总能撤销
+        while self._total_bytes > self.max_bytes and len(self._deltas) > 1:
+            self._total_bytes -= self._deltas.popleft().size
+
+    def peek(self) -> EditDelta | None:
+        return self._deltas[-1] if self._deltas else None
+
+    def pop(self) -> EditDelta | None:
+        if not self._deltas:
+            return None
+        delta = self._deltas.pop()
+        self._total_bytes -= delta.size
+        return delta
+
+    def clear(self):
+        self._deltas.clear()
+        self._total_bytes = 0
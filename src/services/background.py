@@ -0,0 +1,58 @@
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundTasks:
+    """
+    在线程池中执行耗时函数，并在 Tk 线程中回调结果。
+    Tk 控件只能在主线程中访问，所以结果不直接在工作线程里回调，
+    而是通过 scheduler.after 定时检查已完成的任务。
+    :param scheduler: 提供 after(ms, func) / after_cancel(id) 的对象，通常是 Tk 根窗口
+    """
+
+    def __init__(self, scheduler, max_workers: int = 2, interval_ms: int = 50):
+        self.scheduler = scheduler
+        self.interval_ms = interval_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="background")
+        self._pending = {}
+        self._after_id = None
+
+    def submit(self, func, *args, on_done=None, on_error=None, **kwargs) -> Future:
+        """
+        提交任务。
+        :param on_done: on_done(result)，在 Tk 线程中调用
+        :param on_error: on_error(exception)，在 Tk 线程中调用；未提供时只记录日志
+        """
+        future = self._executor.submit(func, *args, **kwargs)
+        self._pending[future] = (on_done, on_error)
+        if self._after_id is None:
+            self._after_id = self.scheduler.after(self.interval_ms, self._poll)
+        return future
+
+    def _poll(self):
+        self._after_id = None
+        for future in [future for future in self._pending if future.done()]:
+            on_done, on_error = self._pending.pop(future)
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                if on_error is not None:
+                    on_error(error)
+                else:
+                    logger.error("Background task failed.", exc_info=error)
+            elif on_done is not None:
+                on_done(future.result())
+        if self._pending:
+            self._after_id = self.scheduler.after(self.interval_ms, self._poll)
+
+    def shutdown(self):
+        if self._after_id is not None:
+            self.scheduler.after_cancel(self._after_id)
+            self._after_id = None
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,340 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from settings import APP_NAME, DEPLOY_MANIFEST_DIR
+from src.core.front_matter import parse_scalar
+from src.services.hashing import FileHasher
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+# hexo generate 的输出目录（相对项目根目录）
+PUBLIC_DIR = "public"
+HEXO_CONFIG_FILE = "_config.yml"
+_EMPTY_SHA1 = "0" * 40
+_FALLBACK_EMAIL = "hexo-helper@localhost"
+
+
+def build_manifest(public_dir: str | Path, hasher: FileHasher | None = None) -> dict:
+    """遍历 public/，返回 {相对路径: {"hash", "size"}}，相对路径统一使用 /。"""
+    root = os.path.abspath(public_dir)
+    files = {}
+    pending = [root]
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.is_file():
+                    files[entry.path] = entry.stat().st_size
+
+    digests = (hasher or FileHasher()).hash_files(list(files))
+    return {
+        os.path.relpath(path, root).replace(os.sep, "/"): {"hash": digests[path], "size": size}
+        for path, size in files.items()
+        if path in digests
+    }
+
+
+def diff_manifests(old: dict, new: dict):
+    """:return: (新增, 修改, 删除) 三个排序后的相对路径列表"""
+    added = sorted(path for path in new if path not in old)
+    changed = sorted(path for path, entry in new.items() if path in old and old[path]["hash"] != entry["hash"])
+    removed = sorted(path for path in old if path not in new)
+    return added, changed, removed
+
+
+class DeployTarget(ABC):
+    """
+    部署目标的基类。
+    子类实现 apply：只把新增/修改的文件写入目标，并删除已移除的文件。
+    """
+
+    #: 目标的唯一标识，用于区分上次部署的清单
+    key = ""
+
+    @abstractmethod
+    def apply(self, public_dir: str, upload: list, removed: list, message: str) -> int:
+        """
+        :param upload: 需要写入的相对路径（新增和修改）
+        :param removed: 需要删除的相对路径
+        :return: 写入的字节数
+        """
+
+    def __str__(self):
+        return self.key
+
+
+class LocalDirectoryTarget(DeployTarget):
+    """
+    部署到本地目录。
+    :param hard_link: 使用硬链接代替复制（跨设备时自动退回复制）
+    """
+
+    def __init__(self, path: str | Path, hard_link: bool = False):
+        self.path = Path(path).resolve()
+        self.hard_link = hard_link
+        self.key = f"dir:{self.path}"
+
+    def apply(self, public_dir: str, upload: list, removed: list, message: str) -> int:
+        written = 0
+        for relative in upload:
+            source = os.path.join(public_dir, relative)
+            destination = self.path / relative
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            if self.hard_link:
+                try:
+                    if destination.exists():
+                        destination.unlink()
+                    os.link(source, destination)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(source, destination)
+            written += os.path.getsize(source)
+
+        for relative in removed:
+            destination = self.path / relative
+            try:
+                destination.unlink()
+            except FileNotFoundError:
+                continue
+            # 删除因此变空的目录
+            parent = destination.parent
+            while parent != self.path:
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+                parent = parent.parent
+        return written
+
+
+class GitRepositoryTarget(DeployTarget):
+    """
+    部署到本地裸 git 仓库的一个分支。
+    使用 git 底层命令在临时索引上修改上一次提交的树：只为变化的文件创建 blob，
+    不需要检出工作区，也不会重新写入没有变化的文件。
+    """
+
+    def __init__(self, repo: str | Path, branch: str = "master", git: str = "git"):
+        self.repo = Path(repo).resolve()
+        self.branch = branch
+        self.git = git
+        self.key = f"git:{self.repo}#{branch}"
+
+    @staticmethod
+    def is_bare_repository(path: str | Path) -> bool:
+        path = Path(path)
+        return (path / "HEAD").is_file() and (path / "objects").is_dir() and (path / "refs").is_dir()
+
+    def _run(self, *args, env=None, input_text=None) -> str:
+        result = subprocess.run(
+            [self.git, f"--git-dir={self.repo}", *args],
+            input=input_text,
+            env=env,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def _head(self) -> str | None:
+        try:
+            return self._run("rev-parse", "--verify", "--quiet", f"refs/heads/{self.branch}^{{commit}}")
+        except RuntimeError:
+            return None
+
+    def _identity_env(self) -> dict:
+        """没有配置提交者时，以应用的名义提交。"""
+        env = dict(os.environ)
+        try:
+            self._run("config", "user.name")
+            self._run("config", "user.email")
+        except RuntimeError:
+            for role in ("AUTHOR", "COMMITTER"):
+                env.setdefault(f"GIT_{role}_NAME", APP_NAME)
+                env.setdefault(f"GIT_{role}_EMAIL", _FALLBACK_EMAIL)
+        return env
+
+    def apply(self, public_dir: str, upload: list, removed: list, message: str) -> int:
+        parent = self._head()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            env = dict(os.environ, GIT_INDEX_FILE=os.path.join(temp_dir, "index"))
+            if parent:
+                self._run("read-tree", parent, env=env)
+            else:
+                self._run("read-tree", "--empty", env=env)
+
+            written = 0
+            lines = []
+            if upload:
+                sources = [os.path.join(public_dir, relative) for relative in upload]
+                blobs = self._run("hash-object", "-w", "--stdin-paths", input_text="\n".join(sources) + "\n").split()
+                for relative, source, blob in zip(upload, sources, blobs):
+                    mode = "100755" if os.stat(source).st_mode & 0o111 else "100644"
+                    lines.append(f"{mode} {blob}\t{relative}")
+                    written += os.path.getsize(source)
+            # mode 为 0 表示从索引中删除
+            lines.extend(f"0 {_EMPTY_SHA1}\t{relative}" for relative in removed)
+            if lines:
+                self._run("update-index", "--index-info", env=env, input_text="\n".join(lines) + "\n")
+            tree = self._run("write-tree", env=env)
+
+        if parent and tree == self._run("rev-parse", f"{parent}^{{tree}}"):
+            return written
+        commit_args = ["commit-tree", tree, "-m", message]
+        if parent:
+            commit_args[2:2] = ["-p", parent]
+        commit = self._run(*commit_args, env=self._identity_env())
+        self._run("update-ref", f"refs/heads/{self.branch}", commit, parent or _EMPTY_SHA1)
+        return written
+
+
+def read_deploy_config(project_root: str | Path) -> dict:
+    """
+    读取 _config.yml 中顶层 deploy: 下的键值（只支持单个部署配置）。
+    """
+    config = {}
+    try:
+        with open(Path(project_root) / HEXO_CONFIG_FILE, encoding="utf-8") as f:
+            in_deploy = False
+            for line in f:
+                stripped = line.strip()
+                if not stripped or stripped.startswith("#"):
+                    continue
+                if not line[0].isspace():
+                    if in_deploy:
+                        break
+                    in_deploy = stripped.startswith("deploy:")
+                    continue
+                if in_deploy:
+                    if stripped.startswith("- "):
+                        if config:
+                            # 多个部署配置时只使用第一个
+                            break
+                        stripped = stripped[2:]
+                    key, sep, value = stripped.partition(":")
+                    if sep:
+                        config[key.strip()] = parse_scalar(value)
+    except OSError:
+        return {}
+    return config
+
+
+def target_from_path(path: str | Path, branch: str = "master") -> DeployTarget:
+    """本地裸仓库部署到 git 分支，其他路径当作目录。"""
+    if GitRepositoryTarget.is_bare_repository(path):
+        return GitRepositoryTarget(path, branch)
+    return LocalDirectoryTarget(path)
+
+
+def resolve_target(project_root: str | Path) -> DeployTarget | None:
+    """
+    根据 _config.yml 的 deploy 配置选择增量部署目标：
+        type: git, repo: 本地裸仓库路径（或 file:// 地址）
+        type: local, path: 本地目录
+    远程仓库等其他配置返回 None，仍然使用 hexo deploy。
+    """
+    config = read_deploy_config(project_root)
+    deploy_type = config.get("type")
+    if deploy_type == "git":
+        repo = str(config.get("repo") or "")
+        if repo.startswith("file://"):
+            repo = repo[len("file://") :]
+        repo_path = Path(project_root) / repo if repo else None
+        if repo_path is not None and GitRepositoryTarget.is_bare_repository(repo_path):
+            return GitRepositoryTarget(repo_path, str(config.get("branch") or "master"))
+    elif deploy_type == "local" and config.get("path"):
+        return LocalDirectoryTarget(Path(project_root) / str(config["path"]), bool(config.get("hard_link", False)))
+    return None
+
+
+class DeployResult:
+    def __init__(self, target: DeployTarget, added: list, changed: list, removed: list, unchanged: int):
+        self.target = target
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+        self.unchanged = unchanged
+        self.bytes_written = 0
+        self.elapsed = 0.0
+        self.hash_stats = None
+
+    def summary(self) -> dict:
+        return {
+            "target": str(self.target),
+            "added": len(self.added),
+            "changed": len(self.changed),
+            "removed": len(self.removed),
+            "unchanged": self.unchanged,
+            "bytes_written": self.bytes_written,
+            "elapsed": self.elapsed,
+            "hash": self.hash_stats.summary() if self.hash_stats is not None else None,
+        }
+
+
+class Deployer:
+    """
+    增量部署 public/。
+    每次部署都对 public/ 计算内容哈希清单，与该目标上一次成功部署的清单比较，
+    只上传新增和修改的文件、删除已移除的文件；部署成功后才保存新的清单。
+    """
+
+    def __init__(self, manifest_dir: str | Path = DEPLOY_MANIFEST_DIR, hasher: FileHasher | None = None):
+        self.manifest_dir = Path(manifest_dir)
+        self.hasher = hasher or FileHasher()
+
+    def _manifest_path(self, project_root: Path, target: DeployTarget) -> Path:
+        digest = hashlib.sha1(f"{project_root}\n{target.key}".encode("utf-8")).hexdigest()
+        return self.manifest_dir / f"{digest}.json"
+
+    def load_manifest(self, project_root: str | Path, target: DeployTarget) -> dict:
+        try:
+            with open(self._manifest_path(Path(project_root).resolve(), target), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def deploy(self, project_root: str | Path, target: DeployTarget, full: bool = False) -> DeployResult:
+        """
+        :param full: 忽略上一次的清单，重新上传所有文件（目标被外部修改过时使用）
+        """
+        started = time.perf_counter()
+        project_root = Path(project_root).resolve()
+        public_dir = project_root / PUBLIC_DIR
+        if not public_dir.is_dir():
+            raise FileNotFoundError(f"{public_dir} does not exist, run hexo generate first")
+
+        manifest = build_manifest(public_dir, self.hasher)
+        old_manifest = {} if full else self.load_manifest(project_root, target)
+        added, changed, removed = diff_manifests(old_manifest, manifest)
+        if full:
+            # 清单丢失时无法知道目标中有哪些多余的文件，只覆盖写入
+            removed = []
+        result = DeployResult(target, added, changed, removed, len(manifest) - len(added) - len(changed))
+        result.hash_stats = self.hasher.last_stats
+
+        if added or changed or removed:
+            message = f"Site updated: {time.strftime('%Y-%m-%d %H:%M:%S')}"
+            result.bytes_written = target.apply(str(public_dir), added + changed, removed, message)
+        FS.atomic_write_text(
+            self._manifest_path(project_root, target), json.dumps(manifest, ensure_ascii=False, sort_keys=True)
+        )
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Deployed {project_root} to {target}: {len(added)} added, {len(changed)} changed, "
+            f"{len(removed)} removed, {result.unchanged} unchanged in {result.elapsed:.2f} s."
+        )
+        return result
@@ -1,4 +1,4 @@
-from abc import abstractmethod
+from abc import ABC, abstractmethod
 
 
 class Factory:
@@ -12,3 +12,30 @@ class Factory:
         返回 MVC 三元组
         """
         pass
+
+    def dispose(self, instance_info: dict):
+        """模块停用时，在控制器和视图清理之后调用，销毁工厂额外创建的窗口等。"""
+        pass
+
+
+class ReusableFactory(Factory, ABC):
+    """
+    关闭时可以隐藏、之后再复用的模块的工厂，ModuleLifecycle.KEEP / POOL 要求工厂继承它。
+    """
+
+    @abstractmethod
+    def prepare(self, parent_view, model_data):
+        """
+        预加载时创建不显示的 MVC 三元组，之后通过 reuse 显示。
+        """
+
+    @abstractmethod
+    def hide(self, instance_info: dict):
+        """
+        隐藏模块以便之后复用，例如 withdraw 它的窗口。
+        :param instance_info: {"model", "view", "controller"}
+        """
+
+    @abstractmethod
+    def reuse(self, instance_info: dict, model_data):
+        """重新显示隐藏的模块，并用 model_data 重置模型。"""
@@ -0,0 +1,353 @@
+import ctypes
+import ctypes.util
+import logging
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+
+from src.core.mvc_template.event_bus import Producer
+
+logger = logging.getLogger(__name__)
+
+CHANGE_CREATED = "created"
+CHANGE_MODIFIED = "modified"
+CHANGE_DELETED = "deleted"
+
+# inotify 常量（linux/inotify.h）
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _skip(name: str) -> bool:
+    """隐藏文件和目录（.git、编辑器的临时文件等）不关心。"""
+    return name.startswith(".")
+
+
+def merge_change(pending: dict, path: str, kind: str):
+    """
+    把一次变化合并到 pending {路径: 变化类型} 中，同一路径只保留净效果：
+    创建后删除相当于没有变化，删除后再创建相当于修改，创建后修改仍然是创建。
+    """
+    previous = pending.get(path)
+    if previous is None:
+        pending[path] = kind
+    elif kind == CHANGE_DELETED:
+        if previous == CHANGE_CREATED:
+            del pending[path]
+        else:
+            pending[path] = CHANGE_DELETED
+    elif previous == CHANGE_DELETED:
+        pending[path] = CHANGE_MODIFIED
+    elif previous != CHANGE_CREATED:
+        pending[path] = CHANGE_MODIFIED
+
+
+class InotifyBackend:
+    """
+    Linux 上通过 ctypes 调用 inotify，为目录树中的每个目录添加监视。
+    没有 inotify 或者监视数量超过系统上限时，构造函数会抛出 OSError。
+    """
+
+    def __init__(self, root: str):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc_name = ctypes.util.find_library("c")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._libc.inotify_add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+
+        self.root = root
+        self.overflowed = False
+        self._watches = {}
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        try:
+            self._watch_tree(root, None)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: str, changes: list | None):
+        """监视 top 及其所有子目录；changes 不为 None 时把其中已有的文件记为新建（监视建立前就创建的文件）。"""
+        pending = [top]
+        while pending:
+            directory = pending.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if directory == top and top == self.root:
+                    raise OSError(errno, f"inotify_add_watch failed: {os.strerror(errno)}", directory)
+                # 目录已经被删除等情况，跳过
+                continue
+            self._watches[wd] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if _skip(entry.name):
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif changes is not None:
+                            changes.append((CHANGE_CREATED, entry.path))
+            except OSError:
+                continue
+
+    def read_changes(self, timeout: float) -> list:
+        """等待最多 timeout 秒，返回期间的变化 [(类型, 路径), ...]。"""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, _READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        changes = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & _IN_Q_OVERFLOW:
+                # 内核队列溢出，丢失了事件，只能让使用者整体重新扫描
+                self.overflowed = True
+                continue
+            if mask & _IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name or _skip(name):
+                continue
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    self._watch_tree(path, changes)
+                elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                    # 目录被移走：目录下的文件都不再存在
+                    changes.append((CHANGE_DELETED, path))
+            elif mask & (_IN_CREATE | _IN_MOVED_TO):
+                changes.append((CHANGE_CREATED, path))
+            elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+                changes.append((CHANGE_DELETED, path))
+            else:
+                changes.append((CHANGE_MODIFIED, path))
+        return changes
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+
+
+class PollingBackend:
+    """
+    没有 inotify 时的后备方案：每隔 interval 秒用 os.scandir 比较一次目录树的 (mtime_ns, size)。
+    """
+
+    def __init__(self, root: str, interval: float = 1.0):
+        self.root = root
+        self.interval = interval
+        self.overflowed = False
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> dict:
+        snapshot = {}
+        pending = [self.root]
+        while pending:
+            try:
+                entries = os.scandir(pending.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if _skip(entry.name):
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        else:
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return snapshot
+
+    def read_changes(self, timeout: float) -> list:
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next_scan = time.monotonic() + self.interval
+
+        snapshot = self._scan()
+        old = self._snapshot
+        self._snapshot = snapshot
+        changes = [(CHANGE_DELETED, path) for path in old if path not in snapshot]
+        for path, signature in snapshot.items():
+            previous = old.get(path)
+            if previous is None:
+                changes.append((CHANGE_CREATED, path))
+            elif previous != signature:
+                changes.append((CHANGE_MODIFIED, path))
+        return changes
+
+    def close(self):
+        self._snapshot.clear()
+
+
+def create_backend(root: str, poll_interval: float = 1.0):
+    """优先使用 inotify，不可用时退回轮询。"""
+    try:
+        return InotifyBackend(root)
+    except (OSError, AttributeError) as e:
+        logger.info(f"inotify unavailable for {root} ({e}), polling every {poll_interval} s.")
+        return PollingBackend(root, poll_interval)
+
+
+class FileWatcher(Producer):
+    """
+    监视一个目录树，把短时间内的大量变化（编辑器保存、git checkout）合并成去重后的批次，
+    再在 Tk 线程中通过 event_bus.bus 发布：
+        event_name(root=..., changes={路径: 变化类型}, overflow=False)
+    overflow 为 True 时表示丢失过事件，使用者应当整体重新扫描。
+    监视在后台线程中进行；批次放入队列，由 scheduler.after 定时取出后发布。
+    :param scheduler: 提供 after(ms, func) / after_cancel(id) 的对象，通常是 Tk 根窗口
+    :param debounce_ms: 最后一次变化后安静多久才发布
+    :param max_delay_ms: 持续变化时，第一次变化后最多等待多久就发布
+    """
+
+    def __init__(
+        self,
+        root: str,
+        scheduler,
+        event_name: str,
+        debounce_ms: int = 300,
+        max_delay_ms: int = 2000,
+        interval_ms: int = 100,
+        backend=None,
+    ):
+        super().__init__()
+        self.root = os.path.abspath(root)
+        self.scheduler = scheduler
+        self.event_name = event_name
+        self.debounce = debounce_ms / 1000
+        self.max_delay = max_delay_ms / 1000
+        self.interval_ms = interval_ms
+        self._backend = backend
+        self._batches = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+        self._after_id = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> "FileWatcher":
+        if self._thread is not None:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name=f"watcher:{self.root}", daemon=True)
+        self._thread.start()
+        self._after_id = self.scheduler.after(self.interval_ms, self._poll)
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        if self._after_id is not None:
+            self.scheduler.after_cancel(self._after_id)
+            self._after_id = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def _watch(self):
+        if self._backend is None:
+            # 建立监视需要遍历目录树，放在后台线程中
+            self._backend = create_backend(self.root)
+        pending = {}
+        first = last = None
+        overflow = False
+        while not self._stop.is_set():
+            if pending or overflow:
+                now = time.monotonic()
+                timeout = max(0.0, min(last + self.debounce, first + self.max_delay) - now)
+            else:
+                timeout = 0.5
+            try:
+                changes = self._backend.read_changes(min(timeout, 0.5))
+            except OSError:
+                logger.exception(f"Error watching {self.root}.")
+                break
+            now = time.monotonic()
+            if self._backend.overflowed:
+                self._backend.overflowed = False
+                overflow = True
+                first = first or now
+                last = now
+            if changes:
+                for kind, path in changes:
+                    merge_change(pending, path, kind)
+                first = first or now
+                last = now
+            if (pending or overflow) and (now - last >= self.debounce or now - first >= self.max_delay):
+                self._batches.put((pending, overflow))
+                pending = {}
+                overflow = False
+            if not pending and not overflow:
+                first = last = None
+
+    def _poll(self):
+        self._after_id = None
+        while True:
+            try:
+                changes, overflow = self._batches.get_nowait()
+            except queue.Empty:
+                break
+            logger.debug(f"{len(changes)} change(s) under {self.root}, overflow: {overflow}.")
+            self.send_event(self.event_name, root=self.root, changes=changes, overflow=overflow)
+        if self._thread is not None:
+            self._after_id = self.scheduler.after(self.interval_ms, self._poll)
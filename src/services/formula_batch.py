@@ -0,0 +1,123 @@
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from src.core.formula import KIND_FORMULA, renumber, tokenize
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+# Hexo 文章目录（相对项目根目录）
+POSTS_DIR = Path("source") / "_posts"
+POST_SUFFIXES = (".md", ".markdown")
+
+
+def find_posts(project_root: str | Path) -> list:
+    """递归查找项目中的所有文章，按路径排序。"""
+    posts = []
+    pending = [str(Path(project_root) / POSTS_DIR)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(POST_SUFFIXES):
+                    posts.append(entry.path)
+    return sorted(posts)
+
+
+def renumber_post(path: str, dry_run: bool = False) -> dict:
+    """
+    对单篇文章重新编号（在工作进程中运行）。
+    内容有变化且不是 dry_run 时原子写回文件。
+    """
+    started = time.perf_counter()
+    report = {
+        "path": path,
+        "formulas": 0,
+        "deleted_refs": 0,
+        "changed": False,
+        "written": False,
+        "seconds": 0.0,
+        "error": None,
+    }
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            content = f.read()
+        tokens = tokenize(content)
+        report["formulas"] = sum(1 for token in tokens if token.kind == KIND_FORMULA)
+        if report["formulas"]:
+            new_content, report["deleted_refs"] = renumber(content, tokens)
+            report["changed"] = new_content != content
+            if report["changed"] and not dry_run:
+                FS.atomic_write_text(path, new_content)
+                report["written"] = True
+    except (OSError, UnicodeDecodeError) as e:
+        report["error"] = str(e)
+    report["seconds"] = time.perf_counter() - started
+    return report
+
+
+class BatchResult:
+    """批量重新编号的结果汇总。"""
+
+    def __init__(self, reports: list, elapsed: float, dry_run: bool):
+        self.reports = reports
+        self.elapsed = elapsed
+        self.dry_run = dry_run
+
+    @property
+    def changed(self) -> list:
+        return [report for report in self.reports if report["changed"]]
+
+    @property
+    def failed(self) -> list:
+        return [report for report in self.reports if report["error"]]
+
+    @property
+    def deleted_refs(self) -> int:
+        return sum(report["deleted_refs"] for report in self.reports)
+
+    def summary(self) -> dict:
+        return {
+            "files": len(self.reports),
+            "changed": len(self.changed),
+            "failed": len(self.failed),
+            "deleted_refs": self.deleted_refs,
+            "elapsed": self.elapsed,
+            "dry_run": self.dry_run,
+        }
+
+
+def renumber_project(project_root: str | Path, dry_run: bool = False, max_workers: int | None = None) -> BatchResult:
+    """
+    对 Hexo 项目 source/_posts 下的所有文章重新编号。
+    文章分发到进程池中处理，每个文件独立原子写入。
+    :param dry_run: 只统计，不写入文件
+    :param max_workers: 进程数，默认为 CPU 核数；为 1 时在当前进程中处理
+    """
+    started = time.perf_counter()
+    posts = find_posts(project_root)
+    workers = min(max_workers or os.cpu_count() or 1, len(posts))
+    logger.info(f"Renumbering {len(posts)} post(s) in {project_root} with {max(workers, 1)} worker(s).")
+
+    if workers <= 1:
+        reports = [renumber_post(path, dry_run) for path in posts]
+    else:
+        chunksize = max(1, len(posts) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            reports = list(executor.map(renumber_post, posts, repeat(dry_run), chunksize=chunksize))
+
+    for report in reports:
+        if report["error"]:
+            logger.error(f"Renumbering failed for {report['path']}: {report['error']}")
+    result = BatchResult(reports, time.perf_counter() - started, dry_run)
+    logger.info(f"Renumbering finished: {result.summary()}")
+    return result
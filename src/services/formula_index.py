@@ -0,0 +1,109 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from settings import FORMULA_INDEX_DIR
+from src.core.formula import KIND_FORMULA, normalize_latex, tokenize
+from src.services.formula_batch import find_posts
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+
+class FormulaIndexStore:
+    """
+    按文章持久化的公式索引。
+    每篇文章保存一份 {规范化 LaTeX -> 编号} 和引用列表，以 (size, mtime_ns) 判断是否过期。
+    跨文章查询“某个公式在哪里被引用”时只重新解析发生过变化的文章。
+    """
+
+    def __init__(self, index_dir: Path = FORMULA_INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self._entries = {}
+
+    def _entry_path(self, path: str) -> Path:
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return self.index_dir / f"{digest}.json"
+
+    def _load_entry(self, path: str) -> dict | None:
+        entry = self._entries.get(path)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._entry_path(path), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        self._entries[path] = entry
+        return entry
+
+    def get(self, path: str | Path) -> dict | None:
+        """获取一篇文章的索引，文件有变化时重新解析。"""
+        path = str(Path(path).resolve())
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        entry = self._load_entry(path)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            return entry
+        return self.index_post(path, stat)
+
+    def index_post(self, path: str | Path, stat: os.stat_result | None = None) -> dict | None:
+        """解析一篇文章并保存它的索引。"""
+        path = str(Path(path).resolve())
+        try:
+            stat = stat or os.stat(path)
+            with open(path, encoding="utf-8", newline="") as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError):
+            logger.exception(f"Error indexing formulas of {path}.")
+            return None
+
+        formulas = []
+        references = []
+        for token in tokenize(content):
+            if token.kind == KIND_FORMULA:
+                formulas.append([token.key, token.info["id"], token.info["latex"]])
+            else:
+                references.append([token.key, token.info["ref_id"]])
+        entry = {
+            "path": path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "formulas": formulas,
+            "references": references,
+        }
+        self._entries[path] = entry
+        try:
+            FS.atomic_write_text(self._entry_path(path), json.dumps(entry, ensure_ascii=False))
+        except OSError:
+            logger.exception(f"Error saving formula index of {path}.")
+        return entry
+
+    def index_project(self, project_root: str | Path) -> list:
+        """确保项目中所有文章的索引都是最新的，返回所有索引。"""
+        entries = (self.get(path) for path in find_posts(project_root))
+        return [entry for entry in entries if entry is not None]
+
+    def find_definitions(self, project_root: str | Path, latex: str) -> list:
+        """查找定义了该公式的文章，返回 [{"path", "id", "number"}]（number 为文章内的顺序编号）。"""
+        key = normalize_latex(latex)
+        result = []
+        for entry in self.index_project(project_root):
+            for number, (formula_key, formula_id, _) in enumerate(entry["formulas"], start=1):
+                if formula_key == key:
+                    result.append({"path": entry["path"], "id": formula_id, "number": number})
+        return result
+
+    def find_references(self, project_root: str | Path, latex: str) -> list:
+        """查找引用了该公式的文章，返回 [{"path", "ref_id"}]。"""
+        key = normalize_latex(latex)
+        result = []
+        for entry in self.index_project(project_root):
+            for ref_key, ref_id in entry["references"]:
+                if ref_key == key:
+                    result.append({"path": entry["path"], "ref_id": ref_id})
+        return result
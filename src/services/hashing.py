@@ -0,0 +1,188 @@
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from settings import HASH_CACHE_DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# 超过这个大小的文件用 mmap 读取，避免把整个文件复制到 Python 的 bytes 中
+_MMAP_THRESHOLD = 1024 * 1024
+# 修改时间距今不到这么久的文件不写入缓存：同一时间精度内再次修改时 (size, mtime_ns) 可能不变
+_RACY_SECONDS = 2.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path TEXT NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    PRIMARY KEY (path, algorithm)
+)
+"""
+
+
+def hash_path(path: str, algorithm: str = "sha256") -> str:
+    """计算单个文件的摘要。hashlib 处理大块数据时会释放 GIL，因此可以在线程池中并行。"""
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= _MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        else:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _signature(stat: os.stat_result) -> tuple:
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+class HashStats:
+    """一次批量计算的统计信息。"""
+
+    def __init__(self):
+        self.files = 0
+        self.cached = 0
+        self.hashed = 0
+        self.failed = 0
+        self.bytes_hashed = 0
+        self.elapsed = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """实际读取的数据量（不含缓存命中）的吞吐量。"""
+        return self.bytes_hashed / 1024 / 1024 / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> dict:
+        return {
+            "files": self.files,
+            "cached": self.cached,
+            "hashed": self.hashed,
+            "failed": self.failed,
+            "bytes_hashed": self.bytes_hashed,
+            "elapsed": self.elapsed,
+            "files_per_second": self.files_per_second,
+            "mb_per_second": self.mb_per_second,
+        }
+
+
+class FileHasher:
+    """
+    在线程池中批量计算文件摘要。
+    结果持久化在 SQLite 中，以 (路径, size, mtime_ns, inode) 判断是否有效，没有变化的文件不会被重新读取。
+    数据库只在调用线程中访问，工作线程只负责读取文件和计算摘要。
+    :param db_path: 缓存数据库，None 表示不使用持久化缓存
+    """
+
+    def __init__(
+        self, db_path: str | Path | None = HASH_CACHE_DB_PATH, algorithm: str = "sha256", max_workers: int | None = None
+    ):
+        self.db_path = Path(db_path) if db_path is not None else None
+        self.algorithm = algorithm
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.last_stats = HashStats()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_SCHEMA)
+        return connection
+
+    def _load_cache(self, connection, paths: list) -> dict:
+        cache = {}
+        # SQLite 的参数数量有上限，分批查询
+        for i in range(0, len(paths), 500):
+            batch = paths[i : i + 500]
+            rows = connection.execute(
+                f"SELECT path, size, mtime_ns, inode, digest FROM hashes "
+                f"WHERE algorithm = ? AND path IN ({', '.join('?' * len(batch))})",
+                (self.algorithm, *batch),
+            )
+            for path, size, mtime_ns, inode, digest in rows:
+                cache[path] = ((size, mtime_ns, inode), digest)
+        return cache
+
+    def _hash_checked(self, path: str, signature: tuple):
+        """计算摘要，并确认计算期间文件没有被修改；被修改时返回的摘要不写入缓存。"""
+        digest = hash_path(path, self.algorithm)
+        stable = _signature(os.stat(path)) == signature and time.time() - signature[1] / 1e9 > _RACY_SECONDS
+        return digest, stable
+
+    def hash_files(self, paths) -> dict:
+        """
+        :return: {路径: 十六进制摘要}，无法读取的文件不在结果中；统计信息保存在 last_stats
+        """
+        started = time.perf_counter()
+        stats = HashStats()
+        paths = [os.path.abspath(path) for path in paths]
+        stats.files = len(paths)
+
+        connection = self._connect() if self.db_path is not None else None
+        try:
+            cache = self._load_cache(connection, paths) if connection is not None else {}
+            digests = {}
+            pending = []
+            for path in paths:
+                try:
+                    signature = _signature(os.stat(path))
+                except OSError:
+                    stats.failed += 1
+                    continue
+                cached = cache.get(path)
+                if cached is not None and cached[0] == signature:
+                    digests[path] = cached[1]
+                    stats.cached += 1
+                else:
+                    pending.append((path, signature))
+
+            rows = []
+            if pending:
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hash") as executor:
+                    futures = [
+                        (path, signature, executor.submit(self._hash_checked, path, signature))
+                        for path, signature in pending
+                    ]
+                    for path, signature, future in futures:
+                        try:
+                            digest, stable = future.result()
+                        except OSError:
+                            logger.warning(f"Cannot hash {path}.")
+                            stats.failed += 1
+                            continue
+                        digests[path] = digest
+                        stats.hashed += 1
+                        stats.bytes_hashed += signature[0]
+                        if stable:
+                            rows.append((path, self.algorithm, *signature, digest))
+
+            if connection is not None and rows:
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)", rows)
+        finally:
+            if connection is not None:
+                connection.close()
+
+        stats.elapsed = time.perf_counter() - started
+        self.last_stats = stats
+        logger.info(
+            f"Hashed {stats.files} file(s): {stats.cached} cached, {stats.hashed} read "
+            f"({stats.files_per_second:.0f} files/s, {stats.mb_per_second:.1f} MB/s)."
+        )
+        return digests
+
+    def hash_file(self, path: str | Path) -> str | None:
+        return self.hash_files([path]).get(os.path.abspath(path))
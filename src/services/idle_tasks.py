@@ -0,0 +1,60 @@
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class IdleTasks:
+    """
+    在 Tk 线程空闲时分片执行必须在 Tk 线程中进行的小任务，例如导入模块、预先创建控件。
+    每一片最多执行 budget_ms 毫秒，然后通过 after 让出事件循环，处理完界面事件后在下一次空闲时继续，
+    不会造成明显的卡顿。时间片只能在任务之间切换，所以每个任务本身应该足够小。
+    :param scheduler: 提供 after(ms, func) / after_idle(func) / after_cancel(id) 的对象，通常是 Tk 根窗口
+    """
+
+    def __init__(self, scheduler, budget_ms: int = 8, interval_ms: int = 15):
+        self.scheduler = scheduler
+        self.budget_ms = budget_ms
+        self.interval_ms = interval_ms
+        self._queue = deque()
+        self._after_id = None
+
+    def __len__(self):
+        return len(self._queue)
+
+    def submit(self, func, *args, on_error=None):
+        """
+        把任务加入队列末尾，按提交顺序执行。
+        :param on_error: on_error(exception)；未提供时只记录日志
+        """
+        self._queue.append((func, args, on_error))
+        if self._after_id is None:
+            self._after_id = self.scheduler.after_idle(self._run_slice)
+
+    def _run_slice(self):
+        self._after_id = None
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        while self._queue:
+            func, args, on_error = self._queue.popleft()
+            try:
+                func(*args)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(e)
+                else:
+                    logger.exception(f"Idle task {getattr(func, '__name__', func)} failed.")
+            if time.perf_counter() >= deadline:
+                break
+        if self._queue:
+            # 先让界面处理积压的事件，之后再等下一次空闲
+            self._after_id = self.scheduler.after(self.interval_ms, self._wait_idle)
+
+    def _wait_idle(self):
+        self._after_id = self.scheduler.after_idle(self._run_slice)
+
+    def shutdown(self):
+        if self._after_id is not None:
+            self.scheduler.after_cancel(self._after_id)
+            self._after_id = None
+        self._queue.clear()
@@ -0,0 +1,266 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from settings import IMAGE_CACHE_DB_PATH
+from src.services.hashing import FileHasher
+from src.services.project_index import SOURCE_DIR
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+# 超过这个宽度的图片缩小到这个宽度
+MAX_WIDTH = 2560
+JPEG_QUALITY = 82
+# 生成的响应式图片宽度，只生成比原图窄的
+RESPONSIVE_WIDTHS = (480, 960, 1600)
+# 重新压缩至少要节省这个比例才替换原图，避免反复有损压缩
+MIN_SAVING = 0.05
+
+# 响应式图片命名为 name@960w.jpg，扫描时跳过
+_VARIANT_PATTERN = re.compile(r"@\d+w$")
+_SAVE_FORMATS = {"JPEG", "PNG", "WEBP"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    digest TEXT NOT NULL,
+    options TEXT NOT NULL,
+    variants TEXT NOT NULL,
+    PRIMARY KEY (digest, options)
+)
+"""
+
+
+def variant_path(path: str, width: int) -> str:
+    stem, suffix = os.path.splitext(path)
+    return f"{stem}@{width}w{suffix}"
+
+
+def find_images(project_root: str | Path) -> list:
+    """递归查找 source/ 下的图片（不含生成的响应式图片），按路径排序。"""
+    images = []
+    pending = [os.path.join(project_root, SOURCE_DIR)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                else:
+                    stem, suffix = os.path.splitext(entry.name)
+                    if suffix.lower() in IMAGE_SUFFIXES and not _VARIANT_PATTERN.search(stem):
+                        images.append(entry.path)
+    return sorted(images)
+
+
+def _encode(image: Image.Image, image_format: str, quality: int) -> bytes:
+    output = io.BytesIO()
+    if image_format == "JPEG":
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(output, "JPEG", quality=quality, optimize=True, progressive=True)
+    elif image_format == "WEBP":
+        image.save(output, "WEBP", quality=quality, method=4)
+    else:
+        image.save(output, "PNG", optimize=True)
+    return output.getvalue()
+
+
+def _resize_to_width(image: Image.Image, width: int) -> Image.Image:
+    height = max(1, round(image.height * width / image.width))
+    # reducing_gap：缩小很多倍时先用整数倍 reduce 再 LANCZOS 重采样，结果几乎一样但快得多
+    return image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+
+
+def optimize_image(path: str, options: dict) -> dict:
+    """
+    优化一张图片（在工作进程中运行）：
+    过宽的图片缩小到 max_width，重新压缩后明显变小才原子替换原图，并生成较窄的响应式图片。
+    :return: 报告，其中 digest 为处理后原图内容的 sha256
+    """
+    started = time.perf_counter()
+    report = {
+        "path": path,
+        "bytes_before": 0,
+        "bytes_after": 0,
+        "resized": False,
+        "replaced": False,
+        "variants": [],
+        "variant_bytes": 0,
+        "digest": None,
+        "seconds": 0.0,
+        "error": None,
+    }
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        report["bytes_before"] = report["bytes_after"] = len(data)
+        with Image.open(io.BytesIO(data)) as source:
+            image_format = source.format
+            if image_format not in _SAVE_FORMATS or getattr(source, "is_animated", False):
+                # 动图和其他格式保持原样
+                report["digest"] = hashlib.sha256(data).hexdigest()
+                return report
+            # 重新编码会丢掉 EXIF，先按照 EXIF 方向旋转
+            image = ImageOps.exif_transpose(source)
+            image.load()
+
+        if image.width > options["max_width"]:
+            image = _resize_to_width(image, options["max_width"])
+            report["resized"] = True
+        encoded = _encode(image, image_format, options["quality"])
+        if report["resized"] or len(encoded) <= len(data) * (1 - MIN_SAVING):
+            FS.atomic_write_bytes(path, encoded)
+            data = encoded
+            report["replaced"] = True
+            report["bytes_after"] = len(encoded)
+        report["digest"] = hashlib.sha256(data).hexdigest()
+
+        # 从宽到窄生成，每张都从上一张缩小，而不是每次都从原图缩小
+        current = image
+        for width in sorted(options["widths"], reverse=True):
+            if width >= current.width:
+                continue
+            current = _resize_to_width(current, width)
+            variant = _encode(current, image_format, options["quality"])
+            FS.atomic_write_bytes(variant_path(path, width), variant)
+            report["variants"].append(width)
+            report["variant_bytes"] += len(variant)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        report["error"] = str(e)
+    finally:
+        report["seconds"] = time.perf_counter() - started
+    return report
+
+
+class ImageBatchResult:
+    """一次批量优化的结果汇总。"""
+
+    def __init__(self, reports: list, skipped: int, elapsed: float):
+        self.reports = reports
+        self.skipped = skipped
+        self.elapsed = elapsed
+
+    @property
+    def failed(self) -> list:
+        return [report for report in self.reports if report["error"]]
+
+    def summary(self) -> dict:
+        bytes_before = sum(report["bytes_before"] for report in self.reports)
+        bytes_after = sum(report["bytes_after"] for report in self.reports)
+        files = len(self.reports) + self.skipped
+        return {
+            "files": files,
+            "processed": len(self.reports),
+            "skipped": self.skipped,
+            "failed": len(self.failed),
+            "replaced": sum(1 for report in self.reports if report["replaced"]),
+            "variants": sum(len(report["variants"]) for report in self.reports),
+            "bytes_before": bytes_before,
+            "bytes_after": bytes_after,
+            "bytes_saved": bytes_before - bytes_after,
+            "elapsed": self.elapsed,
+            "files_per_second": files / self.elapsed if self.elapsed else 0.0,
+            "mb_per_second": bytes_before / 1024 / 1024 / self.elapsed if self.elapsed else 0.0,
+        }
+
+
+class ImageOptimizer:
+    """
+    批量优化项目 source/ 中的图片，在进程池中并行处理（Pillow 的编码大部分在持有 GIL 时进行）。
+    处理过的图片以内容摘要和参数记录在 SQLite 中：摘要没有变化、响应式图片也都存在时直接跳过。
+    处理后的原图摘要也会记录，所以被替换的图片下次同样会被跳过。
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path = IMAGE_CACHE_DB_PATH,
+        hasher: FileHasher | None = None,
+        max_workers: int | None = None,
+        max_width: int = MAX_WIDTH,
+        quality: int = JPEG_QUALITY,
+        widths: tuple = RESPONSIVE_WIDTHS,
+    ):
+        self.db_path = Path(db_path)
+        self.hasher = hasher or FileHasher()
+        self.max_workers = max_workers
+        self.options = {"max_width": max_width, "quality": quality, "widths": sorted(widths)}
+        # 参数变化后之前的记录不再有效
+        self.options_key = json.dumps(self.options, sort_keys=True)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_SCHEMA)
+        return connection
+
+    def _is_done(self, path: str, variants) -> bool:
+        return variants is not None and all(os.path.exists(variant_path(path, width)) for width in json.loads(variants))
+
+    def optimize_project(self, project_root: str | Path) -> ImageBatchResult:
+        started = time.perf_counter()
+        images = find_images(project_root)
+        digests = self.hasher.hash_files(images)
+
+        connection = self._connect()
+        try:
+            done = {}
+            unique = list(set(digests.values()))
+            for i in range(0, len(unique), 500):
+                batch = unique[i : i + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rows = connection.execute(
+                    f"SELECT digest, variants FROM images WHERE options = ? AND digest IN ({placeholders})",
+                    (self.options_key, *batch),
+                )
+                done.update(rows)
+            pending = [path for path in images if not self._is_done(path, done.get(digests.get(path)))]
+            skipped = len(images) - len(pending)
+
+            workers = min(self.max_workers or os.cpu_count() or 1, len(pending))
+            logger.info(f"Optimizing {len(pending)} image(s), {skipped} unchanged, with {max(workers, 1)} worker(s).")
+            if workers <= 1:
+                reports = [optimize_image(path, self.options) for path in pending]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    reports = list(executor.map(optimize_image, pending, repeat(self.options), chunksize=1))
+
+            rows = []
+            for report in reports:
+                if report["error"]:
+                    logger.error(f"Cannot optimize {report['path']}: {report['error']}")
+                    continue
+                variants = json.dumps(report["variants"])
+                rows.append((report["digest"], self.options_key, variants))
+                source_digest = digests.get(report["path"])
+                if source_digest and source_digest != report["digest"]:
+                    rows.append((source_digest, self.options_key, variants))
+            with connection:
+                connection.executemany("INSERT OR REPLACE INTO images VALUES (?, ?, ?)", rows)
+        finally:
+            connection.close()
+
+        result = ImageBatchResult(reports, skipped, time.perf_counter() - started)
+        summary = result.summary()
+        logger.info(
+            f"Optimized {summary['processed']} image(s): {summary['bytes_saved']} bytes saved, "
+            f"{summary['variants']} variant(s) in {summary['elapsed']:.2f} s."
+        )
+        return result
@@ -0,0 +1,198 @@
+import logging
+import os
+import queue
+import shutil
+import signal
+import subprocess
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+STREAM_STDOUT = "stdout"
+STREAM_STDERR = "stderr"
+
+# 取消时先温和地结束进程，超时后强制结束
+_CANCEL_GRACE_SECONDS = 3.0
+
+
+class Job:
+    """
+    一个在后台运行的外部命令。
+    stdout/stderr 由读取线程逐行放入线程安全的队列，调用方按批取出，任何方法都不会阻塞调用线程
+    （wait() 除外）。
+    """
+
+    def __init__(self, command: list, cwd: str | None = None, env: dict | None = None):
+        self.command = list(command)
+        self.cwd = cwd
+        self.env = env
+        self.returncode = None
+        self.cancelled = False
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._process = None
+        self._output = queue.Queue()
+        self._readers = []
+        self._finished = threading.Event()
+
+    @property
+    def duration(self) -> float | None:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def is_finished(self) -> bool:
+        return self._finished.is_set()
+
+    def start(self) -> "Job":
+        command = list(self.command)
+        # Windows 上 hexo 是 hexo.cmd，需要先解析出完整路径
+        command[0] = shutil.which(command[0]) or command[0]
+        kwargs = {}
+        if os.name == "nt":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # 独立的进程组，取消时可以连同子进程一起结束
+            kwargs["start_new_session"] = True
+
+        self.started_at = time.monotonic()
+        try:
+            self._process = subprocess.Popen(
+                command,
+                cwd=self.cwd,
+                env=self.env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                **kwargs,
+            )
+        except OSError as e:
+            logger.error(f"Cannot start command {self.command}: {e}")
+            self.error = str(e)
+            self.returncode = -1
+            self.finished_at = time.monotonic()
+            self._finished.set()
+            return self
+
+        for name, stream in ((STREAM_STDOUT, self._process.stdout), (STREAM_STDERR, self._process.stderr)):
+            reader = threading.Thread(target=self._read_stream, args=(name, stream), daemon=True)
+            reader.start()
+            self._readers.append(reader)
+        threading.Thread(target=self._wait_process, daemon=True).start()
+        return self
+
+    def _read_stream(self, name: str, stream):
+        with stream:
+            for line in stream:
+                self._output.put((name, line.rstrip("\r\n")))
+
+    def _wait_process(self):
+        self.returncode = self._process.wait()
+        # 确保进程退出前输出的内容都已经进入队列
+        for reader in self._readers:
+            reader.join()
+        self.finished_at = time.monotonic()
+        self._finished.set()
+
+    def drain(self, max_items: int | None = None) -> list:
+        """取出目前已产生的输出 [(stream, line), ...]，最多 max_items 条。"""
+        items = []
+        try:
+            while max_items is None or len(items) < max_items:
+                items.append(self._output.get_nowait())
+        except queue.Empty:
+            pass
+        return items
+
+    def has_output(self) -> bool:
+        return not self._output.empty()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def cancel(self):
+        """请求结束进程（及其子进程），不等待其退出。"""
+        if self._process is None or self.is_finished:
+            return
+        self.cancelled = True
+        threading.Thread(target=self._terminate, daemon=True).start()
+
+    def _terminate(self):
+        process = self._process
+        try:
+            if os.name == "nt":
+                subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)], capture_output=True)
+                return
+            os.killpg(process.pid, signal.SIGTERM)
+            if not self._finished.wait(_CANCEL_GRACE_SECONDS):
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, ProcessLookupError):
+            # 进程已经退出
+            pass
+
+
+class JobRunner:
+    """
+    在 Tk 主循环中调度后台命令。
+    每隔 interval_ms 通过 scheduler.after 把各个 Job 的输出成批交给回调，主循环永远不会阻塞在子进程上。
+    :param scheduler: 提供 after(ms, func) / after_cancel(id) 的对象，通常是 Tk 根窗口
+    """
+
+    def __init__(self, scheduler, interval_ms: int = 50, max_batch: int = 2000):
+        self.scheduler = scheduler
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+        self._jobs = {}
+        self._after_id = None
+
+    @property
+    def jobs(self) -> list:
+        return list(self._jobs)
+
+    def run(self, command: list, cwd: str | None = None, on_output=None, on_finished=None, env=None) -> Job:
+        """
+        启动一个命令。
+        :param on_output: on_output(job, [(stream, line), ...])，在 Tk 线程中按批调用
+        :param on_finished: on_finished(job)，所有输出交付后在 Tk 线程中调用一次
+        """
+        job = Job(command, cwd=cwd, env=env).start()
+        self._jobs[job] = (on_output, on_finished)
+        self._schedule()
+        return job
+
+    def cancel_all(self):
+        for job in self._jobs:
+            job.cancel()
+
+    def shutdown(self):
+        """取消所有命令并停止调度。"""
+        self.cancel_all()
+        if self._after_id is not None:
+            self.scheduler.after_cancel(self._after_id)
+            self._after_id = None
+        self._jobs.clear()
+
+    def _schedule(self):
+        if self._after_id is None and self._jobs:
+            self._after_id = self.scheduler.after(self.interval_ms, self._tick)
+
+    def _tick(self):
+        self._after_id = None
+        for job, (on_output, on_finished) in list(self._jobs.items()):
+            # 先判断是否结束，再取输出，避免漏掉结束前最后一批
+            finished = job.is_finished
+            lines = job.drain(self.max_batch)
+            if lines and on_output is not None:
+                on_output(job, lines)
+            if finished and not job.has_output():
+                del self._jobs[job]
+                if on_finished is not None:
+                    on_finished(job)
+        self._schedule()
@@ -0,0 +1,272 @@
+import io
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+from settings import PROJECT_INDEX_DB_PATH
+from src.core.front_matter import parse_front_matter, read_header
+
+logger = logging.getLogger(__name__)
+
+# 索引的目录（相对项目根目录）和文件类型
+SOURCE_DIR = "source"
+POST_SUFFIXES = (".md", ".markdown")
+
+# 字数统计：每个汉字算一个字，连续的字母数字算一个词
+_WORD_PATTERN = re.compile(r"[㐀-䶿一-鿿豈-﫿]|[A-Za-z0-9]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    project TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT,
+    date TEXT,
+    tags TEXT NOT NULL,
+    categories TEXT NOT NULL,
+    word_count INTEGER NOT NULL,
+    front_matter TEXT NOT NULL,
+    PRIMARY KEY (project, path)
+)
+"""
+
+_COLUMNS = ("path", "mtime_ns", "size", "title", "date", "tags", "categories", "word_count", "front_matter")
+_JSON_COLUMNS = ("tags", "categories", "front_matter")
+
+
+def _as_list(value) -> list:
+    if value is None or value == "":
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def read_post(path: str) -> dict:
+    """读取一篇文章的元数据：只解析头部，正文逐行流式读取用于统计字数。"""
+    with open(path, "rb") as f:
+        header, body_offset = read_header(f)
+        front_matter = parse_front_matter(header) if header is not None else {}
+        f.seek(body_offset)
+        word_count = 0
+        for line in io.TextIOWrapper(f, encoding="utf-8", errors="replace"):
+            word_count += len(_WORD_PATTERN.findall(line))
+
+    title = front_matter.get("title")
+    date = front_matter.get("date")
+    return {
+        "title": str(title) if title is not None else None,
+        "date": str(date) if date is not None else None,
+        "tags": _as_list(front_matter.get("tags")),
+        "categories": _as_list(front_matter.get("categories")),
+        "word_count": word_count,
+        "front_matter": front_matter,
+    }
+
+
+def _relative(project_root, path: str) -> str:
+    return os.path.relpath(path, project_root).replace(os.sep, "/")
+
+
+def scan_posts(project_root: str | Path, top: str | None = None) -> dict:
+    """
+    用 os.scandir 遍历 top（默认为 source/）下的文章。
+    :return: {相对项目根目录的路径: (绝对路径, mtime_ns, size)}
+    """
+    found = {}
+    pending = [top or os.path.join(project_root, SOURCE_DIR)]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif entry.name.lower().endswith(POST_SUFFIXES):
+                    stat = entry.stat()
+                    found[_relative(project_root, entry.path)] = (entry.path, stat.st_mtime_ns, stat.st_size)
+    return found
+
+
+def resolve_changes(project_root: str | Path, paths) -> tuple:
+    """
+    把文件监视报告的路径转换成增量同步需要的参数。
+    :return: (found, is_removed)：仍然存在的文章 {相对路径: (绝对路径, mtime_ns, size)}，
+             以及判断已索引的相对路径是否已被删除的函数（目录被删除时其下所有文章都算删除）
+    """
+    source = os.path.join(project_root, SOURCE_DIR)
+    found = {}
+    gone = []
+    for path in paths:
+        path = os.path.abspath(path)
+        if os.path.commonpath([path, source]) != source:
+            continue
+        if os.path.isdir(path):
+            found.update(scan_posts(project_root, path))
+        elif os.path.isfile(path):
+            if path.lower().endswith(POST_SUFFIXES):
+                stat = os.stat(path)
+                found[_relative(project_root, path)] = (path, stat.st_mtime_ns, stat.st_size)
+        else:
+            gone.append(_relative(project_root, path))
+    prefixes = tuple(relative + "/" for relative in gone)
+    gone = set(gone)
+    return found, lambda relative: relative in gone or relative.startswith(prefixes)
+
+
+class ProjectIndex:
+    """
+    Hexo 项目的文章元数据索引，保存在本地 SQLite 中。
+    以 (相对路径, mtime_ns, size) 判断文章是否变化，重新打开项目时只读取有变化的文件。
+    每个方法使用独立的数据库连接，可以在后台线程中调用。
+    """
+
+    def __init__(self, project_root: str | Path, db_path: str | Path = PROJECT_INDEX_DB_PATH):
+        self.project_root = Path(project_root).resolve()
+        self.project = str(self.project_root)
+        self.db_path = Path(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_SCHEMA)
+        return connection
+
+    def scan(self) -> dict:
+        """用 os.scandir 遍历 source/，返回 {相对路径: (绝对路径, mtime_ns, size)}。"""
+        return scan_posts(self.project_root)
+
+    def _sync(self, found: dict, is_removed) -> dict:
+        """
+        把 found 中有变化的文章写入索引，并删除 is_removed(相对路径) 为真的记录，全部在一个事务中完成。
+        :return: 统计信息，见 refresh
+        """
+        started = time.perf_counter()
+        with self._connect() as connection:
+            known = {
+                path: (mtime_ns, size)
+                for path, mtime_ns, size in connection.execute(
+                    "SELECT path, mtime_ns, size FROM posts WHERE project = ?", (self.project,)
+                )
+            }
+
+            added, updated, rows = [], [], []
+            for relative, (path, mtime_ns, size) in found.items():
+                if known.get(relative) == (mtime_ns, size):
+                    continue
+                try:
+                    post = read_post(path)
+                except (OSError, ValueError, UnicodeDecodeError):
+                    logger.exception(f"Error indexing post: {path}.")
+                    continue
+                (updated if relative in known else added).append(relative)
+                rows.append(
+                    (
+                        self.project,
+                        relative,
+                        mtime_ns,
+                        size,
+                        post["title"],
+                        post["date"],
+                        json.dumps(post["tags"], ensure_ascii=False),
+                        json.dumps(post["categories"], ensure_ascii=False),
+                        post["word_count"],
+                        json.dumps(post["front_matter"], ensure_ascii=False, default=str),
+                    )
+                )
+            removed = [relative for relative in known if relative not in found and is_removed(relative)]
+
+            connection.executemany(
+                f"INSERT OR REPLACE INTO posts (project, {', '.join(_COLUMNS)}) VALUES ({', '.join('?' * 10)})", rows
+            )
+            connection.executemany(
+                "DELETE FROM posts WHERE project = ? AND path = ?", [(self.project, path) for path in removed]
+            )
+        connection.close()
+
+        stats = {
+            "posts": len(known) + len(added) - len(removed),
+            "added": added,
+            "updated": updated,
+            "removed": removed,
+            "elapsed": time.perf_counter() - started,
+        }
+        logger.info(
+            f"Indexed {self.project}: {stats['posts']} post(s), {len(added)} added, {len(updated)} updated, "
+            f"{len(removed)} removed in {stats['elapsed']:.2f} s."
+        )
+        return stats
+
+    def refresh(self) -> dict:
+        """
+        同步索引与磁盘上的文章。
+        :return: 统计信息 {"posts", "added", "updated", "removed", "elapsed"}，
+                 其中 added/updated/removed 为相对路径列表
+        """
+        started = time.perf_counter()
+        stats = self._sync(self.scan(), lambda relative: True)
+        stats["elapsed"] = time.perf_counter() - started
+        return stats
+
+    def update(self, paths) -> dict:
+        """
+        只同步给定的文件或目录（例如文件监视报告的变化），不遍历整个 source/。
+        已经不存在的路径会删除对应的文章，目录被删除时删除其下所有文章。
+        :return: 统计信息，见 refresh
+        """
+        return self._sync(*resolve_changes(self.project_root, paths))
+
+    @staticmethod
+    def _row_to_post(row) -> dict:
+        post = dict(zip(_COLUMNS, row))
+        for column in _JSON_COLUMNS:
+            post[column] = json.loads(post[column])
+        return post
+
+    def posts(self) -> list:
+        """索引中的所有文章（不访问文章文件）。"""
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM posts WHERE project = ? ORDER BY path", (self.project,)
+            ).fetchall()
+        finally:
+            connection.close()
+        return [self._row_to_post(row) for row in rows]
+
+    def get(self, relative_path: str) -> dict | None:
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM posts WHERE project = ? AND path = ?",
+                (self.project, relative_path),
+            ).fetchone()
+        finally:
+            connection.close()
+        return self._row_to_post(row) if row is not None else None
+
+    def get_many(self, relative_paths) -> list:
+        """一次查询多篇文章，不存在的路径被忽略；用于根据同步统计信息更新其他索引。"""
+        relative_paths = list(relative_paths)
+        rows = []
+        connection = self._connect()
+        try:
+            # SQLite 的参数数量有上限，分批查询
+            for i in range(0, len(relative_paths), 500):
+                batch = relative_paths[i : i + 500]
+                placeholders = ", ".join("?" * len(batch))
+                rows += connection.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM posts WHERE project = ? AND path IN ({placeholders})",
+                    (self.project, *batch),
+                ).fetchall()
+        finally:
+            connection.close()
+        return [self._row_to_post(row) for row in rows]
@@ -0,0 +1,79 @@
+import logging
+import os
+import threading
+import time
+
+from src.core.trigram_index import TrigramIndex
+from src.services.project_index import SOURCE_DIR, ProjectIndex
+
+logger = logging.getLogger(__name__)
+
+# 文章所在的目录（相对 source/）
+POSTS_DIR = "_posts"
+
+
+class QuickOpenIndex:
+    """
+    快速打开框使用的标题和路径索引，数据来自 ProjectIndex（不读取文章文件）。
+    第一次同步时载入所有文章，之后只根据 ProjectIndex.refresh/update 返回的统计信息更新变化的文章。
+    同步可以在后台线程中进行，同时在 Tk 线程中查询。
+    """
+
+    def __init__(self, project_index: ProjectIndex):
+        self.project_index = project_index
+        self.index = TrigramIndex()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def __len__(self):
+        return len(self.index)
+
+    @staticmethod
+    def _display_path(relative: str) -> str:
+        """
+        参与匹配的路径：去掉共同的 source/_posts/ 或 source/ 前缀，
+        避免所有文章都匹配 "source"、"post" 这样的词，查询时候选过多。
+        """
+        for prefix in (f"{SOURCE_DIR}/{POSTS_DIR}/", f"{SOURCE_DIR}/"):
+            if relative.startswith(prefix):
+                return relative[len(prefix) :]
+        return relative
+
+    def _add(self, post: dict):
+        relative = post["path"]
+        title = post["title"] or os.path.splitext(os.path.basename(relative))[0]
+        self.index.add(relative, title, self._display_path(relative))
+
+    def refresh(self):
+        """重新载入所有文章。"""
+        started = time.perf_counter()
+        posts = self.project_index.posts()
+        index = TrigramIndex()
+        with self._lock:
+            self.index = index
+            for post in posts:
+                self._add(post)
+            self._loaded = True
+        logger.info(f"Quick open index of {len(posts)} post(s) built in {time.perf_counter() - started:.3f} s.")
+
+    def apply(self, stats: dict):
+        """
+        根据 ProjectIndex 的同步统计信息更新索引。
+        :param stats: ProjectIndex.refresh/update 的返回值
+        """
+        if not self._loaded:
+            self.refresh()
+            return
+        changed = self.project_index.get_many(stats["added"] + stats["updated"])
+        with self._lock:
+            for relative in stats["removed"]:
+                self.index.remove(relative)
+            for post in changed:
+                self._add(post)
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """:return: [{"path", "title", "score"}, ...]"""
+        with self._lock:
+            hits = self.index.search(query, limit)
+            entries = self.index.entries
+            return [{"path": relative, "title": entries[relative][2], "score": score} for relative, score in hits]
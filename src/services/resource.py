@@ -1,9 +1,12 @@
+import io
+import os
 from abc import abstractmethod
 from pathlib import Path
 
 from PIL import Image
 
-from settings import ASSETS_PATH
+from settings import ASSETS_PATH, ICON_CACHE_DIR
+from src.utils.fs import FS
 
 
 class ResourceLoader:
@@ -25,6 +28,18 @@ class AssetsResourceLoader(ResourceLoader):
 
 
 class IconResourceLoader(AssetsResourceLoader):
+    """
+    图标只在第一次使用时读取。
+    缩放后的图标以 PNG 保存在 cache_dir 中（文件名包含原图的 mtime 和大小，图标更新后自动失效），
+    之后的启动直接读取这些小文件，不再解码原图和重采样；同一进程中的结果保存在内存中。
+    """
+
+    def __init__(self, cache_dir: str | Path = ICON_CACHE_DIR):
+        super().__init__()
+        self.cache_dir = Path(cache_dir)
+        # (名称, 像素尺寸) -> 缓存文件路径 / PIL 图片
+        self._paths = {}
+        self._images = {}
 
     def load(self, name):
         icon_path = self.path / "icons" / name
@@ -34,5 +49,36 @@ class IconResourceLoader(AssetsResourceLoader):
             return icon
         # 图标找不到直接异常停止
 
+    @staticmethod
+    def pixel_size(size: int, scale: float = 1.0) -> int:
+        return max(1, round(size * scale))
+
+    def resized_path(self, name: str, size: int, scale: float = 1.0) -> Path:
+        """:return: 缩放到 size * scale 像素的图标 PNG，不存在时生成"""
+        key = (name, self.pixel_size(size, scale))
+        path = self._paths.get(key)
+        if path is not None:
+            return path
+        stat = os.stat(self.path / "icons" / name)
+        stem = os.path.splitext(name)[0]
+        path = self.cache_dir / f"{stem}-{key[1]}-{stat.st_mtime_ns:x}-{stat.st_size:x}.png"
+        if not path.exists():
+            icon = self.load(name).resize((key[1], key[1]), resample=Image.Resampling.LANCZOS)
+            output = io.BytesIO()
+            icon.save(output, "PNG")
+            FS.atomic_write_bytes(path, output.getvalue())
+        self._paths[key] = path
+        return path
+
+    def load_resized(self, name: str, size: int, scale: float = 1.0) -> Image.Image:
+        """缩放后的 PIL 图片，读取 resized_path 的缓存文件。"""
+        key = (name, self.pixel_size(size, scale))
+        image = self._images.get(key)
+        if image is None:
+            with Image.open(self.resized_path(name, size, scale)) as cached:
+                cached.load()
+                image = self._images[key] = cached
+        return image
+
 
 icon_loader = IconResourceLoader()
@@ -0,0 +1,199 @@
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from settings import SEARCH_INDEX_DIR
+from src.core.front_matter import parse_front_matter, read_header
+from src.core.text_search import InvertedIndex, make_snippet, term_frequencies
+from src.services.project_index import resolve_changes, scan_posts
+
+logger = logging.getLogger(__name__)
+
+# 数据库格式变化时递增，旧的表会被删除并重建
+_SCHEMA_VERSION = 2
+# 索引时保存的正文开头的字符数，检索结果的片段从中截取，不再读取文章
+EXCERPT_LENGTH = 500
+
+# 每篇文章一行，terms 为 {词: 加权词频} 的 JSON；同步时只改写变化的文章
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    excerpt TEXT NOT NULL,
+    terms TEXT NOT NULL
+)
+"""
+
+
+def read_post_text(path: str) -> tuple:
+    """:return: (front-matter, 正文)"""
+    with open(path, "rb") as f:
+        header, body_offset = read_header(f)
+        f.seek(body_offset)
+        body = io.TextIOWrapper(f, encoding="utf-8", errors="replace").read()
+    return (parse_front_matter(header) if header is not None else {}), body
+
+
+class PostSearchIndex:
+    """
+    一个 Hexo 项目所有文章的全文索引（标题、标签和正文）。
+    每篇文章的词频保存在本地 SQLite 中，重新打开项目时只重新读取 (mtime_ns, size) 变化的文章，
+    文件监视报告变化后也只改写变化的文章。
+    内存中的索引由锁保护：可以在后台线程中更新，同时在 Tk 线程中查询；分词和数据库读写不持有这个锁。
+    多个同步任务之间互相排队。
+    """
+
+    def __init__(self, project_root: str | Path, index_dir: str | Path = SEARCH_INDEX_DIR):
+        self.project_root = Path(project_root).resolve()
+        digest = hashlib.sha1(str(self.project_root).encode("utf-8")).hexdigest()
+        self.index_path = Path(index_dir) / f"{digest}.sqlite3"
+        self.index = InvertedIndex()
+        # 相对路径 -> (mtime_ns, size, 标题, 正文开头)
+        self.files = {}
+        self._lock = threading.RLock()
+        self._sync_lock = threading.Lock()
+        self._loaded = False
+
+    def __len__(self):
+        return len(self.index)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(self.index_path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        if connection.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+            connection.execute("DROP TABLE IF EXISTS documents")
+            connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        connection.execute(_SCHEMA)
+        return connection
+
+    def load(self) -> bool:
+        """读取持久化的索引，不存在或格式不对时返回 False。"""
+        if not self.index_path.exists():
+            return False
+        index, files = InvertedIndex(), {}
+        try:
+            connection = self._connect()
+            try:
+                for relative, mtime_ns, size, title, excerpt, terms in connection.execute(
+                    "SELECT path, mtime_ns, size, title, excerpt, terms FROM documents"
+                ):
+                    index.add_terms(relative, json.loads(terms))
+                    files[relative] = (mtime_ns, size, title, excerpt)
+            finally:
+                connection.close()
+        except (sqlite3.Error, ValueError):
+            logger.exception(f"Cannot load search index {self.index_path}.")
+            return False
+        with self._lock:
+            self.index = index
+            self.files = files
+            self._loaded = True
+        return True
+
+    def _write(self, rows: list, removed: list):
+        """在一个事务中写入变化的文章并删除已移除的文章。"""
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)", rows)
+                    connection.executemany("DELETE FROM documents WHERE path = ?", [(path,) for path in removed])
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            # 内存中的索引仍然有效，下次打开项目时重新读取这些文章
+            logger.exception(f"Cannot save search index {self.index_path}.")
+
+    def _index_post(self, relative: str, path: str, mtime_ns: int, size: int) -> tuple | None:
+        """:return: 写入数据库的一行，读取失败时返回 None"""
+        try:
+            front_matter, body = read_post_text(path)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Cannot index {path} for search: {e}")
+            return None
+        title = front_matter.get("title")
+        title = str(title) if title is not None else os.path.splitext(os.path.basename(path))[0]
+        tags = front_matter.get("tags") or []
+        tags = tags if isinstance(tags, list) else [tags]
+        frequencies = term_frequencies(title, body, tags)
+        excerpt = body[:EXCERPT_LENGTH]
+        with self._lock:
+            self.index.add_terms(relative, frequencies)
+            self.files[relative] = (mtime_ns, size, title, excerpt)
+        return relative, mtime_ns, size, title, excerpt, json.dumps(frequencies, ensure_ascii=False)
+
+    def _remove(self, relative: str):
+        with self._lock:
+            self.index.remove(relative)
+            self.files.pop(relative, None)
+
+    def _sync(self, found: dict, is_removed) -> dict:
+        with self._sync_lock:
+            return self._sync_locked(found, is_removed)
+
+    def _sync_locked(self, found: dict, is_removed) -> dict:
+        started = time.perf_counter()
+        added, updated, rows = [], [], []
+        for relative, (path, mtime_ns, size) in found.items():
+            known = self.files.get(relative)
+            if known is not None and known[:2] == (mtime_ns, size):
+                continue
+            row = self._index_post(relative, path, mtime_ns, size)
+            if row is not None:
+                rows.append(row)
+                (updated if known is not None else added).append(relative)
+        removed = [relative for relative in list(self.files) if relative not in found and is_removed(relative)]
+        for relative in removed:
+            self._remove(relative)
+        if rows or removed:
+            self._write(rows, removed)
+        stats = {
+            "posts": len(self.files),
+            "added": added,
+            "updated": updated,
+            "removed": removed,
+            "elapsed": time.perf_counter() - started,
+        }
+        logger.info(
+            f"Search index of {self.project_root}: {len(added)} added, {len(updated)} updated, "
+            f"{len(removed)} removed in {stats['elapsed']:.2f} s."
+        )
+        return stats
+
+    def refresh(self) -> dict:
+        """加载持久化的索引并与磁盘同步，返回与 ProjectIndex.refresh 相同格式的统计信息。"""
+        if not self._loaded:
+            self.load()
+            self._loaded = True
+        return self._sync(scan_posts(self.project_root), lambda relative: True)
+
+    def update(self, paths) -> dict:
+        """只同步给定的文件或目录（文件监视报告的变化）。"""
+        if not self._loaded:
+            return self.refresh()
+        return self._sync(*resolve_changes(self.project_root, paths))
+
+    def search(self, query: str, limit: int = 20, snippets: bool = True) -> list:
+        """
+        :return: [{"path", "title", "score", "snippet", "highlights"}, ...]，
+                 片段从索引时保存的正文开头截取，命中位置在开头之后时片段为正文开头
+        """
+        with self._lock:
+            hits = self.index.search(query, limit)
+            files = [self.files[relative] for relative, _ in hits]
+        results = []
+        for (relative, score), (_, _, title, excerpt) in zip(hits, files):
+            result = {"path": relative, "title": title, "score": score, "snippet": "", "highlights": []}
+            if snippets:
+                result["snippet"], result["highlights"] = make_snippet(excerpt, query)
+            results.append(result)
+        return results
@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from src.core.front_matter import parse_front_matter, set_value, split_front_matter
+from src.core.taxonomy import (
+    TaxonomyIndex,
+    categories_value,
+    category_paths,
+    move_category,
+    rename_tag,
+)
+from src.services.project_index import ProjectIndex, _as_list
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+
+def _rename_tag_value(value, old: str, new: str):
+    return rename_tag(_as_list(value), old, new)
+
+
+def _move_category_value(value, old: tuple, new: tuple):
+    return categories_value(move_category(category_paths(value), old, new))
+
+
+def rewrite_post(path: str, key: str, transform) -> dict:
+    """
+    只改写一篇文章 front-matter 中 key 的值（在工作线程中运行），正文和其他行保持不变，原子写回。
+    :param transform: 旧值 -> 新值
+    """
+    report = {"path": path, "changed": False, "error": None}
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        parts = split_front_matter(data)
+        if parts is None:
+            return report
+        prefix, header, suffix = parts
+        value = parse_front_matter(header).get(key)
+        new_value = transform(value)
+        if new_value != _as_list(value):
+            FS.atomic_write_bytes(path, prefix + set_value(header, key, new_value).encode("utf-8") + suffix)
+            report["changed"] = True
+    except (OSError, UnicodeDecodeError, ValueError, IndexError) as e:
+        report["error"] = str(e)
+    return report
+
+
+class ProjectTaxonomy:
+    """
+    一个项目的标签和分类聚合索引，数据来自 ProjectIndex（不读取文章文件）。
+    同步方式与 QuickOpenIndex 相同：第一次载入所有文章，之后只根据同步统计信息更新变化的文章。
+    重命名/合并只改写涉及的文章，在线程池中并行原子写入，之后通过 ProjectIndex.update 更新缓存。
+    """
+
+    def __init__(self, project_index: ProjectIndex, max_workers: int | None = None):
+        self.project_index = project_index
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self.index = TaxonomyIndex()
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @staticmethod
+    def _add(index: TaxonomyIndex, post: dict):
+        index.add(post["path"], post["tags"], post["front_matter"].get("categories"))
+
+    def refresh(self):
+        posts = self.project_index.posts()
+        index = TaxonomyIndex()
+        for post in posts:
+            self._add(index, post)
+        with self._lock:
+            self.index = index
+            self._loaded = True
+
+    def apply(self, stats: dict):
+        """根据 ProjectIndex.refresh/update 的统计信息更新索引。"""
+        if not self._loaded:
+            self.refresh()
+            return
+        changed = self.project_index.get_many(stats["added"] + stats["updated"])
+        with self._lock:
+            for relative in stats["removed"]:
+                self.index.remove(relative)
+            for post in changed:
+                self._add(self.index, post)
+
+    def tag_counts(self) -> dict:
+        with self._lock:
+            return self.index.tag_counts()
+
+    def category_tree(self) -> list:
+        """[{"name", "count", "children"}, ...]"""
+        with self._lock:
+            return self.index.categories.to_dict()["children"]
+
+    def _rewrite(self, posts: set, key: str, transform) -> dict:
+        started = time.perf_counter()
+        paths = [os.path.join(self.project_index.project_root, relative) for relative in sorted(posts)]
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="taxonomy") as executor:
+                reports = list(executor.map(partial(rewrite_post, key=key, transform=transform), paths))
+        else:
+            reports = [rewrite_post(path, key, transform) for path in paths]
+
+        written = [report["path"] for report in reports if report["changed"]]
+        failed = [report for report in reports if report["error"]]
+        for report in failed:
+            logger.error(f"Cannot rewrite {key} of {report['path']}: {report['error']}")
+        if written:
+            self.apply(self.project_index.update(written))
+        summary = {
+            "posts": len(paths),
+            "changed": len(written),
+            "failed": len(failed),
+            "elapsed": time.perf_counter() - started,
+        }
+        logger.info(f"Rewrote {key} of {summary['changed']}/{summary['posts']} post(s) in {summary['elapsed']:.2f} s.")
+        return summary
+
+    def rename_tag(self, old: str, new: str) -> dict:
+        """把标签 old 改名为 new，new 已经存在时合并。:return: {"posts", "changed", "failed", "elapsed"}"""
+        if not self._loaded:
+            self.refresh()
+        with self._lock:
+            posts = self.index.posts_with_tag(old)
+        return self._rewrite(posts, "tags", partial(_rename_tag_value, old=old, new=new))
+
+    def move_category(self, old, new) -> dict:
+        """
+        把分类 old（路径，例如 ("编程", "Python")）及其子分类移动到 new 下，new 已经存在时合并。
+        :return: 见 rename_tag
+        """
+        old, new = tuple(old), tuple(new)
+        if not self._loaded:
+            self.refresh()
+        with self._lock:
+            posts = self.index.posts_in_category(old)
+        return self._rewrite(posts, "categories", partial(_move_category_value, old=old, new=new))
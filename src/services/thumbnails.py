@@ -0,0 +1,163 @@
+import io
+import logging
+import os
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+from settings import THUMBNAIL_CACHE_DIR, THUMBNAIL_MEMORY_LIMIT
+from src.core.lru_cache import LRUCache
+from src.services.background import BackgroundTasks
+from src.services.hashing import FileHasher
+from src.utils.fs import FS
+
+logger = logging.getLogger(__name__)
+
+JPEG_QUALITY = 85
+
+
+def render_thumbnail(path: str | Path, size: int) -> Image.Image:
+    """
+    生成不超过 size x size 的缩略图。
+    JPEG 通过 draft 直接以 1/2、1/4、1/8 的分辨率解码，不需要解码出全分辨率的原图；
+    其他格式解码后用 reduce 先整数倍缩小再重采样。
+    """
+    with Image.open(path) as image:
+        image.draft("RGB", (size, size))
+        image.thumbnail((size, size), Image.Resampling.LANCZOS, reducing_gap=2.0)
+        # 缩小之后再按 EXIF 方向旋转，只需要处理小图
+        image = ImageOps.exif_transpose(image)
+    if image.mode not in ("RGB", "RGBA", "L", "LA"):
+        image = image.convert("RGBA" if "transparency" in image.info or "A" in image.mode else "RGB")
+    return image
+
+
+def _encode(image: Image.Image) -> bytes:
+    output = io.BytesIO()
+    if "A" in image.getbands():
+        image.save(output, "PNG")
+    else:
+        image.save(output, "JPEG", quality=JPEG_QUALITY)
+    return output.getvalue()
+
+
+class ThumbnailCache:
+    """
+    缩略图的磁盘缓存，以 (内容摘要, 尺寸) 为键：文件移动或复制后仍然命中，内容变化后自动失效。
+    摘要由 FileHasher 计算，文件没有变化时直接使用它的 (size, mtime_ns, inode) 缓存，不读取原图。
+    可以在多个线程中同时使用。
+    """
+
+    def __init__(self, cache_dir: str | Path = THUMBNAIL_CACHE_DIR, hasher: FileHasher | None = None):
+        self.cache_dir = Path(cache_dir)
+        self.hasher = hasher or FileHasher()
+
+    def cache_path(self, digest: str, size: int) -> Path:
+        return self.cache_dir / digest[:2] / f"{digest}-{size}.thumb"
+
+    def get(self, path: str | Path, size: int) -> Image.Image:
+        """:return: 已经 load 的缩略图；原图无法读取时抛出 OSError"""
+        digest = self.hasher.hash_file(path)
+        if digest is None:
+            raise FileNotFoundError(f"Cannot read {path}")
+        cache_path = self.cache_path(digest, size)
+        try:
+            with Image.open(cache_path) as cached:
+                cached.load()
+                return cached
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning(f"Broken thumbnail {cache_path}, regenerating.")
+
+        thumbnail = render_thumbnail(path, size)
+        FS.atomic_write_bytes(cache_path, _encode(thumbnail))
+        return thumbnail
+
+
+def _photo_weight(photo) -> int:
+    return photo.width() * photo.height() * 4
+
+
+class ThumbnailService:
+    """
+    工作区中预览图片使用的缩略图服务。
+    解码和磁盘缓存在后台线程中进行，PhotoImage 在 Tk 线程中创建，
+    并保存在按像素内存限制大小的 LRU 中；同一张图片同时的多次请求只加载一次。
+    :param scheduler: 提供 after(ms, func) / after_cancel(id) 的对象，通常是 Tk 根窗口
+    :param memory_limit: LRU 中 PhotoImage 的总像素字节数上限
+    :param photo_factory: 把 PIL 图片转换成 Tk 图片，默认为 ImageTk.PhotoImage
+    """
+
+    def __init__(
+        self,
+        scheduler,
+        cache: ThumbnailCache | None = None,
+        memory_limit: int = THUMBNAIL_MEMORY_LIMIT,
+        max_workers: int = 2,
+        photo_factory=None,
+    ):
+        if photo_factory is None:
+            from PIL import ImageTk
+
+            photo_factory = ImageTk.PhotoImage
+        self.cache = cache or ThumbnailCache()
+        self.photo_factory = photo_factory
+        self.photos = LRUCache(memory_limit, _photo_weight)
+        self.background = BackgroundTasks(scheduler, max_workers=max_workers)
+        # 正在加载的键 -> [(on_ready, on_error), ...]
+        self._pending = {}
+
+    @staticmethod
+    def _key(path: str, size: int):
+        """键包含 (mtime_ns, size)，文件被修改后不会再用到旧的 PhotoImage。"""
+        stat = os.stat(path)
+        return os.path.abspath(path), size, stat.st_mtime_ns, stat.st_size
+
+    def request(self, path: str | Path, size: int, on_ready, on_error=None):
+        """
+        请求一张缩略图，on_ready(photo) 总是在 Tk 线程中调用；内存中已有时立即调用。
+        :param on_error: on_error(exception)；未提供时只记录日志
+        """
+        try:
+            key = self._key(path, size)
+        except OSError as e:
+            self._fail(path, e, [(on_ready, on_error)])
+            return
+        photo = self.photos.get(key)
+        if photo is not None:
+            on_ready(photo)
+            return
+        callbacks = self._pending.get(key)
+        if callbacks is not None:
+            callbacks.append((on_ready, on_error))
+            return
+        self._pending[key] = [(on_ready, on_error)]
+        self.background.submit(
+            self.cache.get,
+            key[0],
+            size,
+            on_done=lambda image: self._on_loaded(key, image),
+            on_error=lambda error: self._fail(path, error, self._pending.pop(key, [])),
+        )
+
+    def _on_loaded(self, key, image: Image.Image):
+        photo = self.photo_factory(image)
+        self.photos.put(key, photo)
+        for on_ready, _ in self._pending.pop(key, []):
+            on_ready(photo)
+
+    @staticmethod
+    def _fail(path, error: Exception, callbacks: list):
+        logger.warning(f"Cannot load thumbnail of {path}: {error}")
+        for _, on_error in callbacks:
+            if on_error is not None:
+                on_error(error)
+
+    def clear(self):
+        self.photos.clear()
+
+    def shutdown(self):
+        self.background.shutdown()
+        self._pending.clear()
+        self.photos.clear()
@@ -0,0 +1,37 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+
+class FS:
+    @staticmethod
+    def atomic_write_bytes(path: str | Path, data: bytes, fsync: bool = False):
+        """
+        原子写入：先写到同目录的临时文件，再用 os.replace 替换目标文件。
+        写入过程中崩溃只会留下临时文件，目标文件要么是旧内容要么是新内容。
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if path.exists():
+                # mkstemp 创建的文件权限是 0600，保持原文件的权限
+                shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+    @staticmethod
+    def atomic_write_text(path: str | Path, content: str, encoding: str = "utf-8", fsync: bool = False):
+        """原子写入文本，不做换行符转换。"""
+        FS.atomic_write_bytes(path, content.encode(encoding), fsync=fsync)
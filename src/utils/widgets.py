@@ -0,0 +1,71 @@
+import logging
+import tkinter as tk
+from pathlib import Path
+from tkinter import scrolledtext
+
+from src.core.line_buffer import LineRingBuffer, RotatingLineLog
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedOutputText(scrolledtext.ScrolledText):
+    """
+    行数有上限的只读输出框。
+    - 内存中只保留最近 capacity 行，控件超出上限后按批裁掉最旧的行
+    - 完整输出写入可轮转的日志文件
+    - 用户向上翻看时不会被新输出拉回底部
+    输入为 [(tag, line), ...]，tag 同时作为 Text 的标签名。
+    """
+
+    def __init__(self, master, capacity: int, log_path: Path | None = None, **kwargs):
+        kwargs.setdefault("state", "disabled")
+        super().__init__(master, **kwargs)
+        self.buffer = LineRingBuffer(capacity)
+        self.log = RotatingLineLog(log_path) if log_path else None
+
+    def append(self, lines: list):
+        visible, trim, reset = self.buffer.append(lines)
+        if self.log is not None:
+            try:
+                self.log.write_lines([line for _, line in lines])
+            except OSError:
+                logger.exception("Error writing command output log.")
+                self.log = None
+
+        # 相邻且标签相同的行合并成一段，一次 insert 写入整批
+        segments = []
+        for tag, line in visible:
+            if segments and segments[-1][1] == tag:
+                segments[-1][0].append(line)
+            else:
+                segments.append(([line], tag))
+        args = []
+        for segment_lines, tag in segments:
+            args.extend(("\n".join(segment_lines) + "\n", tag))
+
+        follow = self.yview()[1] >= 1.0
+        self.config(state="normal")
+        if reset:
+            self.delete("1.0", tk.END)
+        elif trim:
+            self.delete("1.0", f"{trim + 1}.0")
+        if args:
+            self.insert(tk.END, *args)
+        self.config(state="disabled")
+        if follow:
+            self.see(tk.END)
+
+    def flush(self):
+        if self.log is not None:
+            self.log.flush()
+
+    def clear(self):
+        self.buffer.clear()
+        self.config(state="normal")
+        self.delete("1.0", tk.END)
+        self.config(state="disabled")
+
+    def destroy(self):
+        if self.log is not None:
+            self.log.close()
+        super().destroy()
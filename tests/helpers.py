@@ -0,0 +1,54 @@
+import os
+import time
+
+
+def write_post(path, content, mtime_ns=None):
+    """写入一篇文章（自动创建目录），可以指定修改时间。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class FakeScheduler:
+    """
+    替代 Tk 根窗口的调度器：记录 after / after_idle 调用，回调按安排的顺序由测试手动推进。
+    after 的延迟被忽略。
+    """
+
+    def __init__(self):
+        self.calls = []
+        self._callbacks = {}
+        self._next_id = 0
+
+    def _add(self, kind, func):
+        self._next_id += 1
+        self.calls.append(kind)
+        self._callbacks[self._next_id] = func
+        return self._next_id
+
+    def after(self, ms, func):
+        return self._add("after", func)
+
+    def after_idle(self, func):
+        return self._add("after_idle", func)
+
+    def after_cancel(self, after_id):
+        self._callbacks.pop(after_id, None)
+
+    def run_next(self):
+        """执行最早安排的一个回调。"""
+        after_id = min(self._callbacks)
+        self._callbacks.pop(after_id)()
+
+    def run_all(self):
+        """执行回调直到没有待执行的回调，包括执行过程中新安排的回调。"""
+        while self._callbacks:
+            self.run_next()
+
+    def run_until_idle(self, timeout=10.0):
+        """与 run_all 相同，但每个回调之后稍等片刻，让后台线程产生输出；最多运行 timeout 秒。"""
+        deadline = time.monotonic() + timeout
+        while self._callbacks and time.monotonic() < deadline:
+            self.run_next()
+            time.sleep(0.01)
@@ -0,0 +1,248 @@
+import sys
+
+import pytest
+
+from src.app.enum import ModuleLifecycle
+from src.app.module_manager import ModuleManager, import_string
+from src.services.factory import Factory, ReusableFactory
+from tests.helpers import FakeScheduler
+
+_FACTORY_SOURCE = """
+from src.services.factory import Factory
+
+
+class DummyFactory(Factory):
+    assembled = 0
+
+    def assemble(self, parent_view, model_data):
+        DummyFactory.assembled += 1
+        return dict(model_data), object(), None
+"""
+
+
+@pytest.fixture
+def lazy_package(tmp_path, monkeypatch):
+    """在临时目录中创建一个只有导入后才会出现在 sys.modules 中的工厂模块。"""
+    package = tmp_path / "lazy_modules"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "factory.py").write_text(_FACTORY_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_modules.factory"
+    for name in ("lazy_modules.factory", "lazy_modules"):
+        sys.modules.pop(name, None)
+
+
+class RecordingFactory(ReusableFactory):
+    """记录 assemble / hide / reuse / dispose 调用的工厂。"""
+
+    calls = []
+
+    def assemble(self, parent_view, model_data):
+        self.calls.append(("assemble", self.module_name))
+        return dict(model_data), object(), None
+
+    def hide(self, instance_info):
+        self.calls.append(("hide", self.module_name))
+
+    def prepare(self, parent_view, model_data):
+        self.calls.append(("prepare", self.module_name))
+        return dict(model_data), object(), None
+
+    def reuse(self, instance_info, model_data):
+        instance_info["model"].clear()
+        instance_info["model"].update(model_data)
+        self.calls.append(("reuse", self.module_name))
+
+    def dispose(self, instance_info):
+        self.calls.append(("dispose", self.module_name))
+
+
+@pytest.fixture
+def manager():
+    RecordingFactory.calls = []
+    manager = ModuleManager(object(), pool_size=2)
+    # 只保留测试注册的模块
+    manager._module_factories.clear()
+    return manager
+
+
+class TestModuleManager:
+    """ModuleManager 按导入路径延迟注册的测试套件。"""
+
+    def test_import_string(self):
+        assert import_string("src.app.module_manager.ModuleManager") is ModuleManager
+        assert import_string("src.app.module_manager:import_string") is import_string
+        with pytest.raises(ImportError):
+            import_string("src.app.module_manager.Missing")
+        with pytest.raises(ImportError):
+            import_string("ModuleManager")
+
+    def test_factory_imported_on_first_activate(self, manager, lazy_package):
+        manager.register("root.dummy", f"{lazy_package}.DummyFactory")
+        assert lazy_package not in sys.modules
+        assert not manager.is_loaded("root.dummy")
+
+        manager.activate("root.dummy", {"a": 1})
+        assert lazy_package in sys.modules
+        assert manager.is_loaded("root.dummy")
+        assert manager.get("root.dummy")["model"] == {"a": 1}
+
+        # 停用后再次激活复用同一个工厂
+        factory = manager._module_factories["root.dummy"]
+        manager.deactivate("root.dummy")
+        manager.activate("root.dummy", {})
+        assert manager._module_factories["root.dummy"] is factory
+        assert sys.modules[lazy_package].DummyFactory.assembled == 2
+
+    def test_bad_import_path_is_not_activated(self, manager):
+        manager.register("root.broken", "src.app.no_such_module.Factory")
+        assert manager.activate("root.broken", {}) is None
+        assert manager.get("root.broken") is None
+        assert not manager.is_loaded("root.broken")
+
+    def test_default_modules_are_not_imported_at_startup(self):
+        manager = ModuleManager(object())
+        assert not manager.is_loaded("root.main")
+        assert not manager.is_loaded("root.main.settings")
+
+
+class TestModuleLifecycle:
+    """模块关闭时销毁 / 隐藏复用 / 池化的测试套件。"""
+
+    def test_destroy(self, manager):
+        manager.register("root.dialog", RecordingFactory)
+        manager.activate("root.dialog", {})
+        manager.close("root.dialog")
+        assert manager.get("root.dialog") is None
+        manager.activate("root.dialog", {})
+        assert RecordingFactory.calls == [
+            ("assemble", "root.dialog"),
+            ("dispose", "root.dialog"),
+            ("assemble", "root.dialog"),
+        ]
+
+    def test_keep_hides_and_reuses_with_reset_model(self, manager):
+        manager.register("root.settings", RecordingFactory, ModuleLifecycle.KEEP)
+        manager.activate("root.settings", {"language": "en"})
+        model = manager.get("root.settings")["model"]
+        model["language"] = "zh-cn"
+
+        manager.close("root.settings")
+        assert manager.get("root.settings") is None
+        manager.activate("root.settings", {"language": "en"})
+
+        assert manager.get("root.settings")["model"] is model
+        assert model == {"language": "en"}
+        assert RecordingFactory.calls == [
+            ("assemble", "root.settings"),
+            ("hide", "root.settings"),
+            ("reuse", "root.settings"),
+        ]
+
+    def test_pool_evicts_least_recently_used(self, manager):
+        for name in ("root.a", "root.b", "root.c"):
+            manager.register(name, RecordingFactory, ModuleLifecycle.POOL)
+            manager.activate(name, {})
+        manager.register("root.kept", RecordingFactory, ModuleLifecycle.KEEP)
+        manager.activate("root.kept", {})
+
+        for name in ("root.kept", "root.a", "root.b", "root.c"):
+            manager.close(name)
+        # 池的上限为 2，KEEP 的模块不占用池
+        assert [call for call in RecordingFactory.calls if call[0] == "dispose"] == [("dispose", "root.a")]
+
+        # 复用 b 之后再隐藏，c 成为最久未使用的
+        manager.activate("root.b", {})
+        manager.activate("root.a", {})
+        manager.close("root.b")
+        manager.close("root.a")
+        assert RecordingFactory.calls[-1] == ("dispose", "root.c")
+
+    def test_factory_without_reuse_falls_back_to_destroy(self, manager, lazy_package):
+        class PlainFactory(Factory):
+            def assemble(self, parent_view, model_data):
+                return dict(model_data), object(), None
+
+        manager.register("root.plain", PlainFactory, ModuleLifecycle.POOL)
+        assert manager._lifecycles["root.plain"] is ModuleLifecycle.DESTROY
+
+        # 使用导入路径注册时在导入工厂之后检查
+        manager.register("root.lazy", f"{lazy_package}.DummyFactory", ModuleLifecycle.KEEP)
+        assert manager._lifecycles["root.lazy"] is ModuleLifecycle.KEEP
+        manager.activate("root.lazy", {})
+        manager.close("root.lazy")
+        assert manager._lifecycles["root.lazy"] is ModuleLifecycle.DESTROY
+        assert manager.get("root.lazy") is None
+        assert "root.lazy" not in manager._hidden
+
+    def test_deactivate_parent_disposes_hidden_children(self, manager):
+        manager.register("root.parent", RecordingFactory)
+        manager.register("root.parent.child", RecordingFactory, ModuleLifecycle.KEEP)
+        manager.activate("root.parent", {})
+        manager.activate("root.parent.child", {})
+        manager.close("root.parent.child")
+
+        manager.close("root.parent")
+        assert RecordingFactory.calls[-2:] == [("dispose", "root.parent.child"), ("dispose", "root.parent")]
+        # 再次打开时重新创建，而不是复用已经销毁的实例
+        manager.activate("root.parent", {})
+        manager.activate("root.parent.child", {})
+        assert RecordingFactory.calls[-1] == ("assemble", "root.parent.child")
+
+
+class TestModulePreload:
+    """空闲时预加载模块的测试套件。"""
+
+    @pytest.fixture
+    def scheduler(self):
+        return FakeScheduler()
+
+    @pytest.fixture
+    def manager(self, scheduler):
+        RecordingFactory.calls = []
+        manager = ModuleManager(scheduler)
+        manager._module_factories.clear()
+        return manager
+
+    def test_preload_imports_factory_when_idle(self, manager, scheduler, lazy_package):
+        manager.register("root.dummy", f"{lazy_package}.DummyFactory")
+        manager.preload("root.dummy", {})
+        assert lazy_package not in sys.modules
+
+        scheduler.run_all()
+        assert lazy_package in sys.modules
+        assert manager.is_loaded("root.dummy")
+        # DESTROY 的模块不能隐藏，只导入不创建
+        assert manager.get("root.dummy") is None
+
+    def test_preload_prepares_hidden_module(self, manager, scheduler):
+        manager.register("root.settings", RecordingFactory, ModuleLifecycle.KEEP)
+        data = {"language": "en"}
+        manager.preload("root.settings", lambda: dict(data))
+        data["language"] = "zh-cn"
+        scheduler.run_all()
+        assert RecordingFactory.calls == [("prepare", "root.settings")]
+        assert manager.get("root.settings") is None
+
+        manager.activate("root.settings", {"language": "zh-tw"})
+        assert RecordingFactory.calls[-1] == ("reuse", "root.settings")
+        assert manager.get("root.settings")["model"] == {"language": "zh-tw"}
+
+    def test_preload_skips_active_module_and_inactive_parent(self, manager, scheduler):
+        manager.register("root.settings", RecordingFactory, ModuleLifecycle.KEEP)
+        manager.register("root.parent", RecordingFactory)
+        manager.register("root.parent.child", RecordingFactory, ModuleLifecycle.POOL)
+        manager.preload("root.settings", {})
+        manager.preload("root.parent.child", {})
+        manager.activate("root.settings", {})
+
+        scheduler.run_all()
+        assert RecordingFactory.calls == [("assemble", "root.settings")]
+
+    def test_cleanup_cancels_pending_preload(self, manager, scheduler):
+        manager.register("root.settings", RecordingFactory, ModuleLifecycle.KEEP)
+        manager.preload("root.settings", {})
+        manager.cleanup_all()
+        scheduler.run_all()
+        assert RecordingFactory.calls == []
@@ -0,0 +1,53 @@
+from src.app.constants import (
+    EVENT_MAIN_SETTINGS_MODEL_APPLIED,
+    EVENT_MAIN_SETTINGS_MODEL_RESET,
+)
+from src.app.settings.model import SettingsModel
+from src.core.mvc_template.event_bus import bus
+
+
+class TestSettingsModel:
+    """设置模型的测试套件。"""
+
+    def test_reset_discards_unapplied_changes(self):
+        events = []
+        handler = lambda **kwargs: events.append(kwargs)  # noqa: E731
+        bus.register(EVENT_MAIN_SETTINGS_MODEL_RESET, handler)
+        try:
+            model = SettingsModel({"language": "en"})
+            model.set_value("language", "zh-cn")
+            assert model.is_dirty()
+
+            model.reset({"language": "zh-tw"})
+            assert not model.is_dirty()
+            assert model.get_value("language") == "zh-tw"
+            assert events == [{}]
+        finally:
+            bus.unregister(EVENT_MAIN_SETTINGS_MODEL_RESET, handler)
+
+    def test_reverting_a_field_cancels_dirty(self):
+        data = {"language": "en", "open_projects": ["/blog"]}
+        model = SettingsModel(data)
+        model.set_value("language", "zh-cn")
+        assert model.get_dirty_fields() == {"language"}
+        model.set_value("language", "en")
+        assert not model.is_dirty()
+        # 没有修改的值不会被复制
+        assert model.get_value("open_projects") is data["open_projects"]
+        assert model.to_dict() == data
+
+    def test_apply_sends_only_dirty_fields(self):
+        applied = []
+        handler = lambda settings: applied.append(settings)  # noqa: E731
+        bus.register(EVENT_MAIN_SETTINGS_MODEL_APPLIED, handler)
+        try:
+            model = SettingsModel({"language": "en", "app_name": "Hexo Helper"})
+            model.set_value("language", "zh-cn")
+            model.apply_changes()
+            assert applied == [{"language": "zh-cn"}]
+            assert not model.is_dirty()
+            # 应用后的值成为新的原始值
+            model.set_value("language", "en")
+            assert model.get_dirty_fields() == {"language"}
+        finally:
+            bus.unregister(EVENT_MAIN_SETTINGS_MODEL_APPLIED, handler)
@@ -0,0 +1,68 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from settings import ROOT_PATH
+
+
+@pytest.fixture
+def hexo_project(tmp_path):
+    posts_dir = tmp_path / "source" / "_posts"
+    posts_dir.mkdir(parents=True)
+    (posts_dir / "a.md").write_text('$$a\\tag{3}$$ <span class="formula-ref">(3)</span>', encoding="utf-8")
+    return tmp_path
+
+
+def _run_cli(*args):
+    """在独立进程中运行命令行入口，并报告是否导入了 tkinter / PIL。"""
+    code = (
+        "import sys, cli\n"
+        "code = cli.main(sys.argv[1:])\n"
+        "sys.stderr.write('GUI_MODULES=' + str(sorted({'tkinter', 'PIL'} & set(sys.modules))))\n"
+        "sys.exit(code)\n"
+    )
+    return subprocess.run(
+        [sys.executable, "-c", code, *map(str, args)], cwd=ROOT_PATH, capture_output=True, text=True, encoding="utf-8"
+    )
+
+
+class TestCli:
+    """命令行入口的测试套件。"""
+
+    def test_renumber_dry_run_json(self, hexo_project):
+        result = _run_cli("renumber", hexo_project, "--dry-run", "--workers", "1", "--json")
+
+        assert result.returncode == 0
+        assert "GUI_MODULES=[]" in result.stderr
+        report = json.loads(result.stdout)
+        assert report["summary"]["changed"] == 1
+        assert "\\tag{3}" in (hexo_project / "source" / "_posts" / "a.md").read_text(encoding="utf-8")
+
+    def test_generate_with_stub_command(self, hexo_project):
+        command = f'"{sys.executable}" -c "import os; print(os.getcwd())"'
+        result = _run_cli("generate", hexo_project, "--command", command)
+
+        assert result.returncode == 0
+        assert result.stdout.strip() == str(hexo_project)
+        assert "GUI_MODULES=[]" in result.stderr
+
+    def test_incremental_deploy_to_directory(self, hexo_project, tmp_path):
+        public = hexo_project / "public"
+        public.mkdir()
+        (public / "index.html").write_text("home", encoding="utf-8")
+        site = tmp_path / "site"
+
+        result = _run_cli("deploy", hexo_project, "--target", site, "--full", "--json")
+
+        assert result.returncode == 0
+        assert "GUI_MODULES=[]" in result.stderr
+        assert json.loads(result.stdout)["added"] == ["index.html"]
+        assert (site / "index.html").read_text(encoding="utf-8") == "home"
+
+    def test_taxonomy_rejects_empty_category_path(self, hexo_project):
+        result = _run_cli("taxonomy", hexo_project, "--move-category", "Tech", "/")
+
+        assert result.returncode == 2
+        assert "must not be empty" in result.stderr
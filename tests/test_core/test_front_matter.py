@@ -0,0 +1,137 @@
+import io
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.core.front_matter import (
+    format_scalar,
+    parse_front_matter,
+    parse_scalar,
+    read_front_matter,
+    read_header,
+    set_value,
+    split_front_matter,
+)
+
+
+class _CountingReader(io.BytesIO):
+    """记录读取了多少字节。"""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+class TestReadHeader:
+    """按块读取 front-matter 的测试套件。"""
+
+    def test_header_and_body_offset(self):
+        for data in (
+            b"---\ntitle: a\n---\nbody",
+            b"---\r\ntitle: a\r\n---\r\nbody",
+            b"\xef\xbb\xbf---\ntitle: a\n---\nbody",
+        ):
+            # 不论分块大小，分隔线跨块时结果都一样
+            for chunk_size in (1, 2, 3, 5, 4096):
+                text, offset = read_header(io.BytesIO(data), chunk_size)
+                assert text == "title: a"
+                assert data[offset:] == b"body"
+
+    def test_fence_must_be_whole_line(self):
+        text, offset = read_header(io.BytesIO(b"---\na: 1\n----\n---  \nbody"), 3)
+        assert text == "a: 1\n----"
+        assert offset == len(b"---\na: 1\n----\n---  \n")
+
+    def test_no_front_matter(self):
+        for data in (b"", b"title: a\n---\n", b"---\ntitle: a\n", b"----\na: 1\n---\n"):
+            assert read_header(io.BytesIO(data)) == (None, 0)
+
+    def test_body_is_not_read(self):
+        f = _CountingReader(b"---\ntitle: a\n---\n" + b"x" * 1_000_000)
+        read_header(f, chunk_size=1024)
+        assert f.bytes_read == 1024
+
+
+class TestParseFrontMatter:
+    """front-matter 解析的测试套件。"""
+
+    def test_scalars(self):
+        result = parse_front_matter(
+            'title: "He said \\"hi\\" 你好"\n'
+            "comments: false\n"
+            "count: 12\n"
+            "ratio: 1.5\n"
+            "top: null\n"
+            "url: http://example.com/a#b\n"
+            "note: hello # comment\n"
+            "quoted: 'it''s'\n"
+        )
+        assert result == {
+            "title": 'He said "hi" 你好',
+            "comments": False,
+            "count": 12,
+            "ratio": 1.5,
+            "top": None,
+            "url": "http://example.com/a#b",
+            "note": "hello",
+            "quoted": "it's",
+        }
+
+    def test_dates(self):
+        result = parse_front_matter("date: 2023-01-02 10:00:00\nupdated: 2023-01-02T10:00:00+08:00\nday: 2023-1-2\n")
+        assert result["date"] == datetime(2023, 1, 2, 10, 0)
+        assert result["updated"] == datetime(2023, 1, 2, 10, 0, tzinfo=timezone(timedelta(hours=8)))
+        assert result["day"] == date(2023, 1, 2)
+
+    def test_malformed_values_are_kept_as_text(self):
+        result = parse_front_matter('date: 2023-13-45\nupdated: 2023-02-30 10:00:00\na: "\\x"\nb: "\\u12"\n')
+        assert result == {"date": "2023-13-45", "updated": "2023-02-30 10:00:00", "a": "\\x", "b": "\\u12"}
+
+    def test_lists(self):
+        result = parse_front_matter(
+            'tags: [a, "b, c"]\ncategories:\n  - [Diary, Life]\n  - Tech\nempty:\nkeywords: []\n'
+        )
+        assert result == {
+            "tags": ["a", "b, c"],
+            "categories": [["Diary", "Life"], "Tech"],
+            "empty": None,
+            "keywords": [],
+        }
+
+    def test_block_text_and_nested_mapping(self):
+        result = parse_front_matter("description: |\n  line one\n  line two\n\nsummary: >\n  a\n  b\nnested:\n  a: b\n")
+        assert result == {"description": "line one\nline two", "summary": "a b", "nested": None}
+
+    def test_read_front_matter(self, tmp_path):
+        post = tmp_path / "a.md"
+        post.write_text("---\ntitle: Hello\ntags: [x]\n---\n# body\n", encoding="utf-8")
+        assert read_front_matter(post) == {"title": "Hello", "tags": ["x"]}
+
+
+class TestWriteFrontMatter:
+    """只改写 front-matter 中一个键的测试套件。"""
+
+    @pytest.mark.parametrize("value", ["plain", "true", "123", "2023-01-02", "a: b", "#tag", "- x", " padded", "中文"])
+    def test_format_scalar_round_trip(self, value):
+        assert parse_scalar(format_scalar(value)) == value
+
+    def test_split_front_matter_keeps_bytes(self):
+        data = b"\xef\xbb\xbf---\r\ntitle: a\r\n---\r\nbody"
+        prefix, header, suffix = split_front_matter(data)
+        assert header == "title: a"
+        assert prefix + header.encode() + suffix == data
+        assert split_front_matter(b"no front-matter") is None
+
+    def test_set_value_keeps_style(self):
+        text = "title: a\ntags:\n- x\n- y\n\ncategories: [a, b]\ndate: 2023-01-02"
+        assert set_value(text, "tags", ["z"]) == "title: a\ntags:\n- z\n\ncategories: [a, b]\ndate: 2023-01-02"
+        assert set_value(text, "categories", ["c: d"]) == (
+            'title: a\ntags:\n- x\n- y\n\ncategories: ["c: d"]\ndate: 2023-01-02'
+        )
+        assert set_value("tags: x\r\nb: 1", "tags", ["w"]) == "tags: w\r\nb: 1"
+        assert set_value("b: 1", "tags", ["w", "v"]) == "b: 1\ntags:\n  - w\n  - v"
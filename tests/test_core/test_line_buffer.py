@@ -0,0 +1,47 @@
+from src.core.line_buffer import LineRingBuffer, RotatingLineLog
+
+
+class TestLineRingBuffer:
+    """LineRingBuffer 的测试套件。"""
+
+    def test_trims_in_bulk(self):
+        buffer = LineRingBuffer(capacity=100, slack=10)
+
+        assert buffer.append(list(range(100))) == (list(range(100)), 0, True)
+        # 没有超过 capacity + slack 时不裁剪
+        assert buffer.append(list(range(10)))[1] == 0
+        # 超过后一次裁掉多余的行，回到 capacity
+        visible, trim, reset = buffer.append([1])
+        assert (visible, trim, reset) == ([1], 11, False)
+        assert len(buffer) == 100
+        assert buffer.total_lines == 111
+
+    def test_large_batch_resets_view(self):
+        buffer = LineRingBuffer(capacity=10)
+        visible, trim, reset = buffer.append(list(range(25)))
+
+        assert reset
+        assert visible == list(range(15, 25))
+        assert buffer.lines() == list(range(15, 25))
+
+    def test_memory_stays_flat(self):
+        buffer = LineRingBuffer(capacity=50)
+        for i in range(10000):
+            buffer.append([i])
+        assert len(buffer) == 50
+        assert buffer.lines()[-1] == 9999
+
+
+class TestRotatingLineLog:
+    """RotatingLineLog 的测试套件。"""
+
+    def test_rotation(self, tmp_path):
+        path = tmp_path / "output.log"
+        log = RotatingLineLog(path, max_bytes=100, backup_count=2)
+        for i in range(50):
+            log.write_lines([f"line {i:04d}"])
+        log.close()
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["output.log", "output.log.1", "output.log.2"]
+        assert path.read_text(encoding="utf-8").splitlines()[-1] == "line 0049"
+        assert all(p.stat().st_size <= 110 for p in tmp_path.iterdir())
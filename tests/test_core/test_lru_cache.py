@@ -0,0 +1,25 @@
+from src.core.lru_cache import LRUCache
+
+
+class TestLRUCache:
+    """按权重限制大小的 LRU 缓存的测试套件。"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(3)
+        for key in "abc":
+            cache.put(key, key.upper())
+        assert cache.get("a") == "A"
+        cache.put("d", "D")
+        assert "b" not in cache and len(cache) == 3
+
+    def test_weight_limit(self):
+        cache = LRUCache(10, weigh=len)
+        cache.put("a", "x" * 6)
+        cache.put("b", "x" * 4)
+        cache.put("a", "x" * 2)
+        assert cache.weight == 6
+        cache.put("c", "x" * 11)
+        assert "c" not in cache
+        cache.put("d", "x" * 8)
+        assert "b" not in cache and cache.weight == 10
+        assert cache.pop("d") == "x" * 8 and cache.weight == 2
@@ -0,0 +1,57 @@
+import pytest
+
+from src.core.overlay import OverlayDict
+
+
+class TestOverlayDict:
+    """写时复制字典的测试套件。"""
+
+    def test_reads_fall_through_to_base(self):
+        base = {"language": "en", "open_projects": ["/blog"]}
+        overlay = OverlayDict(base)
+        overlay.set("language", "zh-cn")
+
+        assert overlay["language"] == "zh-cn"
+        assert overlay["open_projects"] is base["open_projects"]
+        assert base["language"] == "en"
+        assert dict(overlay) == {"language": "zh-cn", "open_projects": ["/blog"]}
+        with pytest.raises(KeyError):
+            overlay["missing"]
+
+    def test_only_changed_keys_are_stored(self):
+        overlay = OverlayDict({"language": "en", "app_name": "Hexo Helper"})
+        overlay.set("language", "zh-cn")
+        assert dict(overlay.changes) == {"language": "zh-cn"}
+        assert overlay.is_changed("language")
+
+        # 改回原值即不再是脏键
+        overlay.set("language", "en")
+        assert dict(overlay.changes) == {}
+        assert not overlay.is_changed("language")
+
+    def test_new_keys(self):
+        overlay = OverlayDict({"language": "en"})
+        overlay.set("recent_files", ["a.md"])
+        assert len(overlay) == 2
+        assert list(overlay) == ["language", "recent_files"]
+        assert "recent_files" in overlay
+        overlay.discard("recent_files")
+        assert "recent_files" not in overlay
+
+    def test_commit_merges_changes_into_base(self):
+        base = {"language": "en", "app_name": "Hexo Helper"}
+        overlay = OverlayDict(base)
+        overlay.set("language", "zh-tw")
+
+        assert overlay.commit() == {"language": "zh-tw"}
+        assert dict(overlay.changes) == {}
+        assert overlay.base["language"] == "zh-tw"
+        with pytest.raises(TypeError):
+            overlay.base["language"] = "en"
+
+    def test_reset(self):
+        overlay = OverlayDict({"language": "en"})
+        overlay.set("language", "zh-cn")
+        overlay.reset({"language": "zh-tw"})
+        assert dict(overlay) == {"language": "zh-tw"}
+        assert dict(overlay.changes) == {}
@@ -0,0 +1,114 @@
+import json
+import threading
+
+import pytest
+
+from src.core.settings_manager import SettingsManager
+from src.utils.fs import FS
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """记录每次原子写入的内容。"""
+    written = []
+    original = FS.atomic_write_text
+
+    def spy(path, content, encoding="utf-8", fsync=False):
+        written.append((content, fsync))
+        original(path, content, encoding=encoding, fsync=fsync)
+
+    monkeypatch.setattr(FS, "atomic_write_text", spy)
+    return written
+
+
+class TestSettingsManager:
+    """延迟写入的设置管理器的测试套件。"""
+
+    def test_settings_are_read_once(self, tmp_path):
+        path = tmp_path / "settings.json"
+        path.write_text(json.dumps({"language": "en"}), encoding="utf-8")
+        manager = SettingsManager(path)
+        assert manager.load_settings() == {"language": "en"}
+
+        path.write_text(json.dumps({"language": "zh-cn"}), encoding="utf-8")
+        settings = manager.load_settings()
+        assert settings == {"language": "en"}
+        # 返回的是副本
+        settings["language"] = "zh-tw"
+        assert manager.load_settings() == {"language": "en"}
+
+    def test_missing_or_broken_file(self, tmp_path):
+        assert SettingsManager(tmp_path / "missing.json").load_settings() == {}
+        broken = tmp_path / "broken.json"
+        broken.write_text("{", encoding="utf-8")
+        assert SettingsManager(broken).load_settings() == {}
+
+    def test_updates_are_coalesced_into_one_write(self, tmp_path, writes):
+        path = tmp_path / "settings.json"
+        manager = SettingsManager(path, delay=0.05)
+        for language in ("en", "zh-cn", "zh-tw"):
+            manager.update_setting("language", language)
+        manager.update_setting("app_name", "Hexo Helper")
+        assert not path.exists()
+        assert manager.is_dirty()
+
+        manager._timer.join(timeout=5)
+        assert len(writes) == 1
+        assert writes[0][1] is True
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh-tw", "app_name": "Hexo Helper"}
+        assert not manager.is_dirty()
+        # 写入的是同目录的临时文件再替换，不留下临时文件
+        assert [child.name for child in tmp_path.iterdir()] == ["settings.json"]
+
+    def test_unchanged_value_does_not_write(self, tmp_path, writes):
+        path = tmp_path / "settings.json"
+        path.write_text(json.dumps({"language": "en"}), encoding="utf-8")
+        manager = SettingsManager(path, delay=0.05)
+        manager.update_setting("language", "en")
+        assert not manager.is_dirty()
+        manager.flush()
+        assert writes == []
+
+    def test_flush_writes_immediately(self, tmp_path, writes):
+        path = tmp_path / "settings.json"
+        manager = SettingsManager(path, delay=60)
+        manager.save_settings({"language": "zh-cn"})
+        manager.flush()
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh-cn"}
+        assert manager._timer is None
+        manager.flush()
+        assert len(writes) == 1
+
+    def test_failed_write_is_retried_on_flush(self, tmp_path, monkeypatch):
+        path = tmp_path / "settings.json"
+        manager = SettingsManager(path, delay=60)
+        manager.update_setting("language", "zh-cn")
+        original = FS.atomic_write_text
+
+        def fail(*args, **kwargs):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(FS, "atomic_write_text", fail)
+        manager.flush()
+        assert manager.is_dirty()
+
+        monkeypatch.setattr(FS, "atomic_write_text", original)
+        manager.flush()
+        assert not manager.is_dirty()
+        assert json.loads(path.read_text(encoding="utf-8")) == {"language": "zh-cn"}
+
+    def test_concurrent_updates(self, tmp_path):
+        path = tmp_path / "settings.json"
+        manager = SettingsManager(path, delay=0.01)
+
+        def update(worker):
+            for i in range(50):
+                manager.update_setting(f"key_{worker}", i)
+
+        threads = [threading.Thread(target=update, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        manager.flush()
+        assert json.loads(path.read_text(encoding="utf-8")) == {f"key_{worker}": 49 for worker in range(4)}
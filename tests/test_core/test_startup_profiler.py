@@ -0,0 +1,72 @@
+import json
+import sys
+
+from src.core.startup_profiler import PROFILE_STARTUP_ENV, StartupProfiler
+
+
+class TestStartupProfiler:
+    """启动分析的测试套件。"""
+
+    def test_disabled_profiler_records_nothing(self, tmp_path):
+        profiler = StartupProfiler()
+        with profiler.phase("tk root"):
+            pass
+        assert profiler.phases == []
+        assert profiler.finish(tmp_path / "report.json") is None
+        assert not (tmp_path / "report.json").exists()
+
+    def test_nested_phases(self):
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            with profiler.phase("activate main"):
+                with profiler.phase("icon settings.png@24"):
+                    pass
+            with profiler.phase("load settings"):
+                pass
+        finally:
+            report = profiler.finish()
+        assert [(phase["name"], phase["depth"]) for phase in report["phases"]] == [
+            ("activate main", 0),
+            ("icon settings.png@24", 1),
+            ("load settings", 0),
+        ]
+        outer, inner, _ = report["phases"]
+        assert outer["duration_ms"] >= inner["duration_ms"]
+        assert inner["start_ms"] >= outer["start_ms"]
+
+    def test_import_times_per_package(self, tmp_path, monkeypatch):
+        package = tmp_path / "profiled_pkg"
+        package.mkdir()
+        (package / "__init__.py").write_text("from . import heavy\n")
+        (package / "heavy.py").write_text("import time\ntime.sleep(0.02)\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            import profiled_pkg  # noqa: F401
+        finally:
+            report = profiler.finish(tmp_path / "report.json")
+            for name in ("profiled_pkg.heavy", "profiled_pkg"):
+                sys.modules.pop(name, None)
+
+        assert not any(type(finder).__name__ == "_ImportTimer" for finder in sys.meta_path)
+        modules = {module["name"]: module for module in report["imports"]["slowest_modules"]}
+        heavy, parent = modules["profiled_pkg.heavy"], modules["profiled_pkg"]
+        assert heavy["self_ms"] >= 20
+        # 包自身的耗时不包含子模块，累计耗时包含
+        assert parent["self_ms"] < heavy["self_ms"] <= parent["cumulative_ms"]
+        packages = {package["name"]: package for package in report["imports"]["packages"]}
+        assert packages["profiled_pkg"]["modules"] == 2
+        assert json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["imports"]["modules"] >= 2
+
+    def test_start_from_env(self, monkeypatch):
+        profiler = StartupProfiler()
+        monkeypatch.setenv(PROFILE_STARTUP_ENV, "0")
+        assert not profiler.start_from_env()
+        monkeypatch.setenv(PROFILE_STARTUP_ENV, "1")
+        try:
+            assert profiler.start_from_env()
+        finally:
+            profiler.finish()
@@ -0,0 +1,57 @@
+from src.core.taxonomy import (
+    TaxonomyIndex,
+    categories_value,
+    category_paths,
+    move_category,
+    rename_tag,
+)
+
+
+class TestTaxonomyValues:
+    """标签和分类值变换的测试套件。"""
+
+    def test_category_paths(self):
+        assert category_paths("Tech") == [("Tech",)]
+        assert category_paths(["Tech", "Python"]) == [("Tech", "Python")]
+        assert category_paths([["Diary", "Life"], "Tech"]) == [("Diary", "Life"), ("Tech",)]
+        assert category_paths(None) == []
+
+    def test_categories_value_round_trip(self):
+        for value in (["Tech", "Python"], [["Diary", "Life"], "Tech"]):
+            assert categories_value(category_paths(value)) == value
+
+    def test_rename_tag_merges(self):
+        assert rename_tag(["a", "b", "c"], "a", "c") == ["c", "b"]
+
+    def test_move_category_moves_children(self):
+        paths = [("Tech", "Python"), ("Life",)]
+        assert move_category(paths, ("Tech",), ("Dev",)) == [("Dev", "Python"), ("Life",)]
+
+    def test_move_category_to_empty_path_drops_it(self):
+        paths = move_category([("Tech",), ("Life",)], ("Tech",), ())
+        assert paths == [("Life",)]
+        assert categories_value(move_category([("Tech",)], ("Tech",), ())) == []
+
+
+class TestTaxonomyIndex:
+    """标签和分类聚合索引的测试套件。"""
+
+    def test_counts(self):
+        index = TaxonomyIndex()
+        index.add("a", ["hexo", "python"], ["Tech", "Python"])
+        index.add("b", ["hexo"], [["Tech", "Web"], "Life"])
+        assert index.tag_counts() == {"hexo": 2, "python": 1}
+        assert index.category_count(("Tech",)) == 2
+        assert index.category_count(("Tech", "Web")) == 1
+        assert index.posts_in_category(("Life",)) == {"b"}
+
+    def test_replace_and_remove_prune_empty_nodes(self):
+        index = TaxonomyIndex()
+        index.add("a", ["hexo"], ["Tech", "Python"])
+        index.add("a", ["git"], ["Tech"])
+        assert index.tag_count("hexo") == 0 and "hexo" not in index.tags
+        assert index.category(("Tech", "Python")) is None
+        assert index.category_count(("Tech",)) == 1
+
+        index.remove("a")
+        assert index.tags == {} and index.categories.children == {} and len(index) == 0
@@ -0,0 +1,64 @@
+from src.core.text_search import InvertedIndex, make_snippet, tokenize_text
+
+
+class TestTokenizeText:
+    """中英文混合分词的测试套件。"""
+
+    def test_latin_words_and_cjk_bigrams(self):
+        assert tokenize_text("Hexo 博客部署, Python3!") == ["hexo", "博客", "客部", "部署", "python3"]
+
+    def test_single_cjk_character_is_kept(self):
+        assert tokenize_text("a 的 b") == ["a", "的", "b"]
+
+
+class TestInvertedIndex:
+    """倒排索引与 BM25 排序的测试套件。"""
+
+    def _index(self):
+        index = InvertedIndex()
+        index.add("a.md", "部署 Hexo", "使用 git 部署静态博客。", ["hexo"])
+        index.add("b.md", "公式编号", "行内公式和块级公式，也提到部署。")
+        index.add("c.md", "随笔", "今天天气很好。")
+        return index
+
+    def test_title_match_ranks_first(self):
+        hits = self._index().search("部署")
+        assert [key for key, _ in hits] == ["a.md", "b.md"]
+
+    def test_remove_and_replace(self):
+        index = self._index()
+        index.remove("a.md")
+        assert [key for key, _ in index.search("部署")] == ["b.md"]
+        assert "部署" not in index.postings or "a.md" not in index.postings["部署"]
+
+        index.add("b.md", "公式编号", "只剩公式。")
+        assert index.search("部署") == []
+        assert len(index) == 2
+
+    def test_single_character_query_matches_bigrams(self):
+        index = self._index()
+        assert [key for key, _ in index.search("署")] == ["a.md", "b.md"]
+        # 字表随文档增删同步更新
+        index.add("d.md", "", "签署协议")
+        assert "d.md" in [key for key, _ in index.search("署")]
+        index.remove("d.md")
+        assert "签署" not in index._vocabulary["署"] and "签" not in index._vocabulary
+
+    def test_state_round_trip(self):
+        index = self._index()
+        restored = InvertedIndex.from_state(index.to_state())
+        assert restored.search("公式") == index.search("公式")
+
+
+class TestMakeSnippet:
+    """检索结果片段截取的测试套件。"""
+
+    def test_snippet_around_first_match(self):
+        text = "x" * 200 + " Hexo 部署\n完成 " + "y" * 200
+        snippet, highlights = make_snippet(text, "部署", width=40)
+        assert snippet.startswith("…") and snippet.endswith("…")
+        assert [snippet[start:end] for start, end in highlights] == ["部署"]
+
+    def test_no_match_returns_head(self):
+        snippet, highlights = make_snippet("short text", "missing")
+        assert snippet == "short text" and highlights == []
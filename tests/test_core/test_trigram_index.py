@@ -0,0 +1,57 @@
+from src.core import trigram_index
+from src.core.trigram_index import TrigramIndex, trigrams, word_prefixes
+
+
+class TestTrigramIndex:
+    """快速打开三元组索引的测试套件。"""
+
+    def _index(self):
+        index = TrigramIndex()
+        index.add("a", "Hexo 增量部署", "_posts/hexo-deploy.md")
+        index.add("b", "Deploy notes", "_posts/notes.md")
+        index.add("c", "公式编号", "_posts/formula.md")
+        return index
+
+    def test_trigrams(self):
+        assert trigrams("hexo") == {"hex", "exo"}
+        assert trigrams("ab") == set()
+
+    def test_title_prefix_ranks_first(self):
+        assert [key for key, _ in self._index().search("deploy")] == ["b", "a"]
+
+    def test_all_tokens_must_match(self):
+        index = self._index()
+        assert [key for key, _ in index.search("hexo 部署")] == ["a"]
+        assert index.search("hexo formula") == []
+
+    def test_word_prefixes(self):
+        assert word_prefixes("hexo-deploy.md") == {"h", "he", "d", "de", "m", "md"}
+        assert word_prefixes("公式a") == {"公", "公式", "式", "式a"}
+
+    def test_short_query_matches_word_starts(self):
+        index = self._index()
+        assert [key for key, _ in index.search("公式")] == ["c"]
+        assert [key for key, _ in index.search("编")] == ["c"]
+        assert [key for key, _ in index.search("de")] == ["b", "a"]
+        # 只匹配单词开头
+        assert index.search("ep") == []
+        assert [key for key, _ in index.search("hexo d")] == ["a"]
+
+    def test_candidates_are_capped(self, monkeypatch):
+        monkeypatch.setattr(trigram_index, "MAX_CANDIDATES", 2)
+        index = TrigramIndex()
+        for i in range(5):
+            index.add(str(i), f"post {i}")
+        assert len(index.search("p")) == 2
+        assert len(index.search("post")) == 2
+
+    def test_fuzzy_match_tolerates_typos(self):
+        assert [key for key, _ in self._index().search("formla")] == ["c"]
+
+    def test_incremental_update(self):
+        index = self._index()
+        index.add("b", "Notes", "_posts/notes.md")
+        index.remove("c")
+        assert [key for key, _ in index.search("deploy")] == ["a"]
+        assert index.search("formula") == []
+        assert "formula"[:3] not in index.postings and "fo" not in index.prefixes
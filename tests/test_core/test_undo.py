@@ -0,0 +1,67 @@
+import random
+
+from src.core.undo import EditDelta, UndoHistory, diff_text
+
+
+class TestDiffText:
+    """diff_text 的测试套件。"""
+
+    def test_single_replacement(self):
+        delta = diff_text("hello world", "hello brave world")
+        assert (delta.start, delta.old_text, delta.new_text) == (6, "", "brave ")
+
+    def test_identical_content(self):
+        delta = diff_text("same", "same")
+        assert delta.old_text == delta.new_text == ""
+
+    def test_apply_and_revert_random(self):
+        """随机内容（跨越多个比较块）上 apply/revert 应互为逆操作。"""
+        rng = random.Random(0)
+        for _ in range(50):
+            old = "".join(rng.choice("ab\n") for _ in range(rng.randint(0, 10000)))
+            start = rng.randint(0, len(old))
+            end = rng.randint(start, len(old))
+            new = old[:start] + "".join(rng.choice("abc") for _ in range(rng.randint(0, 20))) + old[end:]
+
+            delta = diff_text(old, new)
+            assert delta.apply(old) == new
+            assert delta.revert(new) == old
+
+
+class TestUndoHistory:
+    """UndoHistory 的测试套件。"""
+
+    def test_push_and_pop_order(self):
+        history = UndoHistory(max_bytes=1024 * 1024)
+        first, second = EditDelta(0, "", "a"), EditDelta(1, "", "b")
+        history.push(first)
+        history.push(second)
+
+        assert len(history) == 2
+        assert history.pop() is second
+        assert history.pop() is first
+        assert history.pop() is None
+        assert history.total_bytes == 0
+
+    def test_evicts_oldest_when_over_limit(self):
+        small = EditDelta(0, "", "x")
+        history = UndoHistory(max_bytes=small.size * 3)
+        deltas = [EditDelta(i, "", "x") for i in range(5)]
+        for delta in deltas:
+            history.push(delta)
+
+        assert len(history) == 3
+        assert history.total_bytes <= history.max_bytes
+        assert history.peek() is deltas[-1]
+
+    def test_max_steps(self):
+        history = UndoHistory(max_bytes=1024 * 1024, max_steps=2)
+        for i in range(4):
+            history.push(EditDelta(i, "", "x"))
+        assert len(history) == 2
+        assert history.total_bytes == 2 * EditDelta(0, "", "x").size
+
+    def test_keeps_newest_oversized_delta(self):
+        history = UndoHistory(max_bytes=1)
+        history.push(EditDelta(0, "old", "new"))
+        assert len(history) == 1
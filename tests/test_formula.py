@@ -221,4 +221,110 @@ $$""" in new_content
         # 验证操作失败且模型状态未被改变
         assert not undo_success
         assert empty_model.file_content == original_content
-        assert not empty_model.is_dirty
\ No newline at end of file
+        assert not empty_model.is_dirty
+
+# --- 公式引擎测试 ---
+
+
+def test_processed_content_is_stable(model_with_temp_file):
+    """对已经重新编号过的内容再处理一次，结果应保持不变。"""
+    model, temp_filepath, _ = model_with_temp_file
+    model.load_file(temp_filepath)
+    first_pass, _ = model.get_processed_content()
+
+    model.file_content = first_pass
+    model.parse_content()
+    second_pass, deleted_refs = model.get_processed_content()
+
+    assert deleted_refs == 0
+    assert second_pass == first_pass
+
+
+def test_large_document_renumbering(empty_model):
+    """大量公式块和引用也应按出现顺序编号，并通过 LaTeX 找到新编号。"""
+    count = 2000
+    parts = []
+    for i in range(count, 0, -1):
+        parts.append(f"$$\nx_{{{i}}}\n\\tag{{{i}}}\n$$\n")
+        parts.append(f'<span class="formula-ref" data-formula-old="x_{{{i}}}">({i})</span>\n')
+    empty_model.file_content = "".join(parts)
+    empty_model.parse_content()
+    assert len(empty_model.formulas) == count
+    assert len(empty_model.references) == count
+
+    new_content, deleted_refs = empty_model.get_processed_content()
+    assert deleted_refs == 0
+    assert f'<span class="formula-ref" data-formula="x_{{{count}}}">(1)</span>' in new_content
+    assert f'<span class="formula-ref" data-formula="x_{{1}}">({count})</span>' in new_content
+
+
+def test_apply_edit_matches_full_parse(model_with_temp_file):
+    """增量编辑后的解析结果应与完整解析一致。"""
+    model, temp_filepath, _ = model_with_temp_file
+    model.load_file(temp_filepath)
+
+    # 在第一个公式里改动内容，再插入一个新公式，最后删掉一个 $$ 打乱后续配对
+    start = model.file_content.index("E = mc^2")
+    model.apply_edit(start, start + 1, "F")
+    model.apply_edit(0, 0, "$$x\\tag{0}$$\n")
+    close = model.file_content.rindex("$$")
+    model.apply_edit(close, close + 2, "")
+
+    assert model.is_dirty
+    incremental = (list(model.formulas), list(model.references))
+    model.parse_content()
+    assert incremental == (model.formulas, model.references)
+    assert model.formulas[0] == {"id": "0", "latex": "x"}
+    assert model.formulas[1]["latex"] == "F = mc^2 \\"
+
+
+def test_multi_level_undo(model_with_temp_file):
+    """撤销历史支持连续多步撤销，并且只保存差量。"""
+    model, temp_filepath, mock_md_content = model_with_temp_file
+    model.load_file(temp_filepath)
+
+    model.store_state_for_undo()
+    processed, _ = model.get_processed_content()
+    model.file_content = processed
+    model.parse_content()
+    model.apply_edit(0, 0, "前言\n")
+    model.apply_edit(0, 2, "序")
+
+    assert model.previous_file_content == "前言\n" + processed
+
+    assert model.undo_last_change()
+    assert model.file_content == "前言\n" + processed
+    assert model.undo_last_change()
+    assert model.file_content == processed
+    assert model.undo_last_change()
+    assert model.file_content == mock_md_content
+    assert len(model.formulas) == 4
+    assert model.references[1]["ref_id"] == "99"
+
+    assert not model.undo_last_change()
+    assert model.previous_file_content is None
+
+
+def test_replacing_content_without_undo_point_clears_history(empty_model):
+    """没有记录撤销点就整体替换内容时，之前的差量不能再应用到新内容上。"""
+    empty_model.file_content = "hello $$a\\tag{1}$$"
+    empty_model.parse_content()
+    empty_model.apply_edit(0, 0, "X")
+
+    empty_model.file_content = "completely different"
+    empty_model.parse_content()
+
+    assert not empty_model.undo_last_change()
+    assert empty_model.file_content == "completely different"
+    assert empty_model.previous_file_content is None
+
+
+def test_find_formula_ignores_whitespace_and_escaping(model_with_temp_file):
+    """公式索引按规范化后的 LaTeX 查找。"""
+    model, temp_filepath, _ = model_with_temp_file
+    model.load_file(temp_filepath)
+
+    assert model.find_formula("a^2+b^2=c^2") == {"id": "无", "latex": "a^2 + b^2 = c^2"}
+    assert model.find_formula("E=mc^2\\")["id"] == "1"
+    assert model.find_formula("a^2 + b^2 &#61; c^2")["latex"] == "a^2 + b^2 = c^2"
+    assert model.find_formula("z") is None
@@ -0,0 +1,116 @@
+import shutil
+import subprocess
+
+import pytest
+
+from src.services.deploy import (
+    Deployer,
+    GitRepositoryTarget,
+    LocalDirectoryTarget,
+    diff_manifests,
+    resolve_target,
+)
+from src.services.hashing import FileHasher
+
+
+@pytest.fixture
+def project(tmp_path):
+    public = tmp_path / "blog" / "public"
+    (public / "css").mkdir(parents=True)
+    (public / "index.html").write_text("<h1>home</h1>", encoding="utf-8")
+    (public / "css" / "style.css").write_text("body {}", encoding="utf-8")
+    (public / "old.html").write_text("old", encoding="utf-8")
+    return tmp_path / "blog"
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", f"--git-dir={repo}", *args], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+class TestDiffManifests:
+    """清单比较的测试套件。"""
+
+    def test_added_changed_removed(self):
+        old = {"a": {"hash": "1"}, "b": {"hash": "2"}, "c": {"hash": "3"}}
+        new = {"a": {"hash": "1"}, "b": {"hash": "x"}, "d": {"hash": "4"}}
+        assert diff_manifests(old, new) == (["d"], ["b"], ["c"])
+
+
+class TestLocalDirectoryTarget:
+    """部署到本地目录的测试套件。"""
+
+    def test_incremental_deploy(self, project, tmp_path):
+        site = tmp_path / "site"
+        deployer = Deployer(tmp_path / "manifests", FileHasher(tmp_path / "hashes.sqlite3"))
+        target = LocalDirectoryTarget(site)
+
+        first = deployer.deploy(project, target)
+        assert (len(first.added), first.unchanged) == (3, 0)
+        assert (site / "css" / "style.css").read_text(encoding="utf-8") == "body {}"
+
+        # 没有变化时什么都不写
+        second = deployer.deploy(project, target)
+        assert (second.added, second.changed, second.removed, second.bytes_written) == ([], [], [], 0)
+
+        (project / "public" / "index.html").write_text("<h1>new home</h1>", encoding="utf-8")
+        (project / "public" / "old.html").unlink()
+        shutil.rmtree(project / "public" / "css")
+        third = deployer.deploy(project, target)
+        assert third.changed == ["index.html"]
+        assert third.removed == ["css/style.css", "old.html"]
+        assert sorted(path.name for path in site.rglob("*")) == ["index.html"]
+
+    def test_hard_link(self, project, tmp_path):
+        site = tmp_path / "site"
+        Deployer(tmp_path / "manifests", FileHasher(tmp_path / "hashes.sqlite3")).deploy(
+            project, LocalDirectoryTarget(site, hard_link=True)
+        )
+        assert (site / "index.html").samefile(project / "public" / "index.html")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+class TestGitRepositoryTarget:
+    """部署到本地裸仓库的测试套件。"""
+
+    def test_commits_only_changes(self, project, tmp_path):
+        repo = tmp_path / "site.git"
+        subprocess.run(["git", "init", "--bare", "-q", str(repo)], check=True)
+        deployer = Deployer(tmp_path / "manifests", FileHasher(tmp_path / "hashes.sqlite3"))
+        target = GitRepositoryTarget(repo, "gh-pages")
+
+        deployer.deploy(project, target)
+        assert _git(repo, "ls-tree", "-r", "--name-only", "gh-pages").split() == [
+            "css/style.css",
+            "index.html",
+            "old.html",
+        ]
+        first_commit = _git(repo, "rev-parse", "gh-pages")
+
+        # 没有变化时不产生新的提交
+        deployer.deploy(project, target)
+        assert _git(repo, "rev-parse", "gh-pages") == first_commit
+
+        (project / "public" / "index.html").write_text("<h1>new home</h1>", encoding="utf-8")
+        (project / "public" / "old.html").unlink()
+        deployer.deploy(project, target)
+        assert _git(repo, "rev-parse", "gh-pages~1") == first_commit
+        assert _git(repo, "diff", "--name-status", "gh-pages~1", "gh-pages").splitlines() == [
+            "M\tindex.html",
+            "D\told.html",
+        ]
+        assert _git(repo, "show", "gh-pages:index.html") == "<h1>new home</h1>"
+
+    def test_resolve_target_from_hexo_config(self, project, tmp_path):
+        repo = tmp_path / "site.git"
+        subprocess.run(["git", "init", "--bare", "-q", str(repo)], check=True)
+        (project / "_config.yml").write_text(
+            "title: Blog\ndeploy:\n  type: git\n  repo: ../site.git\n  branch: main\ntheme: x\n", encoding="utf-8"
+        )
+        target = resolve_target(project)
+        assert isinstance(target, GitRepositoryTarget)
+        assert (target.repo, target.branch) == (repo.resolve(), "main")
+
+        (project / "_config.yml").write_text("deploy:\n  type: git\n  repo: https://example.com/x.git\n")
+        assert resolve_target(project) is None
@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+
+import pytest
+
+from src.core.mvc_template.event_bus import bus
+from src.services.file_watcher import (
+    CHANGE_CREATED,
+    CHANGE_DELETED,
+    CHANGE_MODIFIED,
+    FileWatcher,
+    InotifyBackend,
+    PollingBackend,
+    merge_change,
+)
+from src.services.project_index import ProjectIndex
+from tests.helpers import FakeScheduler
+
+EVENT = "event.test.files_changed"
+
+
+def _collect_changes(backend, until, timeout=5.0):
+    """反复读取 backend 的变化并合并，直到 until(pending) 为真。"""
+    pending = {}
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not until(pending):
+        for kind, path in backend.read_changes(0.1):
+            merge_change(pending, path, kind)
+    return pending
+
+
+class TestMergeChange:
+    """变化合并规则的测试套件。"""
+
+    def test_net_effect(self):
+        pending = {}
+        merge_change(pending, "a", CHANGE_CREATED)
+        merge_change(pending, "a", CHANGE_MODIFIED)
+        merge_change(pending, "b", CHANGE_MODIFIED)
+        merge_change(pending, "b", CHANGE_MODIFIED)
+        merge_change(pending, "c", CHANGE_DELETED)
+        merge_change(pending, "c", CHANGE_CREATED)
+        merge_change(pending, "d", CHANGE_CREATED)
+        merge_change(pending, "d", CHANGE_DELETED)
+        assert pending == {"a": CHANGE_CREATED, "b": CHANGE_MODIFIED, "c": CHANGE_MODIFIED}
+
+
+@pytest.mark.parametrize("backend_class", [InotifyBackend, PollingBackend])
+def test_backend_reports_changes(tmp_path, backend_class):
+    if backend_class is InotifyBackend and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is only available on Linux")
+    (tmp_path / "old.md").write_text("old", encoding="utf-8")
+    (tmp_path / "gone.md").write_text("gone", encoding="utf-8")
+    backend = backend_class(str(tmp_path)) if backend_class is InotifyBackend else backend_class(str(tmp_path), 0.05)
+    try:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "new.md").write_text("new", encoding="utf-8")
+        (tmp_path / "old.md").write_text("changed", encoding="utf-8")
+        (tmp_path / "gone.md").unlink()
+        (tmp_path / ".hidden").write_text("x", encoding="utf-8")
+
+        expected = {
+            str(tmp_path / "sub" / "new.md"): CHANGE_CREATED,
+            str(tmp_path / "old.md"): CHANGE_MODIFIED,
+            str(tmp_path / "gone.md"): CHANGE_DELETED,
+        }
+        pending = _collect_changes(backend, lambda pending: expected.items() <= pending.items())
+        assert expected.items() <= pending.items()
+        assert str(tmp_path / ".hidden") not in pending
+    finally:
+        backend.close()
+
+
+class TestFileWatcher:
+    """去抖文件监视的测试套件。"""
+
+    def test_burst_is_published_as_one_batch(self, tmp_path):
+        scheduler = FakeScheduler()
+        batches = []
+
+        def on_changed(root, changes, overflow):
+            batches.append(changes)
+
+        bus.register(EVENT, on_changed)
+        backend = PollingBackend(str(tmp_path), 0.02)
+        watcher = FileWatcher(str(tmp_path), scheduler, EVENT, debounce_ms=200, interval_ms=10, backend=backend).start()
+        try:
+            # 一连串保存：同一个文件写入多次，另一个文件创建后又删除
+            for i in range(5):
+                (tmp_path / "post.md").write_text(f"version {i}", encoding="utf-8")
+                (tmp_path / "tmp.md").write_text("x", encoding="utf-8")
+                time.sleep(0.03)
+            os.remove(tmp_path / "tmp.md")
+
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                scheduler.run_until_idle(timeout=0.05)
+        finally:
+            watcher.stop()
+            bus.unregister(EVENT, on_changed)
+
+        assert batches == [{str(tmp_path / "post.md"): CHANGE_CREATED}]
+
+
+class TestProjectIndexUpdate:
+    """按变化列表增量更新文章索引的测试套件。"""
+
+    def test_update_only_given_paths(self, tmp_path):
+        posts = tmp_path / "source" / "_posts"
+        posts.mkdir(parents=True)
+        (posts / "a.md").write_text("---\ntitle: a\n---\n", encoding="utf-8")
+        (posts / "b.md").write_text("---\ntitle: b\n---\n", encoding="utf-8")
+        index = ProjectIndex(tmp_path, tmp_path / "index.sqlite3")
+        index.refresh()
+
+        (posts / "a.md").write_text("---\ntitle: a2\n---\n", encoding="utf-8")
+        (posts / "b.md").write_text("---\ntitle: b2\n---\n", encoding="utf-8")
+        (posts / "c.md").write_text("---\ntitle: c\n---\n", encoding="utf-8")
+        stats = index.update([str(posts / "a.md"), str(posts / "c.md"), str(posts / "x.md"), str(tmp_path / "y.md")])
+
+        assert stats["updated"] == ["source/_posts/a.md"] and stats["added"] == ["source/_posts/c.md"]
+        # b.md 没有出现在变化列表中，保持原样
+        assert [post["title"] for post in index.posts()] == ["a2", "b", "c"]
+
+        stats = index.update([str(posts)])
+        assert stats["updated"] == ["source/_posts/b.md"]
+
+        (posts / "a.md").unlink()
+        (posts / "b.md").unlink()
+        (posts / "c.md").unlink()
+        posts.rmdir()
+        stats = index.update([str(posts)])
+        assert sorted(stats["removed"]) == ["source/_posts/a.md", "source/_posts/b.md", "source/_posts/c.md"]
+        assert index.posts() == []
@@ -0,0 +1,55 @@
+import pytest
+
+from src.services.formula_batch import find_posts, renumber_project
+
+POST_WITH_FORMULAS = """---
+title: test
+---
+$$a\\tag{7}$$
+引用 <span class="formula-ref"> (7) </span>，无效引用 <span class="formula-ref">(8)</span>
+"""
+
+POST_ALREADY_NUMBERED = """$$
+  b
+  \\tag{1}
+$$
+"""
+
+
+@pytest.fixture
+def hexo_project(tmp_path):
+    """创建一个包含多篇文章的 Hexo 项目目录。"""
+    posts_dir = tmp_path / "source" / "_posts"
+    (posts_dir / "nested").mkdir(parents=True)
+    (posts_dir / "a.md").write_text(POST_WITH_FORMULAS, encoding="utf-8")
+    (posts_dir / "nested" / "b.md").write_text(POST_ALREADY_NUMBERED, encoding="utf-8")
+    (posts_dir / "plain.md").write_text("没有公式", encoding="utf-8")
+    (posts_dir / "image.png").write_bytes(b"\x89PNG")
+    return tmp_path
+
+
+class TestFormulaBatch:
+    """批量重新编号的测试套件。"""
+
+    def test_find_posts(self, hexo_project):
+        posts = find_posts(hexo_project)
+        assert [p.rsplit("_posts", 1)[1][1:] for p in posts] == ["a.md", "nested/b.md", "plain.md"]
+
+    def test_dry_run_does_not_write(self, hexo_project):
+        result = renumber_project(hexo_project, dry_run=True, max_workers=2)
+
+        assert result.summary()["files"] == 3
+        assert len(result.changed) == 1
+        assert result.deleted_refs == 1
+        assert not any(report["written"] for report in result.reports)
+        assert (hexo_project / "source" / "_posts" / "a.md").read_text(encoding="utf-8") == POST_WITH_FORMULAS
+
+    def test_renumber_writes_changed_files(self, hexo_project):
+        result = renumber_project(hexo_project, max_workers=2)
+
+        changed = result.changed
+        assert len(changed) == 1 and changed[0]["written"]
+        content = (hexo_project / "source" / "_posts" / "a.md").read_text(encoding="utf-8")
+        assert '<span class="formula-ref" data-formula="a">(1)</span>' in content
+        assert "(8)" not in content
+        assert all(report["seconds"] >= 0 for report in result.reports)
@@ -0,0 +1,39 @@
+import os
+
+from src.services.formula_index import FormulaIndexStore
+from tests.helpers import write_post
+
+
+class TestFormulaIndexStore:
+    """按文章持久化的公式索引的测试套件。"""
+
+    def test_cross_post_queries(self, tmp_path):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "$$ E = mc^2 \\tag{1} $$")
+        write_post(posts / "b.md", '<span class="formula-ref" data-formula="E=mc^2">(1)</span>')
+        store = FormulaIndexStore(tmp_path / "index")
+
+        definitions = store.find_definitions(tmp_path / "blog", "E =  mc^2")
+        references = store.find_references(tmp_path / "blog", "E&#61;mc^2")
+
+        assert [(os.path.basename(d["path"]), d["id"], d["number"]) for d in definitions] == [("a.md", "1", 1)]
+        assert [(os.path.basename(r["path"]), r["ref_id"]) for r in references] == [("b.md", "1")]
+
+    def test_persisted_entries_are_reused(self, tmp_path, monkeypatch):
+        post = tmp_path / "blog" / "source" / "_posts" / "a.md"
+        write_post(post, "$$x$$")
+        FormulaIndexStore(tmp_path / "index").index_project(tmp_path / "blog")
+
+        # 新的实例只读取持久化的索引，不再解析文章
+        store = FormulaIndexStore(tmp_path / "index")
+        monkeypatch.setattr(store, "index_post", lambda *args: (_ for _ in ()).throw(AssertionError("re-parsed")))
+        assert store.get(post)["formulas"] == [["x", "无", "x"]]
+
+    def test_changed_post_is_reindexed(self, tmp_path):
+        post = tmp_path / "blog" / "source" / "_posts" / "a.md"
+        write_post(post, "$$x$$")
+        store = FormulaIndexStore(tmp_path / "index")
+        store.index_project(tmp_path / "blog")
+
+        write_post(post, "$$x$$ $$y$$")
+        assert len(store.get(post)["formulas"]) == 2
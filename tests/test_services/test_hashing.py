@@ -0,0 +1,62 @@
+import hashlib
+import os
+import time
+
+from src.services import hashing
+from src.services.hashing import FileHasher, hash_path
+
+
+def _write(path, data: bytes, age: float = 60.0):
+    """写入文件，并把修改时间设到 age 秒之前（刚修改的文件不会写入缓存）。"""
+    path.write_bytes(data)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+class TestFileHasher:
+    """带持久化缓存的并行摘要计算的测试套件。"""
+
+    def test_digests_match_hashlib(self, tmp_path, monkeypatch):
+        # 调低阈值，让大文件走 mmap 分支
+        monkeypatch.setattr(hashing, "_MMAP_THRESHOLD", 1024)
+        small, large = tmp_path / "small.txt", tmp_path / "large.bin"
+        _write(small, b"hello")
+        _write(large, os.urandom(100_000))
+
+        digests = FileHasher(None).hash_files([small, large, tmp_path / "missing"])
+
+        assert digests == {
+            str(small): hashlib.sha256(b"hello").hexdigest(),
+            str(large): hashlib.sha256(large.read_bytes()).hexdigest(),
+        }
+        assert hash_path(str(large), "md5") == hashlib.md5(large.read_bytes()).hexdigest()
+
+    def test_unchanged_files_are_not_read_again(self, tmp_path, monkeypatch):
+        db_path = tmp_path / "hashes.sqlite3"
+        files = [tmp_path / f"{i}.txt" for i in range(20)]
+        for i, path in enumerate(files):
+            _write(path, f"file {i}".encode())
+        FileHasher(db_path).hash_files(files)
+
+        _write(files[0], b"changed!")
+        read = []
+        original = hashing.hash_path
+        monkeypatch.setattr(hashing, "hash_path", lambda path, *args: read.append(path) or original(path, *args))
+        hasher = FileHasher(db_path)
+        digests = hasher.hash_files(files)
+
+        assert read == [str(files[0])]
+        assert digests[str(files[0])] == hashlib.sha256(b"changed!").hexdigest()
+        stats = hasher.last_stats.summary()
+        assert (stats["files"], stats["cached"], stats["hashed"], stats["bytes_hashed"]) == (20, 19, 1, 8)
+        assert stats["files_per_second"] > 0
+
+    def test_recently_modified_files_are_not_cached(self, tmp_path):
+        db_path = tmp_path / "hashes.sqlite3"
+        path = tmp_path / "new.txt"
+        _write(path, b"fresh", age=0)
+        FileHasher(db_path).hash_files([path])
+
+        hasher = FileHasher(db_path)
+        hasher.hash_files([path])
+        assert hasher.last_stats.hashed == 1
@@ -0,0 +1,59 @@
+from src.services.idle_tasks import IdleTasks
+from tests.helpers import FakeScheduler
+
+
+class TestIdleTasks:
+    """空闲时分片执行任务的测试套件。"""
+
+    def test_tasks_run_in_order_when_idle(self):
+        scheduler = FakeScheduler()
+        tasks = IdleTasks(scheduler)
+        done = []
+        for i in range(3):
+            tasks.submit(done.append, i)
+        assert done == []
+        assert scheduler.calls == ["after_idle"]
+
+        scheduler.run_all()
+        assert done == [0, 1, 2]
+        assert len(tasks) == 0
+
+    def test_work_is_split_into_time_slices(self):
+        scheduler = FakeScheduler()
+        # 预算为 0：每一片只执行一个任务
+        tasks = IdleTasks(scheduler, budget_ms=0)
+        done = []
+        for i in range(3):
+            tasks.submit(done.append, i)
+
+        scheduler.run_next()
+        # 超过预算后先通过 after 让出事件循环，再等下一次空闲
+        assert done == [0]
+        assert scheduler.calls == ["after_idle", "after"]
+
+        scheduler.run_all()
+        assert done == [0, 1, 2]
+        assert scheduler.calls == ["after_idle", "after", "after_idle", "after", "after_idle"]
+
+    def test_errors_do_not_stop_the_queue(self):
+        scheduler = FakeScheduler()
+        tasks = IdleTasks(scheduler)
+        errors, done = [], []
+        tasks.submit(lambda: 1 / 0, on_error=errors.append)
+        tasks.submit(lambda: 1 / 0)
+        tasks.submit(done.append, "ok")
+
+        scheduler.run_all()
+        assert [type(error) for error in errors] == [ZeroDivisionError]
+        assert done == ["ok"]
+
+    def test_shutdown_cancels_pending_tasks(self):
+        scheduler = FakeScheduler()
+        tasks = IdleTasks(scheduler)
+        done = []
+        tasks.submit(done.append, 1)
+        tasks.shutdown()
+
+        scheduler.run_all()
+        assert done == []
+        assert len(tasks) == 0
@@ -0,0 +1,52 @@
+import os
+
+from PIL import Image
+
+from src.services.hashing import FileHasher
+from src.services.image_pipeline import ImageOptimizer, find_images
+
+
+def _optimizer(tmp_path, **kwargs):
+    return ImageOptimizer(tmp_path / "images.sqlite3", FileHasher(tmp_path / "hashes.sqlite3"), max_workers=1, **kwargs)
+
+
+class TestImageOptimizer:
+    """图片批量优化的测试套件。"""
+
+    def test_resize_variants_and_skip_processed(self, tmp_path):
+        images = tmp_path / "blog" / "source" / "images"
+        images.mkdir(parents=True)
+        Image.radial_gradient("L").resize((1200, 600)).convert("RGB").save(images / "big.jpg", quality=100)
+        Image.new("RGB", (100, 50), "red").save(images / "small.png")
+        optimizer = _optimizer(tmp_path, max_width=800, widths=(200, 400))
+
+        result = optimizer.optimize_project(tmp_path / "blog")
+        summary = result.summary()
+
+        assert summary["processed"] == 2 and summary["failed"] == 0
+        assert summary["bytes_saved"] > 0
+        with Image.open(images / "big.jpg") as image:
+            assert image.size == (800, 400)
+        with Image.open(images / "big@200w.jpg") as image:
+            assert image.size == (200, 100)
+        assert (images / "big@400w.jpg").exists()
+        # 比所有响应式宽度都窄的图片不生成
+        assert not list(images.glob("small@*"))
+        # 生成的图片不会被当作原图再次处理
+        assert [os.path.basename(path) for path in find_images(tmp_path / "blog")] == ["big.jpg", "small.png"]
+
+        again = optimizer.optimize_project(tmp_path / "blog").summary()
+        assert again["processed"] == 0 and again["skipped"] == 2
+
+        # 响应式图片被删除后重新处理，参数变化后也重新处理
+        (images / "big@200w.jpg").unlink()
+        assert optimizer.optimize_project(tmp_path / "blog").summary()["processed"] == 1
+        assert _optimizer(tmp_path, max_width=800, widths=(300,)).optimize_project(tmp_path / "blog").reports
+
+    def test_broken_image_is_reported(self, tmp_path):
+        images = tmp_path / "blog" / "source"
+        images.mkdir(parents=True)
+        (images / "broken.jpg").write_bytes(b"not an image")
+
+        result = _optimizer(tmp_path).optimize_project(tmp_path / "blog")
+        assert len(result.failed) == 1 and result.summary()["failed"] == 1
@@ -0,0 +1,63 @@
+import sys
+
+from src.services.job_runner import STREAM_STDERR, STREAM_STDOUT, Job, JobRunner
+from tests.helpers import FakeScheduler
+
+
+def _python(code):
+    return [sys.executable, "-c", code]
+
+
+class TestJobRunner:
+    """后台命令调度的测试套件。"""
+
+    def test_output_is_delivered_in_batches(self):
+        scheduler = FakeScheduler()
+        batches = []
+        finished = []
+        runner = JobRunner(scheduler)
+        code = "import sys\nfor i in range(500): print(i)\nprint('oops', file=sys.stderr)\nsys.exit(3)"
+        job = runner.run(_python(code), on_output=lambda j, lines: batches.append(lines), on_finished=finished.append)
+        job.wait(10)
+        scheduler.run_until_idle()
+
+        lines = [line for batch in batches for line in batch]
+        assert [line for stream, line in lines if stream == STREAM_STDOUT] == [str(i) for i in range(500)]
+        assert (STREAM_STDERR, "oops") in lines
+        # 进程已结束后才推进调度，所有输出应在一次回调中交付
+        assert len(batches) == 1
+        assert finished == [job]
+        assert job.returncode == 3
+        assert job.duration >= 0
+        assert runner.jobs == []
+
+    def test_max_batch_splits_output(self):
+        scheduler = FakeScheduler()
+        batches = []
+        runner = JobRunner(scheduler, max_batch=100)
+        job = runner.run(_python("for i in range(250): print(i)"), on_output=lambda j, lines: batches.append(lines))
+        job.wait(10)
+        scheduler.run_until_idle()
+
+        assert [len(batch) for batch in batches] == [100, 100, 50]
+
+    def test_cancel(self):
+        scheduler = FakeScheduler()
+        finished = []
+        runner = JobRunner(scheduler)
+        code = "import time; print('start', flush=True); time.sleep(30)"
+        job = runner.run(_python(code), on_finished=finished.append)
+        job.cancel()
+        assert job.wait(10)
+        scheduler.run_until_idle()
+
+        assert job.cancelled
+        assert job.returncode != 0
+        assert job.duration < 10
+        assert finished == [job]
+
+    def test_missing_command(self):
+        job = Job(["definitely-not-a-real-command-xyz"]).start()
+        assert job.is_finished
+        assert job.returncode == -1
+        assert job.error
@@ -0,0 +1,83 @@
+import os
+
+from src.services.project_index import ProjectIndex, read_post
+from tests.helpers import write_post
+
+POST = """---
+title: "Hello: World"
+date: 2023-01-02 10:00:00
+tags:
+  - hexo
+  - python
+categories: notes
+---
+Hello world 你好
+second line
+"""
+
+
+class TestReadPost:
+    """单篇文章元数据读取的测试套件。"""
+
+    def test_read_post_counts_body_words(self, tmp_path):
+        post = tmp_path / "a.md"
+        write_post(post, POST)
+
+        info = read_post(post)
+        assert info["categories"] == ["notes"]
+        # Hello world 你 好 second line
+        assert info["word_count"] == 6
+
+
+class TestProjectIndex:
+    """持久化文章元数据索引的测试套件。"""
+
+    def test_refresh_only_reads_changed_posts(self, tmp_path, monkeypatch):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", POST, 1_000_000_000)
+        write_post(posts / "b.md", "---\ntitle: b\n---\n", 1_000_000_000)
+        write_post(tmp_path / "blog" / "source" / "about" / "index.md", "---\ntitle: about\n---\n")
+        db_path = tmp_path / "index.sqlite3"
+
+        stats = ProjectIndex(tmp_path / "blog", db_path).refresh()
+        assert stats["posts"] == 3 and len(stats["added"]) == 3
+
+        # 新实例只读取有变化的文件
+        write_post(posts / "b.md", "---\ntitle: b2\n---\n", 2_000_000_000)
+        (tmp_path / "blog" / "source" / "about" / "index.md").unlink()
+        index = ProjectIndex(tmp_path / "blog", db_path)
+        read = []
+        monkeypatch.setattr("src.services.project_index.read_post", lambda path: read.append(path) or read_post(path))
+        stats = index.refresh()
+
+        assert [os.path.basename(path) for path in read] == ["b.md"]
+        assert stats["updated"] == ["source/_posts/b.md"]
+        assert stats["removed"] == ["source/about/index.md"]
+        assert [post["title"] for post in index.posts()] == ["Hello: World", "b2"]
+        assert index.get("source/_posts/a.md")["tags"] == ["hexo", "python"]
+
+    def test_unparsable_post_is_skipped(self, tmp_path, monkeypatch):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", POST)
+        write_post(posts / "bad.md", "---\ntitle: bad\n---\n")
+
+        def read(path):
+            if path.endswith("bad.md"):
+                raise ValueError("month must be in 1..12")
+            return read_post(path)
+
+        monkeypatch.setattr("src.services.project_index.read_post", read)
+        index = ProjectIndex(tmp_path / "blog", tmp_path / "index.sqlite3")
+        stats = index.refresh()
+        assert stats["added"] == ["source/_posts/a.md"]
+        assert [post["title"] for post in index.posts()] == ["Hello: World"]
+
+    def test_projects_are_isolated(self, tmp_path):
+        db_path = tmp_path / "index.sqlite3"
+        write_post(tmp_path / "one" / "source" / "_posts" / "a.md", POST)
+        write_post(tmp_path / "two" / "source" / "_posts" / "b.md", POST)
+
+        ProjectIndex(tmp_path / "one", db_path).refresh()
+        ProjectIndex(tmp_path / "two", db_path).refresh()
+
+        assert [post["path"] for post in ProjectIndex(tmp_path / "one", db_path).posts()] == ["source/_posts/a.md"]
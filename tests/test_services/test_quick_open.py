@@ -0,0 +1,30 @@
+import os
+
+from src.services.project_index import ProjectIndex
+from src.services.quick_open import QuickOpenIndex
+from tests.helpers import write_post
+
+
+class TestQuickOpenIndex:
+    """快速打开索引的测试套件。"""
+
+    def test_follows_project_index_changes(self, tmp_path):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: Hexo 部署\n---\n")
+        write_post(posts / "untitled.md", "正文\n")
+        project_index = ProjectIndex(tmp_path / "blog", tmp_path / "index.sqlite3")
+        quick_open = QuickOpenIndex(project_index)
+
+        quick_open.apply(project_index.refresh())
+        assert [result["title"] for result in quick_open.search("部署")] == ["Hexo 部署"]
+        # 没有标题时使用文件名
+        assert [result["path"] for result in quick_open.search("untitled")] == ["source/_posts/untitled.md"]
+        # 共同的 source/_posts/ 前缀不参与匹配
+        assert quick_open.search("source") == []
+        assert quick_open.search("post") == []
+
+        write_post(posts / "b.md", "---\ntitle: Formula\n---\n")
+        (posts / "a.md").unlink()
+        quick_open.apply(project_index.update([os.fspath(posts / "b.md"), os.fspath(posts / "a.md")]))
+        assert quick_open.search("部署") == []
+        assert [result["path"] for result in quick_open.search("form")] == ["source/_posts/b.md"]
@@ -0,0 +1,20 @@
+from PIL import Image
+
+from src.services.resource import IconResourceLoader
+
+
+class TestIconResourceLoader:
+    """缩放图标缓存的测试套件。"""
+
+    def test_resized_icons_are_cached_on_disk(self, tmp_path, monkeypatch):
+        loader = IconResourceLoader(tmp_path / "icons")
+        path = loader.resized_path("settings.png", 16, 2.0)
+        with Image.open(path) as icon:
+            assert icon.size == (32, 32)
+        assert loader.load_resized("settings.png", 32).size == (32, 32)
+
+        # 新的加载器（下一次启动）直接使用缓存文件，不再解码原图
+        monkeypatch.setattr(IconResourceLoader, "load", lambda self, name: 1 / 0)
+        fresh = IconResourceLoader(tmp_path / "icons")
+        assert fresh.resized_path("settings.png", 32) == path
+        assert len(list((tmp_path / "icons").iterdir())) == 1
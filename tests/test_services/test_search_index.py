@@ -0,0 +1,106 @@
+import threading
+
+from src.services import search_index
+from src.services.search_index import PostSearchIndex
+from tests.helpers import write_post
+
+
+class TestPostSearchIndex:
+    """持久化全文检索索引的测试套件。"""
+
+    def test_search_returns_titles_and_snippets(self, tmp_path):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: 增量部署\ntags: [hexo]\n---\n只上传变化的文件。\n")
+        write_post(posts / "b.md", "---\ntitle: 公式\n---\n公式编号与部署无关。\n")
+
+        index = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        stats = index.refresh()
+        assert stats["posts"] == 2
+
+        results = index.search("部署")
+        assert [result["path"] for result in results] == ["source/_posts/a.md", "source/_posts/b.md"]
+        assert results[0]["title"] == "增量部署"
+        snippet = results[1]["snippet"]
+        assert [snippet[start:end] for start, end in results[1]["highlights"]] == ["部署"]
+
+        # 片段来自索引中保存的正文开头，不再读取文章
+        (posts / "b.md").unlink()
+        assert index.search("部署")[1]["snippet"] == snippet
+
+    def test_persisted_index_only_reads_changed_posts(self, tmp_path, monkeypatch):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: a\n---\nalpha\n", 1_000_000_000)
+        write_post(posts / "b.md", "---\ntitle: b\n---\nbeta\n", 1_000_000_000)
+        PostSearchIndex(tmp_path / "blog", tmp_path / "search").refresh()
+
+        write_post(posts / "b.md", "---\ntitle: b\n---\ngamma\n", 2_000_000_000)
+        index = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        read = []
+        original = index._index_post
+        monkeypatch.setattr(
+            index, "_index_post", lambda relative, *args: read.append(relative) or original(relative, *args)
+        )
+        stats = index.refresh()
+
+        assert read == ["source/_posts/b.md"] and stats["updated"] == read
+        assert index.search("beta", snippets=False) == []
+        found = {result["path"] for result in index.search("alpha gamma", snippets=False)}
+        assert found == {"source/_posts/a.md", "source/_posts/b.md"}
+
+    def test_unparsable_post_is_skipped(self, tmp_path, monkeypatch):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: a\n---\n部署\n")
+        write_post(posts / "bad.md", "---\ntitle: bad\n---\n部署\n")
+        read_post_text = search_index.read_post_text
+
+        def read(path):
+            if path.endswith("bad.md"):
+                raise ValueError("month must be in 1..12")
+            return read_post_text(path)
+
+        monkeypatch.setattr(search_index, "read_post_text", read)
+        index = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        stats = index.refresh()
+        assert stats["added"] == ["source/_posts/a.md"]
+        assert [result["path"] for result in index.search("部署")] == ["source/_posts/a.md"]
+
+    def test_update_changed_paths(self, tmp_path):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: a\n---\nalpha\n")
+        index = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        index.refresh()
+
+        write_post(posts / "new.md", "---\ntitle: new\n---\nalpha beta\n")
+        (posts / "a.md").unlink()
+        stats = index.update([str(posts / "new.md"), str(posts / "a.md")])
+
+        assert stats["added"] == ["source/_posts/new.md"] and stats["removed"] == ["source/_posts/a.md"]
+        assert [result["path"] for result in index.search("alpha")] == ["source/_posts/new.md"]
+
+    def test_watcher_batch_writes_only_changed_posts_without_blocking_search(self, tmp_path, monkeypatch):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        for name in ("a", "b", "c"):
+            write_post(posts / f"{name}.md", f"---\ntitle: {name}\n---\nalpha\n")
+        index = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        index.refresh()
+
+        writes = []
+        original = index._write
+
+        def write(rows, removed):
+            # 写数据库时其他线程仍然可以查询
+            searchable = []
+            thread = threading.Thread(target=lambda: searchable.append(index.search("alpha", snippets=False)))
+            thread.start()
+            thread.join(5)
+            writes.append(([row[0] for row in rows], removed, bool(searchable)))
+            original(rows, removed)
+
+        monkeypatch.setattr(index, "_write", write)
+        write_post(posts / "b.md", "---\ntitle: b\n---\nbeta\n", 2_000_000_000)
+        index.update([str(posts / "b.md")])
+
+        assert writes == [(["source/_posts/b.md"], [], True)]
+        reloaded = PostSearchIndex(tmp_path / "blog", tmp_path / "search")
+        assert reloaded.load()
+        assert [result["path"] for result in reloaded.search("beta", snippets=False)] == ["source/_posts/b.md"]
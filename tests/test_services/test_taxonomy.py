@@ -0,0 +1,52 @@
+from src.services.project_index import ProjectIndex
+from src.services.taxonomy import ProjectTaxonomy
+from tests.helpers import write_post
+
+
+class TestProjectTaxonomy:
+    """标签和分类批量重命名的测试套件。"""
+
+    def _taxonomy(self, tmp_path):
+        posts = tmp_path / "blog" / "source" / "_posts"
+        write_post(posts / "a.md", "---\ntitle: a\ntags:\n  - js\n  - web\ncategories: [Tech, Web]\n---\njs body\n")
+        write_post(posts / "b.md", "---\ntitle: b\ntags: [javascript]\ncategories: Tech\n---\n")
+        write_post(posts / "c.md", "---\ntitle: c\ntags: life\n---\n")
+        project_index = ProjectIndex(tmp_path / "blog", tmp_path / "index.sqlite3")
+        taxonomy = ProjectTaxonomy(project_index)
+        taxonomy.apply(project_index.refresh())
+        return posts, taxonomy
+
+    def test_rename_tag_rewrites_only_affected_posts(self, tmp_path):
+        posts, taxonomy = self._taxonomy(tmp_path)
+        assert taxonomy.tag_counts() == {"js": 1, "web": 1, "javascript": 1, "life": 1}
+        untouched = (posts / "c.md").stat().st_mtime_ns
+
+        summary = taxonomy.rename_tag("js", "javascript")
+
+        assert summary["changed"] == 1 and summary["failed"] == 0
+        assert (posts / "a.md").read_text(encoding="utf-8") == (
+            "---\ntitle: a\ntags:\n  - javascript\n  - web\ncategories: [Tech, Web]\n---\njs body\n"
+        )
+        assert (posts / "c.md").stat().st_mtime_ns == untouched
+        assert taxonomy.tag_counts() == {"javascript": 2, "web": 1, "life": 1}
+
+    def test_move_category(self, tmp_path):
+        posts, taxonomy = self._taxonomy(tmp_path)
+        summary = taxonomy.move_category(["Tech"], ["Dev"])
+
+        assert summary["changed"] == 2
+        assert "categories: [Dev, Web]\n" in (posts / "a.md").read_text(encoding="utf-8")
+        assert "categories: Dev\n" in (posts / "b.md").read_text(encoding="utf-8")
+        assert taxonomy.category_tree() == [
+            {"name": "Dev", "count": 2, "children": [{"name": "Web", "count": 1, "children": []}]}
+        ]
+
+    def test_transform_error_is_reported_per_post(self, tmp_path):
+        posts, taxonomy = self._taxonomy(tmp_path)
+
+        def transform(value):
+            raise ValueError("bad value")
+
+        summary = taxonomy._rewrite({"source/_posts/a.md", "source/_posts/b.md"}, "tags", transform)
+
+        assert summary["posts"] == 2 and summary["changed"] == 0 and summary["failed"] == 2
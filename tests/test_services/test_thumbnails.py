@@ -0,0 +1,73 @@
+from PIL import Image
+
+from src.services.hashing import FileHasher
+from src.services.thumbnails import ThumbnailCache, ThumbnailService, render_thumbnail
+from tests.helpers import FakeScheduler
+
+
+class _FakePhoto:
+    """替代 ImageTk.PhotoImage，不需要 Tk。"""
+
+    def __init__(self, image):
+        self.size = image.size
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+
+def _cache(tmp_path):
+    return ThumbnailCache(tmp_path / "thumbnails", FileHasher(tmp_path / "hashes.sqlite3"))
+
+
+class TestThumbnailCache:
+    """缩略图磁盘缓存的测试套件。"""
+
+    def test_render_keeps_aspect_ratio(self, tmp_path):
+        Image.new("RGB", (1600, 800), "blue").save(tmp_path / "a.jpg")
+        Image.new("RGBA", (300, 600), (0, 0, 0, 0)).save(tmp_path / "b.png")
+        assert render_thumbnail(tmp_path / "a.jpg", 200).size == (200, 100)
+        thumbnail = render_thumbnail(tmp_path / "b.png", 200)
+        assert thumbnail.size == (100, 200) and thumbnail.mode == "RGBA"
+
+    def test_cached_by_content_and_size(self, tmp_path, monkeypatch):
+        Image.new("RGB", (800, 600), "red").save(tmp_path / "a.jpg")
+        cache = _cache(tmp_path)
+        assert cache.get(tmp_path / "a.jpg", 128).size == (128, 96)
+
+        # 内容相同的副本直接命中磁盘缓存
+        (tmp_path / "copy.jpg").write_bytes((tmp_path / "a.jpg").read_bytes())
+        monkeypatch.setattr("src.services.thumbnails.render_thumbnail", lambda path, size: 1 / 0)
+        assert cache.get(tmp_path / "copy.jpg", 128).size == (128, 96)
+        assert len(list((tmp_path / "thumbnails").rglob("*.thumb"))) == 1
+
+
+class TestThumbnailService:
+    """后台加载缩略图和 PhotoImage LRU 的测试套件。"""
+
+    def test_requests_share_one_load_and_memory_is_bounded(self, tmp_path):
+        for name in ("a", "b"):
+            Image.new("RGB", (400, 400), "green").save(tmp_path / f"{name}.png")
+        scheduler = FakeScheduler()
+        # 只能容纳一张 100x100 的缩略图
+        service = ThumbnailService(scheduler, _cache(tmp_path), memory_limit=100 * 100 * 4, photo_factory=_FakePhoto)
+        ready = []
+        service.request(tmp_path / "a.png", 100, ready.append)
+        service.request(tmp_path / "a.png", 100, ready.append)
+        scheduler.run_until_idle()
+        assert len(ready) == 2 and ready[0] is ready[1]
+
+        # 内存中已有时立即回调
+        service.request(tmp_path / "a.png", 100, ready.append)
+        assert ready[2] is ready[0]
+
+        service.request(tmp_path / "b.png", 100, ready.append)
+        scheduler.run_until_idle()
+        assert len(service.photos) == 1
+
+        errors = []
+        service.request(tmp_path / "missing.png", 100, ready.append, errors.append)
+        assert len(errors) == 1 and len(ready) == 4
+        service.shutdown()